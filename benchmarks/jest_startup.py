@@ -0,0 +1,86 @@
+"""Compare per-run latency of the default and the fast Jest profile.
+
+Usage:
+    python benchmarks/jest_startup.py --project DIR [--runs N] [--files N]
+
+DIR must have Jest installed (node_modules/.bin/jest). The benchmark adds a
+throwaway proven-benchmark/ folder to it with --files extra modules, so Jest
+has a sizeable project to crawl, and removes it afterwards.
+"""
+
+import argparse
+import shutil
+import statistics
+import time
+from pathlib import Path
+
+from proven.runners.jest_runner import JestRunner, find_jest_binary
+
+SAMPLE_TEST = """
+const { add } = require("./module0");
+
+test("adds numbers", () => {
+  expect(add(1, 2)).toBe(3);
+});
+"""
+
+
+def measure(runner: JestRunner, test_file: Path, runs: int) -> list[float]:
+    """Run the test file repeatedly and return per-run wall-clock seconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = runner.run(test_file)
+        timings.append(time.perf_counter() - start)
+        if not result.is_green:
+            raise SystemExit(f"Benchmark run failed:\n{result.output}")
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    """Print a one-line latency summary."""
+    print(
+        f"{label:<12} mean {statistics.mean(timings) * 1000:8.1f} ms"
+        f"  median {statistics.median(timings) * 1000:8.1f} ms"
+        f"  min {min(timings) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--project", type=Path, required=True, help="Project with Jest installed")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per profile")
+    parser.add_argument("--files", type=int, default=2000, help="Extra modules to add to the project")
+    args = parser.parse_args()
+
+    project = args.project.resolve()
+    if find_jest_binary(project) is None:
+        raise SystemExit(f"No node_modules/.bin/jest in or above {project}")
+
+    folder = project / "proven-benchmark"
+    folder.mkdir()
+    try:
+        for index in range(args.files):
+            (folder / f"module{index}.js").write_text(f"exports.add = (a, b) => a + b;\nexports.id = {index};\n")
+        test_file = folder / "benchmark.test.js"
+        test_file.write_text(SAMPLE_TEST)
+
+        # One untimed run per profile, so both start with a warm Jest cache
+        default_runner = JestRunner(working_dir=project)
+        fast_runner = JestRunner(working_dir=project, fast=True)
+        default_runner.run(test_file)
+        fast_runner.run(test_file)
+
+        default = measure(default_runner, test_file, args.runs)
+        fast = measure(fast_runner, test_file, args.runs)
+    finally:
+        shutil.rmtree(folder)
+
+    report("default", default)
+    report("fast", fast)
+    saved = statistics.median(default) - statistics.median(fast)
+    print(f"{'saved':<12} {saved * 1000:8.1f} ms per run ({saved / statistics.median(default):.0%})")
+
+
+if __name__ == "__main__":
+    main()
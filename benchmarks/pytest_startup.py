@@ -0,0 +1,72 @@
+"""Compare pytest startup with the default and the lean runner profile.
+
+Usage:
+    python benchmarks/pytest_startup.py [--runs N] [--project DIR] [--plugin MODULE ...]
+
+The lean profile disables plugin autoload, so the difference grows with the
+number of pytest plugins installed in the environment. Pointing --project at
+a real checkout (with the plugins its tests need passed as --plugin) gives
+the most realistic numbers.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from proven.runners.pytest_runner import PytestRunner
+
+SAMPLE_TEST = """
+def test_startup():
+    assert True
+"""
+
+
+def measure(runner: PytestRunner, test_file: Path, runs: int) -> list[float]:
+    """Run the test file repeatedly and return per-run wall-clock seconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = runner.run(test_file)
+        timings.append(time.perf_counter() - start)
+        if not result.is_green:
+            raise SystemExit(f"Benchmark run failed:\n{result.output}")
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    """Print a one-line latency summary."""
+    print(
+        f"{label:<12} mean {statistics.mean(timings) * 1000:8.1f} ms"
+        f"  median {statistics.median(timings) * 1000:8.1f} ms"
+        f"  min {min(timings) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Runs per profile")
+    parser.add_argument("--project", type=Path, help="Existing project to run in")
+    parser.add_argument("--plugin", action="append", default=[], help="Plugin module for the lean allow-list")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = args.project or Path(tmpdir)
+        test_file = project / "test_proven_benchmark.py"
+        test_file.write_text(SAMPLE_TEST)
+
+        try:
+            default = measure(PytestRunner(working_dir=project), test_file, args.runs)
+            lean = measure(PytestRunner(working_dir=project, lean=True, plugins=args.plugin), test_file, args.runs)
+        finally:
+            test_file.unlink(missing_ok=True)
+
+    report("default", default)
+    report("lean", lean)
+    saved = statistics.median(default) - statistics.median(lean)
+    print(f"{'saved':<12} {saved * 1000:8.1f} ms per run ({saved / statistics.median(default):.0%})")
+
+
+if __name__ == "__main__":
+    main()
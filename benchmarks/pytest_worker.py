@@ -0,0 +1,75 @@
+"""Compare per-run latency of the subprocess and worker pytest paths.
+
+Usage:
+    python benchmarks/pytest_worker.py [--runs N] [--project DIR]
+
+Without --project, a small throwaway project is generated. Pointing it at a
+real checkout gives a better picture of plugin and conftest import costs.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from proven.runners.pytest_runner import PytestRunner
+
+SAMPLE_TEST = """
+import pytest
+
+
+@pytest.mark.parametrize("value", range(20))
+def test_square(value):
+    assert value * value >= 0
+"""
+
+
+def measure(runner: PytestRunner, test_file: Path, runs: int) -> list[float]:
+    """Run the test file repeatedly and return per-run wall-clock seconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = runner.run(test_file)
+        timings.append(time.perf_counter() - start)
+        if not result.is_green:
+            raise SystemExit(f"Benchmark run failed:\n{result.output}")
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    """Print a one-line latency summary."""
+    print(
+        f"{label:<12} mean {statistics.mean(timings) * 1000:8.1f} ms"
+        f"  median {statistics.median(timings) * 1000:8.1f} ms"
+        f"  min {min(timings) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Runs per mode")
+    parser.add_argument("--project", type=Path, help="Existing project to run in")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project = args.project or Path(tmpdir)
+        test_file = project / "test_proven_benchmark.py"
+        test_file.write_text(SAMPLE_TEST)
+
+        try:
+            subprocess_runner = PytestRunner(working_dir=project)
+            report("subprocess", measure(subprocess_runner, test_file, args.runs))
+
+            worker_runner = PytestRunner(working_dir=project, use_worker=True)
+            start = time.perf_counter()
+            worker_runner.run(test_file)
+            print(f"{'worker warm':<12} {(time.perf_counter() - start) * 1000:8.1f} ms (first run, includes startup)")
+            report("worker", measure(worker_runner, test_file, args.runs))
+            worker_runner.close()
+        finally:
+            test_file.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,25 @@
 import os
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 import yaml
 from pydantic import BaseModel, Field
 
+# Properties that switch off Maven plugins a test iteration doesn't need
+DEFAULT_SKIP_PROPERTIES = [
+    "checkstyle.skip",
+    "enforcer.skip",
+    "jacoco.skip",
+    "spotbugs.skip",
+    "pmd.skip",
+    "cpd.skip",
+    "spotless.check.skip",
+    "maven.javadoc.skip",
+    "maven.source.skip",
+    "rat.skip",
+]
+
 
 class OllamaConfig(BaseModel):
     """Ollama-specific configuration."""
@@ -16,6 +30,138 @@ class OllamaConfig(BaseModel):
     model: str = "codellama"
 
 
+class PytestConfig(BaseModel):
+    """Pytest runner configuration."""
+
+    worker: bool = Field(default=False, description="Keep a warm fork-server pytest worker between runs")
+    parallel: bool = Field(default=False, description="Spread large test files over pytest-xdist workers (-n)")
+    tests_per_worker: int = Field(default=8, description="Minimum tests per xdist worker; smaller suites run serially")
+    lean: bool = Field(default=False, description="Skip plugin autoload, use importlib imports and a per-run cache dir")
+    plugins: list[str] = Field(default_factory=list, description="Plugin modules to load with -p in the lean profile")
+
+
+class JestConfig(BaseModel):
+    """Jest runner configuration."""
+
+    worker: bool = Field(default=False, description="Keep Jest loaded in a Node sidecar between runs")
+    fast: bool = Field(
+        default=False, description="Call node_modules/.bin/jest with --runTestsByPath, --ci and a shared cache"
+    )
+    transpiler: Optional[Literal["esbuild", "swc"]] = Field(
+        default=None, description="Transpile TypeScript with esbuild or swc instead of the project's transform"
+    )
+    cache_directory: Optional[str] = Field(
+        default=None,
+        description="Jest cache directory for the fast profile and transpiler (default: ~/.proven/cache/jest)",
+    )
+
+
+class VitestConfig(BaseModel):
+    """Vitest runner configuration."""
+
+    worker: bool = Field(default=True, description="Keep Vitest and its Vite server running in a Node sidecar")
+
+
+class UnittestConfig(BaseModel):
+    """Unittest runner configuration."""
+
+    in_process: bool = Field(
+        default=False, description="Run tests in a fork of Proven's interpreter instead of a new python process"
+    )
+
+
+class MavenConfig(BaseModel):
+    """Maven runner configuration."""
+
+    fast: bool = Field(
+        default=False, description="Build only the test's module (-pl -am), offline (-o), in parallel (-T)"
+    )
+    threads: str = Field(default="1C", description="Maven -T value for the fast profile")
+    skip_properties: list[str] = Field(
+        default_factory=lambda: list(DEFAULT_SKIP_PROPERTIES),
+        description="Properties set to true to skip plugins in the fast profile",
+    )
+
+
+class JUnitConfig(BaseModel):
+    """JUnit runner configuration."""
+
+    launcher_jar: Optional[str] = Field(
+        default=None, description="Path to junit-platform-console-standalone.jar (found in ~/.m2 if unset)"
+    )
+    compile_cache: Optional[str] = Field(
+        default=None, description="Folder for compiled classes kept between runs (default: ~/.proven/cache/javac)"
+    )
+
+
+class CacheConfig(BaseModel):
+    """Test result cache configuration."""
+
+    enabled: bool = Field(default=True, description="Reuse results for unchanged test and source files")
+    max_size_mb: int = Field(default=100, description="Evict least recently used results beyond this size")
+
+
+class WorkspaceConfig(BaseModel):
+    """Isolated workspace configuration."""
+
+    enabled: bool = Field(default=False, description="Write and test generated files in a private copy of the project")
+    root: Optional[str] = Field(default=None, description="Where to create workspaces (default: /dev/shm or temp)")
+
+
+class EnvironmentsConfig(BaseModel):
+    """Dependency environment templates for isolated workspaces."""
+
+    enabled: bool = Field(
+        default=False, description="Give each workspace a hardlinked clone of a venv or node_modules template"
+    )
+    root: Optional[str] = Field(default=None, description="Where templates are kept (default: ~/.proven/envs)")
+    wheelhouse: Optional[str] = Field(
+        default=None, description="Folder of wheels to install missing Python packages from"
+    )
+    npm_cache: Optional[str] = Field(default=None, description="npm cache to install missing Node packages from")
+    python_packages: list[str] = Field(
+        default_factory=lambda: ["pytest"], description="Packages installed into every Python template"
+    )
+
+
+class MatrixConfig(BaseModel):
+    """Runtime matrix configuration."""
+
+    runtimes: list[str] = Field(
+        default_factory=list,
+        description="Interpreters or binaries to run every test run against concurrently (e.g. python3.9, node18)",
+    )
+
+
+class StabilityConfig(BaseModel):
+    """Flaky test detection configuration."""
+
+    runs: int = Field(
+        default=0, description="Rerun a GREEN suite this many times at once in shuffled order (0 to turn off)"
+    )
+
+
+class MutationConfig(BaseModel):
+    """Mutation testing configuration."""
+
+    enabled: bool = Field(default=True, description="Run passing Python tests against mutants of the implementation")
+    workers: Optional[int] = Field(default=None, description="Mutants tested at once (default: one per core, up to 4)")
+    budget: float = Field(default=60.0, description="Seconds for the whole stage; mutants left after that are not run")
+    max_mutants: int = Field(default=50, description="Mutants to make at most, spread over the source file")
+    strengthen_tests: bool = Field(
+        default=False, description="Ask the LLM for stronger tests that catch surviving mutants"
+    )
+
+
+class LimitsConfig(BaseModel):
+    """Limits applied to every test command and the processes it starts."""
+
+    timeout: int = Field(default=60, description="Seconds before a test run and its process tree are killed")
+    cpu_seconds: Optional[int] = Field(default=None, description="CPU time limit per process (RLIMIT_CPU)")
+    memory_mb: Optional[int] = Field(default=None, description="Memory limit per process in MB (RLIMIT_DATA)")
+    log_size_mb: int = Field(default=64, description="Output kept in a temporary log file per command, in MB")
+
+
 class APIKeys(BaseModel):
     """API key configuration with environment variable support."""
 
@@ -32,8 +178,25 @@ class Config(BaseModel):
     test_framework: str = Field(default="pytest", description="Test framework")
     test_directory: str = Field(default="tests", description="Test output directory")
     source_directory: str = Field(default="src", description="Source output directory")
+    typescript: bool = Field(default=False, description="Generate TypeScript (.ts) for jest and vitest")
+    force_red_run: bool = Field(
+        default=False, description="Run RED-phase tests even when static checks prove they fail"
+    )
     api_keys: APIKeys = Field(default_factory=APIKeys)
     ollama: OllamaConfig = Field(default_factory=OllamaConfig)
+    pytest: PytestConfig = Field(default_factory=PytestConfig)
+    jest: JestConfig = Field(default_factory=JestConfig)
+    vitest: VitestConfig = Field(default_factory=VitestConfig)
+    unittest: UnittestConfig = Field(default_factory=UnittestConfig)
+    maven: MavenConfig = Field(default_factory=MavenConfig)
+    junit: JUnitConfig = Field(default_factory=JUnitConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    limits: LimitsConfig = Field(default_factory=LimitsConfig)
+    workspace: WorkspaceConfig = Field(default_factory=WorkspaceConfig)
+    environments: EnvironmentsConfig = Field(default_factory=EnvironmentsConfig)
+    matrix: MatrixConfig = Field(default_factory=MatrixConfig)
+    stability: StabilityConfig = Field(default_factory=StabilityConfig)
+    mutation: MutationConfig = Field(default_factory=MutationConfig)
 
     def get_api_key(self, provider: str) -> Optional[str]:
         """Get API key for a provider, resolving env vars."""
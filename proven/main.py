@@ -19,9 +19,21 @@ from . import __version__
 from .config import Config, get_global_config_path, load_config, save_global_config
 from .providers import AnthropicProvider, GoogleProvider, OllamaProvider, OpenAIProvider
 from .providers.base import LLMProvider
-from .runners import JestRunner, MavenRunner, PytestRunner
+from .runners import (
+    EnvironmentPool,
+    JestRunner,
+    JUnitRunner,
+    MatrixRunner,
+    MavenRunner,
+    PytestRunner,
+    ResourceLimits,
+    ResultCache,
+    UnittestRunner,
+    VitestRunner,
+)
 from .runners.base import TestRunner
 from .tdd.engine import TDDEngine
+from .tdd.mutation import MutationTester
 
 app = typer.Typer(
     name="proven",
@@ -108,28 +120,86 @@ def get_runner(config: Config) -> TestRunner:
     """Get the configured test runner."""
     framework = config.test_framework.lower()
 
+    runner: TestRunner
     if framework == "pytest":
-        return PytestRunner()
+        runner = PytestRunner(
+            use_worker=config.pytest.worker,
+            parallel=config.pytest.parallel,
+            tests_per_worker=config.pytest.tests_per_worker,
+            lean=config.pytest.lean,
+            plugins=config.pytest.plugins,
+        )
+    elif framework == "unittest":
+        runner = UnittestRunner(in_process=config.unittest.in_process)
     elif framework == "jest":
-        return JestRunner()
+        runner = JestRunner(
+            use_worker=config.jest.worker,
+            fast=config.jest.fast,
+            transpiler=config.jest.transpiler,
+            cache_directory=Path(config.jest.cache_directory).expanduser() if config.jest.cache_directory else None,
+        )
+    elif framework == "vitest":
+        runner = VitestRunner(use_worker=config.vitest.worker)
     elif framework == "maven":
-        return MavenRunner()
+        runner = MavenRunner(
+            fast=config.maven.fast, threads=config.maven.threads, skip_properties=config.maven.skip_properties
+        )
+    elif framework == "junit":
+        runner = JUnitRunner(
+            launcher_jar=config.junit.launcher_jar,
+            compile_cache=Path(config.junit.compile_cache).expanduser() if config.junit.compile_cache else None,
+        )
     else:
         raise typer.BadParameter(f"Unknown test framework: {framework}")
 
+    runner.timeout = config.limits.timeout
+    runner.log_limit = config.limits.log_size_mb * 1024 * 1024
+    runner.limits = ResourceLimits(cpu_seconds=config.limits.cpu_seconds, memory_mb=config.limits.memory_mb)
+    if config.cache.enabled:
+        runner.cache = ResultCache(max_bytes=config.cache.max_size_mb * 1024 * 1024)
+    if config.matrix.runtimes:
+        runner = MatrixRunner(runner, config.matrix.runtimes)
+    return runner
+
+
+def get_environment_pool(config: Config) -> Optional[EnvironmentPool]:
+    """Get the dependency environment pool for isolated workspaces, if enabled."""
+    if not (config.workspace.enabled and config.environments.enabled):
+        return None
+    settings = config.environments
+    return EnvironmentPool(
+        root=Path(settings.root).expanduser() if settings.root else None,
+        wheelhouse=Path(settings.wheelhouse).expanduser() if settings.wheelhouse else None,
+        npm_cache=Path(settings.npm_cache).expanduser() if settings.npm_cache else None,
+        python_packages=settings.python_packages,
+    )
+
+
+def get_mutation_tester(config: Config) -> Optional[MutationTester]:
+    """Get the mutation tester for passing suites, if enabled."""
+    if not config.mutation.enabled:
+        return None
+    settings = config.mutation
+    return MutationTester(
+        workers=settings.workers,
+        budget=settings.budget,
+        max_mutants=settings.max_mutants,
+        workspace_root=Path(config.workspace.root).expanduser() if config.workspace.root else None,
+    )
+
 
 def approval_callback(phase: str, code: str) -> bool:
     """Ask user to approve generated code."""
     return Confirm.ask(f"\n[bold]Approve the {phase}?[/bold]", default=True)
 
 
-def get_language_for_framework(framework: str) -> str:
+def get_language_for_framework(framework: str, typescript: bool = False) -> str:
     """Get programming language for a test framework."""
     if framework in ("pytest", "unittest"):
         return "python"
     elif framework in ("jest", "mocha", "vitest"):
-        return "javascript"
-    elif framework == "maven":
+        return "typescript" if typescript else "javascript"
+    elif framework in ("maven", "junit"):
         return "java"
     return "python"
 
@@ -146,16 +216,17 @@ def run_tdd_workflow(description: str, name: Optional[str] = None, no_confirm: b
     test_directory = Path(config.test_directory)
     source_directory = Path(config.source_directory)
     runner = get_runner(config)
-    language = get_language_for_framework(config.test_framework)
+    language = get_language_for_framework(config.test_framework, config.typescript)
 
     # Determine file names based on test framework
     if config.test_framework == "pytest":
         test_file = test_directory / f"test_{name}.py"
         source_file = source_directory / f"{name}.py"
-    elif config.test_framework == "jest":
-        test_file = test_directory / f"{name}.test.js"
-        source_file = source_directory / f"{name}.js"
-    elif config.test_framework == "maven":
+    elif config.test_framework in ("jest", "vitest"):
+        extension = "ts" if config.typescript else "js"
+        test_file = test_directory / f"{name}.test.{extension}"
+        source_file = source_directory / f"{name}.{extension}"
+    elif config.test_framework in ("maven", "junit"):
         # Maven convention: capitalize first letter for class names
         class_name = name.capitalize()
         test_file = test_directory / f"{class_name}Test.java"
@@ -173,6 +244,12 @@ def run_tdd_workflow(description: str, name: Optional[str] = None, no_confirm: b
         runner=runner,
         console=console,
         language=language,
+        isolate=config.workspace.enabled,
+        workspace_root=Path(config.workspace.root).expanduser() if config.workspace.root else None,
+        environments=get_environment_pool(config),
+        stability_runs=config.stability.runs,
+        mutation=get_mutation_tester(config),
+        mutation_feedback=config.mutation.strengthen_tests,
     )
 
     on_approval = None if no_confirm else approval_callback
@@ -184,6 +261,7 @@ def run_tdd_workflow(description: str, name: Optional[str] = None, no_confirm: b
                 test_file=test_file,
                 source_file=source_file,
                 on_approval=on_approval,
+                force_red_run=config.force_red_run,
             )
         )
 
@@ -318,6 +396,9 @@ def generate(
     test_dir: str = typer.Option(None, "--test-dir", "-t", help="Test directory"),
     source_dir: str = typer.Option(None, "--source-dir", "-s", help="Source directory"),
     no_confirm: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation prompts"),
+    force_red_run: bool = typer.Option(
+        False, "--force-red-run", help="Run the RED-phase tests even when failure is certain"
+    ),
 ) -> None:
     """Generate code using TDD methodology.
 
@@ -340,11 +421,12 @@ def generate(
         test_file = test_directory / f"test_{name}.py"
         source_file = source_directory / f"{name}.py"
         language = "python"
-    elif config.test_framework == "jest":
-        test_file = test_directory / f"{name}.test.js"
-        source_file = source_directory / f"{name}.js"
-        language = "javascript"
-    elif config.test_framework == "maven":
+    elif config.test_framework in ("jest", "vitest"):
+        extension = "ts" if config.typescript else "js"
+        test_file = test_directory / f"{name}.test.{extension}"
+        source_file = source_directory / f"{name}.{extension}"
+        language = "typescript" if config.typescript else "javascript"
+    elif config.test_framework in ("maven", "junit"):
         # Maven convention: capitalize first letter for class names
         class_name = name.capitalize()
         test_file = test_directory / f"{class_name}Test.java"
@@ -367,6 +449,12 @@ def generate(
         runner=runner,
         console=console,
         language=language,
+        isolate=config.workspace.enabled,
+        workspace_root=Path(config.workspace.root).expanduser() if config.workspace.root else None,
+        environments=get_environment_pool(config),
+        stability_runs=config.stability.runs,
+        mutation=get_mutation_tester(config),
+        mutation_feedback=config.mutation.strengthen_tests,
     )
 
     on_approval = None if no_confirm else approval_callback
@@ -378,6 +466,7 @@ def generate(
                 test_file=test_file,
                 source_file=source_file,
                 on_approval=on_approval,
+                force_red_run=force_red_run or config.force_red_run,
             )
         )
 
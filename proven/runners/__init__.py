@@ -1,8 +1,30 @@
 """Test runner implementations."""
 
-from .base import TestResult, TestRunner
+from .base import RunnerSetupError, TestCaseResult, TestResult, TestRunner
+from .cache import ResultCache
+from .environments import EnvironmentPool
 from .jest_runner import JestRunner
+from .junit_runner import JUnitRunner
+from .limits import ResourceLimits
+from .matrix import MatrixRunner
 from .maven_runner import MavenRunner
 from .pytest_runner import PytestRunner
+from .unittest_runner import UnittestRunner
+from .vitest_runner import VitestRunner
 
-__all__ = ["TestRunner", "TestResult", "PytestRunner", "JestRunner", "MavenRunner"]
+__all__ = [
+    "TestRunner",
+    "TestResult",
+    "TestCaseResult",
+    "RunnerSetupError",
+    "ResultCache",
+    "EnvironmentPool",
+    "ResourceLimits",
+    "PytestRunner",
+    "UnittestRunner",
+    "JestRunner",
+    "VitestRunner",
+    "MavenRunner",
+    "JUnitRunner",
+    "MatrixRunner",
+]
@@ -1,21 +1,109 @@
 """Abstract base class for test runners."""
 
+import asyncio
+import codecs
+import copy
+import hashlib
+import os
+import shutil
 import subprocess
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from .limits import ResourceLimits, describe_signal, kill_tree, wait_with_usage
+from .output import HEAD_SIZE, LOG_LIMIT, TAIL_SIZE, OutputSpool, discard_log, elide
+from .worker import WorkerError, WorkerProcess, WorkerTimeout
+
+if TYPE_CHECKING:
+    from .cache import ResultCache
+    from .environments import JobEnvironment
+
+
+@dataclass
+class TestCaseResult:
+    """Outcome of a single test case, from a report or the runner's live output."""
+
+    __test__ = False  # Not a pytest test class
+
+    name: str
+    outcome: str  # "passed", "failed", "error" or "skipped"
+    duration: float = 0.0  # seconds
+    message: str = ""
+    classname: str = ""
+    file: str = ""
+
+    @property
+    def is_failure(self) -> bool:
+        """Check if the test case failed or errored."""
+        return self.outcome in ("failed", "error")
 
 
 @dataclass
 class TestResult:
     """Result of running tests."""
 
+    __test__ = False  # Not a pytest test class
+
     success: bool
     output: str
     passed: int = 0
     failed: int = 0
     errors: int = 0
+    cases: list[TestCaseResult] = field(default_factory=list)
+    log_path: Optional[str] = None  # Full output, when it was too large to keep in memory
+    wall_time: float = 0.0  # seconds, for all commands of the run
+    cpu_time: float = 0.0  # seconds of user + system time, including child processes
+    peak_rss: int = 0  # bytes, largest resident set of any process in the run
+    runtimes: dict[str, "TestResult"] = field(default_factory=dict)  # Per-runtime results of a matrix run
+    flake_rates: dict[str, float] = field(default_factory=dict)  # Per test, share of stability reruns it failed
+    complete: bool = True  # False if a command timed out, was stopped or killed, or the run couldn't be set up
+
+    @classmethod
+    def from_cases(cls, success: bool, output: str, cases: list[TestCaseResult]) -> "TestResult":
+        """Build a result whose counts are derived from per-test-case results."""
+        outcomes = Counter(case.outcome for case in cases)
+        return cls(
+            success=success,
+            output=output,
+            passed=outcomes["passed"],
+            failed=outcomes["failed"],
+            errors=outcomes["error"],
+            cases=cases,
+        )
+
+    @property
+    def failures(self) -> list[TestCaseResult]:
+        """Test cases that failed or errored."""
+        return [case for case in self.cases if case.is_failure]
+
+    def discard_log(self) -> None:
+        """Delete the log file (and those of the per-runtime results) once superseded."""
+        discard_log(self.log_path)
+        self.log_path = None
+        for result in self.runtimes.values():
+            result.discard_log()
+
+    def full_output(self) -> str:
+        """The complete output, read from the log file if it was spooled to disk."""
+        if self.log_path:
+            try:
+                return Path(self.log_path).read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                pass
+        return self.output
+
+    def compact(self, limit: int = 4000) -> str:
+        """The output cut down to about limit characters, for display and prompts.
+
+        Most of the budget goes to the end, where failures are summarised.
+        """
+        return elide(self.output, limit // 4, limit - limit // 4)
 
     @property
     def is_red(self) -> bool:
@@ -28,23 +116,285 @@ class TestResult:
         return self.success and self.failed == 0 and self.errors == 0
 
 
+@dataclass
+class CommandResult:
+    """Exit code and captured output of a command."""
+
+    exit_code: int
+    output: str
+    log_path: Optional[str] = None  # Full output, when `output` had to be elided
+    wall_time: float = 0.0  # seconds
+    cpu_time: float = 0.0  # seconds of user + system time, including child processes
+    peak_rss: int = 0  # bytes
+    complete: bool = True  # False if the command couldn't start, timed out, was stopped early or killed by a signal
+
+
+# Called with each test case as its result streams in; return True to stop the run
+ProgressCallback = Callable[[TestCaseResult], bool]
+
+
+class RunProgress:
+    """Collects per-test outcomes parsed from a runner's live output."""
+
+    def __init__(self, parse_line: Callable[[str], Optional[TestCaseResult]], on_event: ProgressCallback):
+        self.parse_line = parse_line
+        self.on_event = on_event
+        self.cases: list[TestCaseResult] = []
+        self.stopped = False
+
+    def feed(self, line: str) -> bool:
+        """Handle one line of output. Returns True if the run should stop."""
+        case = self.parse_line(line)
+        if case is None or self.stopped:
+            return self.stopped
+        self.cases.append(case)
+        self.stopped = bool(self.on_event(case))
+        return self.stopped
+
+    def result(self, exit_code: int, output: str) -> TestResult:
+        """Build a result from the streamed cases, for runs without a report."""
+        return TestResult.from_cases(exit_code == 0 and not self.stopped, output, self.cases)
+
+
+def runtime_shims(executable: str, commands: tuple[str, ...]) -> Path:
+    """A directory of scripts that run a runtime under its generic names, e.g. python -> python3.9.
+
+    The first command runs the executable itself, the others their namesakes
+    next to it (javac beside java). Put on PATH, it makes test commands and
+    the tools they start use that runtime. Created once per runtime under
+    ~/.proven/runtimes and reused.
+    """
+    digest = hashlib.sha256(f"{executable}\0{commands}".encode()).hexdigest()[:16]
+    shims = Path.home() / ".proven" / "runtimes" / digest
+    if shims.exists():
+        return shims
+
+    shims.parent.mkdir(parents=True, exist_ok=True)
+    scratch = Path(tempfile.mkdtemp(prefix=f".{digest}.", dir=shims.parent))
+    # Scripts rather than symlinks: version manager shims (pyenv, nvm) pick the version from their own name
+    targets = [executable] + [str(Path(executable).resolve().with_name(command)) for command in commands[1:]]
+    for command, target in zip(commands, targets):
+        if os.path.exists(target):
+            script = scratch / command
+            script.write_text(f'#!/bin/sh\nexec "{target}" "$@"\n')
+            script.chmod(0o755)
+    try:
+        os.rename(scratch, shims)
+    except OSError:
+        shutil.rmtree(scratch, ignore_errors=True)  # Another process created it first
+    return shims
+
+
+class RunnerSetupError(Exception):
+    """Raised when a runner cannot prepare a test run (missing tools, bad classpath)."""
+
+
 class TestRunner(ABC):
-    """Abstract base class for test runners."""
+    """Abstract base class for test runners.
+
+    Subclasses describe a run with _build_command and _parse_result; run()
+    and run_async() take care of executing it, with or without a worker.
+    """
 
-    def __init__(self, working_dir: Optional[Path] = None):
+    timeout = 60  # seconds
+    log_limit = LOG_LIMIT  # characters of output kept in a log file per command
+    # Names test commands call the runtime by, shimmed on PATH when a runtime is set
+    runtime_commands: tuple[str, ...] = ()
+    # Whether runs in the same working directory may overlap
+    concurrent_runs = True
+
+    def __init__(self, working_dir: Optional[Path] = None, use_worker: bool = False):
         self.working_dir = working_dir or Path.cwd()
+        # The project the tests belong to; working_dir may be a copy of it
+        self.project_dir = self.working_dir
+        self.use_worker = use_worker
+        self.limits = ResourceLimits()
+        self._worker: Optional[WorkerProcess] = None
+        self.cache: Optional[ResultCache] = None
+        # A cloned dependency environment whose executables commands use
+        self.environment: Optional[JobEnvironment] = None
+        # The interpreter or binary runtime_commands run, e.g. "python3.9"; None for the one on PATH
+        self.runtime: Optional[str] = None
+        # Shuffles test order and seeds randomness, for stability checks; None keeps runs deterministic
+        self.seed: Optional[int] = None
 
-    @abstractmethod
-    def run(self, test_file: Path) -> TestResult:
+    def run(
+        self,
+        test_file: Path,
+        on_event: Optional[ProgressCallback] = None,
+        source_file: Optional[Path] = None,
+        only: Optional[list[TestCaseResult]] = None,
+    ) -> TestResult:
         """Run tests in the specified file.
 
         Args:
             test_file: Path to the test file
+            on_event: Called with each test case result as output streams in;
+                returning True stops the run early
+            source_file: The code under test, used to key the result cache
+            only: Run just these test cases, if the runner can select them
 
         Returns:
             TestResult with the outcome
         """
-        pass
+        selectors = self._test_selectors(test_file, only) if only else None
+        cache_key = self._cache_key(test_file, source_file, selectors)
+        cached = self._cached_result(cache_key, on_event)
+        if cached is not None:
+            return cached
+
+        progress = self._progress(on_event)
+        result = self._run(test_file, progress, selectors)
+        self._store_result(cache_key, result, progress)
+        return result
+
+    async def run_async(
+        self,
+        test_file: Path,
+        on_event: Optional[ProgressCallback] = None,
+        source_file: Optional[Path] = None,
+        only: Optional[list[TestCaseResult]] = None,
+    ) -> TestResult:
+        """Run tests in the specified file without blocking the event loop.
+
+        Same as run(), but commands run through asyncio subprocesses. Cancelling
+        the task kills the test process group.
+        """
+        selectors = self._test_selectors(test_file, only) if only else None
+        cache_key = self._cache_key(test_file, source_file, selectors)
+        cached = self._cached_result(cache_key, on_event)
+        if cached is not None:
+            return cached
+
+        progress = self._progress(on_event)
+        result = await self._run_async(test_file, progress, selectors)
+        self._store_result(cache_key, result, progress)
+        return result
+
+    def rerun(
+        self,
+        test_file: Path,
+        previous: TestResult,
+        on_event: Optional[ProgressCallback] = None,
+        source_file: Optional[Path] = None,
+    ) -> TestResult:
+        """Rerun the tests that failed last time, then the whole file once they pass.
+
+        Falls back to a full run when the previous result has no per-test
+        failures or the runner cannot select them. A GREEN result always comes
+        from a full run.
+        """
+        if self._test_selectors(test_file, previous.failures):
+            result = self.run(test_file, on_event, source_file, only=previous.failures)
+            if result.is_red:
+                return result
+            result.discard_log()
+        return self.run(test_file, on_event, source_file)
+
+    async def rerun_async(
+        self,
+        test_file: Path,
+        previous: TestResult,
+        on_event: Optional[ProgressCallback] = None,
+        source_file: Optional[Path] = None,
+    ) -> TestResult:
+        """Same as rerun(), using run_async()."""
+        if self._test_selectors(test_file, previous.failures):
+            result = await self.run_async(test_file, on_event, source_file, only=previous.failures)
+            if result.is_red:
+                return result
+            result.discard_log()
+        return await self.run_async(test_file, on_event, source_file)
+
+    def preflight(self, files: list[Path]) -> Optional[TestResult]:
+        """Check that the given files compile, without running any tests.
+
+        With a job environment, packages the files import that it lacks are
+        installed first, from its offline sources.
+
+        Returns:
+            An error TestResult with the compiler message, or None if the
+            files look fine (or the runner has no cheap check)
+        """
+        if self.environment is not None:
+            self.environment.install_missing(files)
+        message = self._check_syntax([path for path in files if path.exists()])
+        if message is None:
+            return None
+        return TestResult(success=False, output=message, errors=1)
+
+    def prove_red(self, test_file: Path, source_file: Path) -> Optional[TestResult]:
+        """Show, without running anything, that the tests are certain to fail.
+
+        Returns:
+            A synthetic RED result if the tests import something from the
+            source file that doesn't exist yet, otherwise None
+        """
+        missing = self._missing_import(test_file, source_file)
+        if missing is None:
+            return None
+        message = f"Tests import {missing}"
+        case = TestCaseResult(name=test_file.name, outcome="error", message=message, file=str(test_file))
+        return TestResult.from_cases(False, message, [case])
+
+    def _run(self, test_file: Path, progress: Optional[RunProgress], selectors: Optional[list[str]]) -> TestResult:
+        """Prepare, execute and parse one run."""
+        with tempfile.TemporaryDirectory(prefix="proven-") as report_dir:
+            try:
+                setup_commands = self._prepare(test_file)
+                executed = []
+                for command in setup_commands:
+                    setup = self._run_command(command)
+                    executed.append(setup)
+                    self._setup_finished(command, setup)
+                    if setup.exit_code != 0:
+                        result = TestResult(success=False, output=setup.output, errors=1)
+                        return self._record_usage(result, executed)
+                command = self._build_command(test_file, Path(report_dir), selectors)
+            except RunnerSetupError as e:
+                return TestResult(success=False, output=str(e), errors=1, complete=False)
+
+            run = self._execute(command, progress.feed if progress else None)
+            executed.append(run)
+            result = self._parse_result(test_file, run.exit_code, run.output, Path(report_dir), progress)
+            return self._record_usage(result, executed)
+
+    async def _run_async(
+        self, test_file: Path, progress: Optional[RunProgress], selectors: Optional[list[str]]
+    ) -> TestResult:
+        """Prepare, execute and parse one run with asyncio subprocesses."""
+        with tempfile.TemporaryDirectory(prefix="proven-") as report_dir:
+            try:
+                # Preparation may resolve dependencies, so keep it off the loop
+                setup_commands = await asyncio.to_thread(self._prepare, test_file)
+                executed = []
+                for command in setup_commands:
+                    setup = await self._run_command_async(command)
+                    executed.append(setup)
+                    await asyncio.to_thread(self._setup_finished, command, setup)
+                    if setup.exit_code != 0:
+                        result = TestResult(success=False, output=setup.output, errors=1)
+                        return self._record_usage(result, executed)
+                command = self._build_command(test_file, Path(report_dir), selectors)
+            except RunnerSetupError as e:
+                return TestResult(success=False, output=str(e), errors=1, complete=False)
+
+            run = await self._execute_async(command, progress.feed if progress else None)
+            executed.append(run)
+            result = self._parse_result(test_file, run.exit_code, run.output, Path(report_dir), progress)
+            return self._record_usage(result, executed)
+
+    @staticmethod
+    def _record_usage(result: TestResult, executed: list[CommandResult]) -> TestResult:
+        """Attach the log and resource usage of the commands behind a result."""
+        result.log_path = executed[-1].log_path
+        for command in executed[:-1]:
+            discard_log(command.log_path)  # Setup commands that succeeded
+        result.wall_time = sum(command.wall_time for command in executed)
+        result.cpu_time = sum(command.cpu_time for command in executed)
+        result.peak_rss = max(command.peak_rss for command in executed)
+        result.complete = result.complete and all(command.complete for command in executed)
+        return result
 
     @abstractmethod
     def get_test_file_pattern(self) -> str:
@@ -62,18 +412,396 @@ class TestRunner(ABC):
         """Return the runner name."""
         pass
 
-    def _run_command(self, command: list[str]) -> tuple[int, str]:
-        """Run a shell command and return exit code and output."""
+    @abstractmethod
+    def _build_command(self, test_file: Path, report_dir: Path, selectors: Optional[list[str]] = None) -> list[str]:
+        """Build the command that runs the test file.
+
+        Args:
+            test_file: Path to the test file
+            report_dir: Temporary directory for machine-readable reports
+            selectors: Run only these tests, as returned by _test_selectors
+
+        Raises:
+            RunnerSetupError: If the run cannot be set up
+        """
+        pass
+
+    @abstractmethod
+    def _parse_result(
+        self, test_file: Path, exit_code: int, output: str, report_dir: Path, progress: Optional[RunProgress]
+    ) -> TestResult:
+        """Turn the command's exit code, output and reports into a TestResult."""
+        pass
+
+    def _prepare(self, test_file: Path) -> list[list[str]]:
+        """Get commands (e.g. compilation) that must succeed before the tests run.
+
+        Raises:
+            RunnerSetupError: If the run cannot be set up
+        """
+        return []
+
+    def _setup_finished(self, command: list[str], result: CommandResult) -> None:
+        """Called after each command from _prepare, e.g. to publish or discard what it built."""
+
+    def parse_progress(self, line: str) -> Optional[TestCaseResult]:
+        """Parse a per-test result from one line of live output, if it has one."""
+        return None
+
+    def _check_syntax(self, files: list[Path]) -> Optional[str]:
+        """Return compiler errors for files that don't parse, or None."""
+        return None
+
+    def _missing_import(self, test_file: Path, source_file: Path) -> Optional[str]:
+        """Describe an import in test_file that can't resolve, or return None."""
+        return None
+
+    def cache_settings(self) -> dict[str, Any]:
+        """Settings that change test outcomes and so belong in the cache key."""
+        settings = {"working_dir": str(self.project_dir), "timeout": self.timeout}
+        if self.runtime is not None:
+            settings["runtime"] = self.runtime
+        if self.limits.cpu_seconds is not None:
+            settings["cpu_seconds"] = self.limits.cpu_seconds
+        if self.limits.memory_mb is not None:
+            settings["memory_mb"] = self.limits.memory_mb
+        return settings
+
+    def _test_selectors(self, test_file: Path, cases: list[TestCaseResult]) -> Optional[list[str]]:
+        """Identify test cases for the runner's CLI (node IDs, test names, methods).
+
+        Returns None if the runner cannot select these cases, in which case
+        the whole file is run.
+        """
+        return None
+
+    def _cache_key(
+        self, test_file: Path, source_file: Optional[Path], selectors: Optional[list[str]] = None
+    ) -> Optional[str]:
+        if self.cache is None:
+            return None
+        files = [test_file] if source_file is None else [test_file, source_file]
+        settings = self.cache_settings()
+        if selectors:
+            settings["only"] = selectors
+        return self.cache.key(self.name, files, settings)
+
+    def _cached_result(self, cache_key: Optional[str], on_event: Optional[ProgressCallback]) -> Optional[TestResult]:
+        """Look up a stored result, replaying its cases to on_event."""
+        if self.cache is None or cache_key is None:
+            return None
+        result = self.cache.get(cache_key)
+        if result is not None and on_event is not None:
+            for case in result.cases:
+                if on_event(case):
+                    break
+        return result
+
+    def _store_result(self, cache_key: Optional[str], result: TestResult, progress: Optional[RunProgress]) -> None:
+        """Cache a result, unless the run didn't complete (stopped early, timed out, killed or not set up).
+
+        Those outcomes are transient, and replaying them would stick until a file changes.
+        """
+        if self.cache is None or cache_key is None or not result.complete or (progress and progress.stopped):
+            return
+        self.cache.put(cache_key, result)
+
+    def _progress(self, on_event: Optional[ProgressCallback]) -> Optional[RunProgress]:
+        """Create a progress collector for a run, if the caller wants events."""
+        return RunProgress(self.parse_progress, on_event) if on_event else None
+
+    def _execute(self, command: list[str], on_line: Optional[Callable[[str], bool]] = None) -> CommandResult:
+        """Run the test command, through the worker when enabled."""
+        if self.use_worker:
+            worker_result = self._run_in_worker(self._worker_args(command), on_line)
+            if worker_result is not None:
+                return worker_result
+        return self._run_command(command, on_line)
+
+    async def _execute_async(
+        self, command: list[str], on_line: Optional[Callable[[str], bool]] = None
+    ) -> CommandResult:
+        """Run the test command asynchronously, through the worker when enabled."""
+        if self.use_worker:
+            worker_result = await asyncio.to_thread(self._run_in_worker, self._worker_args(command), on_line)
+            if worker_result is not None:
+                return worker_result
+        return await self._run_command_async(command, on_line)
+
+    def _popen(self, command: list[str], **options: Any) -> subprocess.Popen:
+        """Start a command in its own session, with the runner's resource limits."""
+        return subprocess.Popen(
+            command,
+            cwd=self.working_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            # A session of its own, so the whole process tree can be killed at once
+            start_new_session=True,
+            preexec_fn=self.limits.preexec(),
+            # Python buffers piped stdout, which would hold back progress lines
+            env={**self._environ(), "PYTHONUNBUFFERED": "1"},
+            **options,
+        )
+
+    def _run_command(self, command: list[str], on_line: Optional[Callable[[str], bool]] = None) -> CommandResult:
+        """Run a command and return its exit code, combined output and resource usage.
+
+        Output is read as it arrives into an OutputSpool, so a command that
+        prints without end can't exhaust memory. With on_line, each line is
+        also passed to it and the process is killed as soon as it returns True.
+        """
+        started = time.monotonic()
+        try:
+            process = self._popen(command, encoding="utf-8", errors="replace", bufsize=1)
+        except FileNotFoundError as e:
+            return CommandResult(1, f"Command not found: {e}", complete=False)
+
+        expired = threading.Event()
+
+        def expire() -> None:
+            expired.set()
+            kill_tree(process)
+
+        timer = threading.Timer(self.timeout, expire)
+        timer.start()
+
+        spool = OutputSpool(log_limit=self.log_limit)
+        stopped = False
         try:
-            result = subprocess.run(
-                command,
-                cwd=self.working_dir,
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
-            return result.returncode, result.stdout + result.stderr
-        except subprocess.TimeoutExpired:
-            return 1, "Test execution timed out"
+            assert process.stdout is not None
+            # Bounded reads, so a single endless line can't exhaust memory either
+            for line in iter(lambda: process.stdout.readline(65536), ""):
+                spool.write(line)
+                if on_line is not None and on_line(line.rstrip("\n")):
+                    stopped = True
+                    kill_tree(process)
+                    break
+            exit_code, cpu_time, peak_rss = wait_with_usage(process)
+        finally:
+            timer.cancel()
+            # Clean up anything the command left running in its session
+            kill_tree(process)
+            if process.stdout:
+                process.stdout.close()
+
+        return self._command_result(spool, exit_code, expired.is_set(), stopped, started, cpu_time, peak_rss)
+
+    async def _run_command_async(
+        self, command: list[str], on_line: Optional[Callable[[str], bool]] = None
+    ) -> CommandResult:
+        """Run a command in its own session without blocking the event loop.
+
+        Output is spooled and passed to on_line as with _run_command. On
+        timeout, early stop or cancellation the whole process tree is killed,
+        so no grandchildren are left behind.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        try:
+            process = self._popen(command)
         except FileNotFoundError as e:
-            return 1, f"Command not found: {e}"
+            return CommandResult(1, f"Command not found: {e}", complete=False)
+
+        assert process.stdout is not None
+        reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), process.stdout)
+        # asyncio's own child watcher can't report rusage, so wait4 in a thread
+        waiter = loop.run_in_executor(None, wait_with_usage, process)
+
+        spool = OutputSpool(log_limit=self.log_limit)
+        stopped = False
+        expired = False
+
+        async def read_output() -> None:
+            nonlocal stopped
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            partial = ""
+            while True:
+                data = await reader.read(65536)
+                text = decoder.decode(data, final=not data)
+                spool.write(text)
+                if on_line is not None:
+                    *lines, partial = (partial + text).split("\n")
+                    if not data and partial:
+                        lines.append(partial)
+                    # Don't let a single endless line grow without bound
+                    partial = partial[-65536:]
+                    if any(on_line(line) for line in lines):
+                        stopped = True
+                        return
+                if not data:
+                    return
+
+        try:
+            # One deadline for reading and waiting: a command can close its output and keep running
+            deadline = started + self.timeout
+            try:
+                await asyncio.wait_for(read_output(), timeout=self.timeout)
+                if stopped:
+                    kill_tree(process)
+                await asyncio.wait_for(asyncio.shield(waiter), timeout=max(deadline - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                expired = True
+                kill_tree(process)
+            exit_code, cpu_time, peak_rss = await waiter
+        except asyncio.CancelledError:
+            kill_tree(process)
+            spool.close()
+            # Reap the killed process before handing the cancellation on
+            await waiter
+            raise
+        finally:
+            kill_tree(process)
+            transport.close()
+
+        return self._command_result(spool, exit_code, expired, stopped, started, cpu_time, peak_rss)
+
+    def _command_result(
+        self,
+        spool: OutputSpool,
+        exit_code: int,
+        expired: bool,
+        stopped: bool,
+        started: float,
+        cpu_time: float,
+        peak_rss: int,
+    ) -> CommandResult:
+        """Close the spool and explain how the command ended."""
+        complete = not (expired or stopped or exit_code < 0)
+        if expired:
+            spool.write("\nTest execution timed out")
+        elif stopped:
+            spool.write("\nTest run stopped early")
+        elif exit_code < 0:
+            limit_hit = describe_signal(exit_code, self.limits)
+            spool.write(f"\n{limit_hit}" if limit_hit else f"\nTest process killed by signal {-exit_code}")
+        spool.close()
+        return CommandResult(
+            exit_code if complete else 1,
+            spool.getvalue(),
+            spool.log_path,
+            wall_time=time.monotonic() - started,
+            cpu_time=cpu_time,
+            peak_rss=peak_rss,
+            complete=complete,
+        )
+
+    def _command_env(self) -> dict[str, str]:
+        """Environment variables to set for test commands and workers."""
+        return {}
+
+    def _environ(self) -> dict[str, str]:
+        """The full environment for test commands and workers."""
+        environ = {**os.environ, **self._command_env()}
+        if self.environment is not None:
+            environ.update(self.environment.variables())
+        if self.runtime is not None and self.runtime_commands:
+            executable = shutil.which(self.runtime) or self.runtime
+            shims = runtime_shims(os.path.abspath(executable), self.runtime_commands)
+            environ["PATH"] = os.pathsep.join([str(shims), environ.get("PATH", "")])
+        return environ
+
+    def _worker_command(self) -> Optional[list[str]]:
+        """Command that starts a persistent worker, or None if unsupported."""
+        return None
+
+    def _worker_args(self, command: list[str]) -> list[str]:
+        """Arguments to send to the worker for a test command."""
+        return command
+
+    def _run_in_worker(
+        self, args: list[str], on_line: Optional[Callable[[str], bool]] = None
+    ) -> Optional[CommandResult]:
+        """Run tests through the runner's persistent worker.
+
+        Returns None when the worker is unavailable so the caller can fall back
+        to a regular subprocess. A worker that dies mid-run is restarted on the
+        next call; one that cannot start at all disables worker mode.
+
+        Workers answer once the run is over, so on_line sees the output only
+        afterwards and cannot stop the run early.
+        """
+        if self._worker is None:
+            command = self._worker_command()
+            if command is None:
+                self.use_worker = False
+                return None
+
+            self._worker = WorkerProcess(command, cwd=self.working_dir, env=self._environ())
+            try:
+                self._worker.start()
+            except WorkerError:
+                self._worker = None
+                self.use_worker = False
+                return None
+
+        request = {
+            "args": args,
+            "timeout": self.timeout,
+            "cpu_seconds": self.limits.cpu_seconds,
+            "memory_mb": self.limits.memory_mb,
+        }
+        started = time.monotonic()
+        try:
+            response = self._worker.request(request, timeout=self.timeout + 5)
+        except WorkerTimeout:
+            self._worker = None
+            return CommandResult(1, "Test execution timed out", complete=False)
+        except WorkerError:
+            self._worker = None
+            return None
+
+        # Workers send the output's head and tail already; elide() just guards the size
+        output = elide(response["output"], HEAD_SIZE, TAIL_SIZE)
+        if on_line is not None:
+            for line in output.splitlines():
+                on_line(line)
+        return CommandResult(
+            response["exit_code"],
+            output,
+            wall_time=time.monotonic() - started,
+            cpu_time=response.get("cpu_time", 0.0),
+            peak_rss=response.get("peak_rss", 0),
+            complete=response.get("complete", True),
+        )
+
+    def in_directory(self, working_dir: Path) -> "TestRunner":
+        """A copy of this runner that runs the project's tests from another directory, e.g. a workspace.
+
+        The copy shares settings, limits and the result cache, and starts a
+        worker of its own. Close it when done.
+        """
+        runner = copy.copy(self)
+        runner.working_dir = working_dir
+        runner.environment = None
+        runner._worker = None
+        return runner
+
+    def with_runtime(self, runtime: str) -> "TestRunner":
+        """A copy of this runner whose commands use another interpreter or binary, e.g. "python3.9".
+
+        Like in_directory(), the copy starts a worker of its own. Close it when done.
+        """
+        runner = copy.copy(self)
+        runner.runtime = runtime
+        runner._worker = None
+        return runner
+
+    def with_seed(self, seed: int) -> "TestRunner":
+        """A copy of this runner that shuffles test order and seeds randomness (hash seeds, RNGs) with seed.
+
+        The copy runs without a worker or the result cache, so every run
+        really happens.
+        """
+        runner = copy.copy(self)
+        runner.seed = seed
+        runner.use_worker = False
+        runner.cache = None
+        runner._worker = None
+        return runner
+
+    def close(self) -> None:
+        """Stop the persistent worker, if one is running."""
+        if self._worker is not None:
+            self._worker.close()
+            self._worker = None
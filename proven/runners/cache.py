@@ -0,0 +1,106 @@
+"""Content-addressed cache of test results."""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Any, Optional
+
+from .base import TestCaseResult, TestResult
+
+# Bump when the stored format or the meaning of a key changes
+CACHE_VERSION = 1
+
+
+def without_logs(result: TestResult) -> TestResult:
+    """A copy of result with no log file paths, for storing beyond the log's lifetime."""
+    runtimes = {runtime: without_logs(inner) for runtime, inner in result.runtimes.items()}
+    return replace(result, log_path=None, runtimes=runtimes)
+
+
+class ResultCache:
+    """Stores TestResults on disk, keyed by the content of the files under test.
+
+    Entries live as one JSON file per key. Reading an entry refreshes its
+    modification time, and the least recently used entries are evicted once
+    the cache grows past max_bytes.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = 100 * 1024 * 1024):
+        self.directory = directory or Path.home() / ".proven" / "cache" / "results"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(runner: str, files: list[Path], settings: Optional[dict[str, Any]] = None) -> str:
+        """Build a cache key from the runner name, file contents and runner settings.
+
+        Missing files are part of the key too, so a run before the source file
+        exists never matches a run after it is written.
+        """
+        digest = hashlib.sha256()
+        header = {"version": CACHE_VERSION, "runner": runner, "settings": settings or {}}
+        digest.update(json.dumps(header, sort_keys=True, default=str).encode())
+        for path in files:
+            digest.update(f"\0{path.name}\0".encode())
+            try:
+                digest.update(hashlib.sha256(path.read_bytes()).digest())
+            except OSError:
+                digest.update(b"<missing>")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[TestResult]:
+        """Return the stored result for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text())
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        cases = [TestCaseResult(**case) for case in data.pop("cases", [])]
+        return TestResult(**data, cases=cases)
+
+    def put(self, key: str, result: TestResult) -> None:
+        """Store a result, evicting old entries if the cache is over its size limit."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                # Log files are temporary, so don't point to them from the cache
+                json.dump(asdict(without_logs(result)), f)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            Path(tmp_path).unlink(missing_ok=True)
+            return
+        self._evict()
+
+    def stats(self) -> str:
+        """Describe the hit/miss counters, e.g. "3 hits, 1 miss"."""
+        return f"{self.hits} hit{'s' * (self.hits != 1)}, {self.misses} miss{'es' * (self.misses != 1)}"
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
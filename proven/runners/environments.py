@@ -0,0 +1,321 @@
+"""Pre-built dependency environments, cloned into workspaces for each job."""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .imports import JS_IMPORT, python_imports
+
+# Dependency files a Python template is built from, in install order
+PYTHON_LOCKFILES = ("requirements.txt", "requirements-dev.txt", "requirements-test.txt")
+# Used instead when there are no requirements files: its dependencies and test extras
+PYPROJECT = "pyproject.toml"
+PYPROJECT_TEST_EXTRAS = ("test", "tests", "testing", "dev")
+# Projects that declare dependencies only here keep their own environment
+PYTHON_BUILD_FILES = ("setup.py", "setup.cfg")
+NODE_LOCKFILE = "package-lock.json"
+# Seconds allowed for building a template (a full install) and for installing a missing package
+BUILD_TIMEOUT = 900
+INSTALL_TIMEOUT = 120
+
+
+class EnvironmentBuildError(Exception):
+    """A template environment could not be built."""
+
+
+def pyproject_requirements(pyproject: Path) -> Optional[list[str]]:
+    """The [project] dependencies and test extras a pyproject.toml declares, or None if unknown.
+
+    None for dynamic or tool-specific (e.g. Poetry) dependencies, and on
+    Pythons without tomllib.
+    """
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        return None
+    try:
+        project = tomllib.loads(pyproject.read_text(encoding="utf-8")).get("project")
+    except (OSError, UnicodeDecodeError, ValueError):
+        return None
+    if not isinstance(project, dict) or "dependencies" in project.get("dynamic", []):
+        return None
+    extras = project.get("optional-dependencies", {})
+    return [*project.get("dependencies", []), *(req for name in PYPROJECT_TEST_EXTRAS for req in extras.get(name, []))]
+
+
+def clone_tree(source: Path, destination: Path) -> None:
+    """Copy a directory tree as hardlinks, so it takes milliseconds and no extra space.
+
+    Files are copied instead when the destination is on another filesystem.
+    Tools that update files replace them rather than writing in place, so
+    changes in a clone never reach the source.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    same_device = os.stat(source).st_dev == os.stat(destination.parent).st_dev
+    shutil.copytree(source, destination, symlinks=True, copy_function=os.link if same_device else shutil.copy2)
+
+
+class JobEnvironment:
+    """A job's own clone of a template environment.
+
+    Runners put its executables first on PATH, so `python` is the cloned
+    venv's interpreter and the project's Node tools come from the cloned
+    node_modules.
+    """
+
+    def __init__(self, pool: "EnvironmentPool", kind: str, path: Path, working_dir: Path):
+        self.pool = pool
+        self.kind = kind
+        self.path = path
+        self.working_dir = working_dir
+        self._present: set[str] = set()
+
+    @property
+    def bin_dir(self) -> Path:
+        if self.kind == "node":
+            return self.path / ".bin"
+        return self.path / ("Scripts" if os.name == "nt" else "bin")
+
+    def variables(self) -> dict[str, str]:
+        """Environment variables that make commands use this environment."""
+        variables = {"PATH": os.pathsep.join([str(self.bin_dir), os.environ.get("PATH", "")])}
+        if self.kind == "python":
+            variables["VIRTUAL_ENV"] = str(self.path)
+        return variables
+
+    def install_missing(self, files: list[Path]) -> list[str]:
+        """Install third-party packages the files import but the environment lacks.
+
+        Packages only come from the pool's offline sources (wheelhouse or npm
+        cache); any that aren't there are left for the test run to report.
+
+        Returns:
+            The packages that were installed
+        """
+        if self.kind == "python":
+            if self.pool.wheelhouse is None:
+                return []
+            wanted = python_imports(files, self.working_dir) - self._present
+            missing = self._missing_python(wanted) if wanted else []
+        else:
+            wanted = self._node_imports(files) - self._present
+            missing = [name for name in wanted if not (self.path / name / "package.json").exists()]
+        self._present |= wanted - set(missing)
+
+        installed = []
+        for name in sorted(missing):
+            if self.pool.install(self, name):
+                installed.append(name)
+                self._present.add(name)
+        return installed
+
+    def _missing_python(self, modules: set[str]) -> list[str]:
+        """Ask the environment's interpreter which modules it can't find."""
+        script = "import importlib.util, sys; print(*[m for m in sys.argv[1:] if not importlib.util.find_spec(m)])"
+        try:
+            result = self.pool.run([str(self.bin_dir / "python"), "-c", script, *sorted(modules)], self.working_dir)
+        except (OSError, subprocess.TimeoutExpired):
+            return []
+        return result.stdout.split() if result.returncode == 0 else []
+
+    def _node_imports(self, files: list[Path]) -> set[str]:
+        """Package names of the bare require/import specifiers in the files."""
+        packages = set()
+        for path in files:
+            try:
+                code = path.read_text()
+            except (OSError, UnicodeDecodeError):
+                continue
+            for match in JS_IMPORT.finditer(code):
+                specifier = next(group for group in match.groups() if group)
+                if specifier.startswith((".", "/", "node:")):
+                    continue
+                parts = specifier.split("/")
+                packages.add("/".join(parts[:2]) if specifier.startswith("@") else parts[0])
+        return packages - self.pool.node_builtins()
+
+
+class EnvironmentPool:
+    """Template environments keyed by the hash of the project's dependency lockfile.
+
+    The first job for a lockfile builds a template (a venv, or node_modules
+    from `npm ci`) under root; every job after that gets a hardlinked clone
+    of it. Packages a job imports that the template lacks are installed into
+    the clone from a local wheelhouse or npm cache, never from the network.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        wheelhouse: Optional[Path] = None,
+        npm_cache: Optional[Path] = None,
+        python_packages: Optional[list[str]] = None,
+    ):
+        self.root = root or Path.home() / ".proven" / "envs"
+        self.wheelhouse = wheelhouse
+        self.npm_cache = npm_cache
+        # Installed into every Python template, e.g. the test framework
+        self.python_packages = ["pytest"] if python_packages is None else python_packages
+        self._lock = threading.Lock()
+        self._builds: dict[str, threading.Lock] = {}
+        self._builtins: Optional[frozenset[str]] = None
+
+    def provision(self, project_dir: Path, working_dir: Path, language: str) -> Optional[JobEnvironment]:
+        """Clone the project's template environment into working_dir, building it first if needed.
+
+        Python environments are cloned to working_dir/.venv and Node ones to
+        working_dir/node_modules, replacing the links a Workspace makes to
+        the project's own folders.
+
+        Returns:
+            The cloned environment, or None for languages without one
+            (Java), Node projects without a package-lock.json and Python
+            projects whose dependencies can't be read statically
+
+        Raises:
+            EnvironmentBuildError: If the template can't be built
+        """
+        kind = {"python": "python", "javascript": "node", "typescript": "node"}.get(language)
+        if kind is None:
+            return None
+        template = self.template(kind, project_dir)
+        if template is None:
+            return None
+
+        if kind == "python":
+            source, target = template, working_dir / ".venv"
+        else:
+            source, target = template / "node_modules", working_dir / "node_modules"
+        if target.is_symlink() or target.is_file():
+            target.unlink()
+        elif target.exists():
+            shutil.rmtree(target)
+        clone_tree(source, target)
+        return JobEnvironment(self, kind, target, working_dir)
+
+    def template(self, kind: str, project_dir: Path) -> Optional[Path]:
+        """The template directory for the project's lockfile, built on first use."""
+        digest = hashlib.sha256(self._runtime_version(kind).encode())
+        if kind == "python":
+            lockfiles = [project_dir / name for name in PYTHON_LOCKFILES if (project_dir / name).is_file()]
+            if not lockfiles and (project_dir / PYPROJECT).is_file():
+                if pyproject_requirements(project_dir / PYPROJECT) is None:
+                    return None
+                lockfiles = [project_dir / PYPROJECT]
+            elif not lockfiles and any((project_dir / name).is_file() for name in PYTHON_BUILD_FILES):
+                return None
+            digest.update("\0".join(self.python_packages).encode())
+        else:
+            lockfiles = [project_dir / NODE_LOCKFILE] if (project_dir / NODE_LOCKFILE).is_file() else []
+            if not lockfiles:
+                return None  # npm ci needs a lockfile
+        for lockfile in lockfiles:
+            digest.update(f"\0{lockfile.name}\0".encode())
+            digest.update(lockfile.read_bytes())
+        template = self.root / f"{kind}-{digest.hexdigest()[:16]}"
+
+        with self._lock:
+            build_lock = self._builds.setdefault(template.name, threading.Lock())
+        with build_lock:
+            if not template.exists():
+                self._build(kind, project_dir, lockfiles, template)
+        return template
+
+    def install(self, environment: JobEnvironment, package: str) -> bool:
+        """Install one package into a cloned environment from the offline sources."""
+        if environment.kind == "python":
+            if self.wheelhouse is None:
+                return False
+            command = [str(environment.bin_dir / "python"), "-m", "pip", "install", "--quiet", "--no-index"]
+            command += ["--find-links", str(self.wheelhouse), package]
+        else:
+            command = ["npm", "install", "--offline", "--no-save", "--no-audit", "--no-fund", *self._npm_cache()]
+            command.append(package)
+        try:
+            return self.run(command, environment.working_dir, INSTALL_TIMEOUT).returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+
+    def node_builtins(self) -> frozenset[str]:
+        """Names of Node's built-in modules, e.g. "fs", asked from node once."""
+        if self._builtins is None:
+            try:
+                result = self.run(["node", "-p", "require('module').builtinModules.join(' ')"], Path.cwd())
+                self._builtins = frozenset(result.stdout.split())
+            except (OSError, subprocess.TimeoutExpired):
+                self._builtins = frozenset()
+        return self._builtins
+
+    @staticmethod
+    def run(command: list[str], cwd: Path, timeout: int = 30) -> subprocess.CompletedProcess:
+        return subprocess.run(command, cwd=cwd, capture_output=True, text=True, timeout=timeout)
+
+    def _build(self, kind: str, project_dir: Path, lockfiles: list[Path], template: Path) -> None:
+        """Build a template in a scratch directory next to it, then rename it into place.
+
+        The rename is atomic, so a half-built template is never used, and
+        when another process builds the same one first its copy is kept.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        scratch = Path(tempfile.mkdtemp(prefix=f".{template.name}.", dir=self.root)).resolve()
+        try:
+            if kind == "python":
+                commands = self._python_commands(scratch / "venv", lockfiles)
+                build_dir = scratch / "venv"
+            else:
+                for lockfile in (project_dir / "package.json", *lockfiles):
+                    shutil.copy2(lockfile, scratch / lockfile.name)
+                commands = [["npm", "ci", "--prefer-offline", "--no-audit", "--no-fund", *self._npm_cache()]]
+                build_dir = scratch
+
+            for command in commands:
+                try:
+                    result = self.run(command, project_dir if kind == "python" else scratch, BUILD_TIMEOUT)
+                except (OSError, subprocess.TimeoutExpired) as e:
+                    raise EnvironmentBuildError(f"{' '.join(command)} failed: {e}") from e
+                if result.returncode != 0:
+                    raise EnvironmentBuildError(f"{' '.join(command)} failed:\n{result.stdout}{result.stderr}")
+            if kind == "node":
+                # npm ci leaves no node_modules when there are no dependencies
+                (build_dir / "node_modules").mkdir(exist_ok=True)
+            try:
+                os.rename(build_dir, template)
+            except OSError:
+                if not template.exists():
+                    raise
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    def _python_commands(self, venv: Path, lockfiles: list[Path]) -> list[list[str]]:
+        """Create the venv, then install the lockfiles (or pyproject dependencies) and python_packages into it."""
+        python = str(venv / ("Scripts" if os.name == "nt" else "bin") / "python")
+        install = [python, "-m", "pip", "install", "--quiet"]
+        if self.wheelhouse is not None:
+            install += ["--find-links", str(self.wheelhouse)]
+        requirements = []
+        for lockfile in lockfiles:
+            if lockfile.name == PYPROJECT:
+                requirements += pyproject_requirements(lockfile) or []
+            else:
+                requirements += ["-r", str(lockfile)]
+        commands = [["python", "-m", "venv", str(venv)]]
+        if requirements or self.python_packages:
+            commands.append([*install, *requirements, *self.python_packages])
+        return commands
+
+    def _npm_cache(self) -> list[str]:
+        return ["--cache", str(self.npm_cache)] if self.npm_cache is not None else []
+
+    def _runtime_version(self, kind: str) -> str:
+        """The interpreter or Node version, part of the template key."""
+        command = ["python", "-c", "import sys; print(sys.version)"] if kind == "python" else ["node", "--version"]
+        try:
+            result = self.run(command, Path.cwd())
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise EnvironmentBuildError(f"{command[0]} is not available: {e}") from e
+        return f"{kind}\0{result.stdout.strip()}"
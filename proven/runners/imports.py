@@ -0,0 +1,208 @@
+"""Static checks for test imports that cannot resolve yet.
+
+Each function answers the same question for one language: does the test
+file depend on the source file under test in a way that is guaranteed to
+fail, because that file (or the name imported from it) does not exist?
+They return a description of the missing import, or None when failure
+can't be proven.
+"""
+
+import ast
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Directories that never hold the project's own modules
+SKIP_DIRS = {".git", ".venv", "venv", "node_modules", "site-packages", "__pycache__", "target", "build", "dist"}
+
+JS_EXTENSIONS = ("", ".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs", "/index.js", "/index.ts")
+JS_IMPORT = re.compile(
+    r"""(?:require|import)\s*\(\s*['"]([^'"]+)['"]\s*\)"""  # require("x"), import("x")
+    r"""|\bfrom\s*['"]([^'"]+)['"]"""  # import/export ... from "x"
+    r"""|\bimport\s*['"]([^'"]+)['"]"""  # import "x"
+)
+
+# Classes a Java test can use without importing them
+JAVA_LANG = {"Boolean", "Byte", "Character", "Double", "Enum", "Error", "Exception", "Float", "Integer", "Iterable"}
+JAVA_LANG |= {"Long", "Math", "Number", "Object", "Process", "Record", "Runtime", "Short", "String", "System", "Thread"}
+
+
+def find_file(root: Path, names: set[str]) -> Optional[Path]:
+    """Find a file or directory with one of the given names under root."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in SKIP_DIRS and not name.startswith(".")]
+        for name in names.intersection(filenames + dirnames):
+            return Path(dirpath) / name
+    return None
+
+
+def missing_python_import(
+    test_file: Path, source_file: Path, root: Path, env: Optional[dict[str, str]] = None
+) -> Optional[str]:
+    """Check Python imports of source_file's module, or of names it doesn't define.
+
+    Whether a missing module is installed is checked with the `python` that
+    env (the test command's environment) puts first on PATH.
+    """
+    try:
+        tree = ast.parse(test_file.read_bytes())
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    modules = _python_module_names(source_file, root)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imported = [(alias.name, None) for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            imported = [(node.module, alias.name) for alias in node.names]
+            # "from package import module" imports the module itself
+            imported += [(f"{node.module}.{alias.name}", None) for alias in node.names]
+        else:
+            continue
+
+        for module, name in imported:
+            if module not in modules:
+                continue
+            if not source_file.exists():
+                if "." not in module and _importable_elsewhere(module, root, env):
+                    return None
+                return f"{module} ({source_file} does not exist)"
+            defined = _python_defined_names(source_file)
+            if name is not None and name != "*" and defined is not None and name not in defined:
+                return f"{module}.{name} (not defined in {source_file})"
+    return None
+
+
+def missing_js_import(test_file: Path, source_file: Path) -> Optional[str]:
+    """Check relative require/import specifiers that point at a missing source_file."""
+    try:
+        code = test_file.read_text()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    source_stem = os.path.abspath(source_file.with_suffix(""))
+    for match in JS_IMPORT.finditer(code):
+        specifier = next(group for group in match.groups() if group)
+        if not specifier.startswith("."):
+            continue
+        target = os.path.abspath(test_file.parent / specifier)
+        if target not in (source_stem, os.path.abspath(source_file)):
+            continue
+        # Be conservative: any file the specifier might resolve to means "can't prove"
+        if not any(Path(base + extension).is_file() for base in (target, source_stem) for extension in JS_EXTENSIONS):
+            return f"{specifier} ({source_file} does not exist)"
+    return None
+
+
+def missing_java_class(test_file: Path, source_file: Path, root: Path) -> Optional[str]:
+    """Check for references to the class in source_file when no such class exists."""
+    class_name = source_file.stem
+    if source_file.exists():
+        return None
+    try:
+        code = test_file.read_text()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    # Ignore comments and string literals that happen to mention the class
+    code = re.sub(r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\])*"', "", code, flags=re.DOTALL)
+    # A class of the same name from another package, e.g. in a dependency jar,
+    # or any class from an on-demand import, may be what the test means
+    folders = Path(os.path.abspath(source_file)).parent.parts
+    for package in re.findall(rf"^\s*import\s+([\w.]+)\.(?:{class_name}|\*)\s*;", code, re.MULTILINE):
+        parts = tuple(package.split("."))
+        if folders[-len(parts) :] != parts:
+            return None
+    imported = re.search(rf"^\s*import\s+[\w.]+\.{class_name}\s*;", code, re.MULTILINE)
+    referenced = class_name not in JAVA_LANG and re.search(rf"\b{class_name}\b", code)
+    if not (imported or referenced):
+        return None
+    if find_file(root, {f"{class_name}.java"}) is not None:
+        return None
+    return f"{class_name} ({source_file} does not exist)"
+
+
+def python_imports(files: list[Path], root: Path) -> set[str]:
+    """Top-level modules the files import from outside the project and the standard library."""
+    modules = set()
+    for path in files:
+        try:
+            tree = ast.parse(path.read_bytes())
+        except (OSError, SyntaxError, ValueError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules.update(alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                modules.add(node.module.split(".")[0])
+
+    stdlib = getattr(sys, "stdlib_module_names", frozenset())  # Python 3.10+
+    local = {path.stem for path in files}
+    return {
+        module
+        for module in modules - stdlib - local - {"__future__"}
+        if find_file(root, {f"{module}.py", module}) is None
+    }
+
+
+def _python_module_names(source_file: Path, root: Path) -> set[str]:
+    """Dotted names the source file can be imported as, e.g. {"calc", "src.calc"}."""
+    path = source_file.with_suffix("")
+    names = {path.name}
+    for base in (root, root / "src"):
+        try:
+            names.add(".".join(path.resolve().relative_to(base.resolve()).parts))
+        except ValueError:
+            continue
+    return names
+
+
+def _python_defined_names(source_file: Path) -> Optional[set[str]]:
+    """Top-level names a module defines, or None if they can't be known statically."""
+    try:
+        tree = ast.parse(source_file.read_bytes())
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names.update(name.id for target in targets for name in ast.walk(target) if isinstance(name, ast.Name))
+        elif is_main_guard(node):
+            continue
+        elif not isinstance(node, (ast.Expr, ast.Pass)):
+            # Conditional definitions, loops, globals(): give up on proving anything
+            return None
+    # Star imports and module __getattr__ can provide any name
+    return None if "__getattr__" in names or "*" in names else names
+
+
+def is_main_guard(node: ast.AST) -> bool:
+    """Check for an `if __name__ == "__main__":` block, which importing the module never runs."""
+    return (
+        isinstance(node, ast.If)
+        and isinstance(node.test, ast.Compare)
+        and isinstance(node.test.left, ast.Name)
+        and node.test.left.id == "__name__"
+    )
+
+
+def _importable_elsewhere(module: str, root: Path, env: Optional[dict[str, str]] = None) -> bool:
+    """Check if a top-level module name resolves without the source file, in the project's python."""
+    if find_file(root, {f"{module}.py", module}) is not None:
+        return True
+    check = f"import importlib.util, sys; sys.exit(importlib.util.find_spec({module!r}) is None)"
+    try:
+        result = subprocess.run(["python", "-c", check], cwd=root, env=env, capture_output=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return True  # Can't tell, so can't prove anything
+    # 1 is "not found"; anything else, including a crash, can't prove it missing
+    return result.returncode != 1
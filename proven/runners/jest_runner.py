@@ -1,13 +1,92 @@
 """Jest test runner implementation."""
 
+import json
+import os
 import re
+import shutil
 from pathlib import Path
+from typing import Any, Callable, Optional
 
-from .base import TestResult, TestRunner
+from .base import CommandResult, RunProgress, TestCaseResult, TestResult, TestRunner
+from .imports import missing_js_import
+from .reports import parse_jest_json
+
+WORKER_SCRIPT = Path(__file__).parent / "jest_worker.js"
+TRANSFORM_SCRIPT = Path(__file__).parent / "jest_transform.js"
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+PROGRESS_LINE = re.compile(r"^\s*([✓✕○✎])\s+(.+?)(?:\s+\(\d+(?:\.\d+)?\s*m?s\))?\s*$")
+# node --check only understands plain JavaScript, not TypeScript
+SYNTAX_CHECK_SUFFIXES = (".js", ".cjs", ".mjs")
+PROGRESS_OUTCOMES = {"✓": "passed", "✕": "failed", "○": "skipped", "✎": "skipped"}
+
+
+def find_node_binary(start: Path, name: str) -> Optional[Path]:
+    """Find node_modules/.bin/<name> in start or the nearest parent that has one (for hoisted monorepos)."""
+    if os.name == "nt":
+        name += ".cmd"
+    for directory in (start, *start.parents):
+        binary = directory / "node_modules" / ".bin" / name
+        if binary.exists():
+            return binary
+    return None
+
+
+def find_jest_binary(start: Path) -> Optional[Path]:
+    """Find the project's jest binary."""
+    return find_node_binary(start, "jest")
+
+
+def check_js_syntax(runner: TestRunner, files: list[Path]) -> Optional[str]:
+    """Check JavaScript files with node --check."""
+    if shutil.which("node") is None:
+        return None
+    for path in files:
+        if path.suffix not in SYNTAX_CHECK_SUFFIXES:
+            continue
+        result = runner._run_command(["node", "--check", str(path)])
+        # JSX is valid for Babel and Vite transforms but not for node
+        if result.exit_code != 0 and "Unexpected token '<'" not in result.output:
+            return result.output
+    return None
+
+
+def full_test_names(cases: list[TestCaseResult]) -> Optional[list[str]]:
+    """Select cases by full test name; a suite that failed to load can't be narrowed down."""
+    if any(case.name == case.file for case in cases):
+        return None
+    return [case.name for case in cases] or None
 
 
 class JestRunner(TestRunner):
-    """Test runner for Jest (JavaScript/TypeScript)."""
+    """Test runner for Jest (JavaScript/TypeScript).
+
+    The fast profile calls the project's jest binary directly instead of
+    going through npx, runs the test file by path without matching it
+    against every file in the project, and keeps Jest's transform cache in
+    one shared directory.
+
+    With a transpiler ("esbuild" or "swc"), TypeScript files are transformed
+    by that transpiler, without type-checking, instead of the project's own
+    transform (typically ts-jest). Jest caches each transformed file in the
+    shared cache directory.
+    """
+
+    runtime_commands = ("node",)
+
+    def __init__(
+        self,
+        working_dir: Optional[Path] = None,
+        use_worker: bool = False,
+        fast: bool = False,
+        cache_directory: Optional[Path] = None,
+        transpiler: Optional[str] = None,
+    ):
+        super().__init__(working_dir, use_worker)
+        self.fast = fast
+        self.transpiler = transpiler
+        self.cache_directory = cache_directory or Path.home() / ".proven" / "cache" / "jest"
+        self._executable: Optional[list[str]] = None
 
     @property
     def name(self) -> str:
@@ -21,40 +100,120 @@ class JestRunner(TestRunner):
         path = Path(source_name)
         return f"{path.stem}.test{path.suffix}"
 
-    def run(self, test_file: Path) -> TestResult:
-        """Run Jest on the specified file."""
-        command = [
-            "npx",
-            "jest",
-            str(test_file),
-            "--colors",
-        ]
+    def _build_command(self, test_file: Path, report_dir: Path, selectors: Optional[list[str]] = None) -> list[str]:
+        """Build the Jest command, writing a JSON report to report_dir."""
+        command = [*self._jest_executable(), str(test_file)]
+        if self.fast:
+            # Output goes into prompts, so it is left without colors
+            command += ["--runTestsByPath", "--ci"]
+        else:
+            command.append("--colors")
+        if self.fast or self.transpiler:
+            command.append(f"--cacheDirectory={self.cache_directory}")
+        if self.transpiler:
+            command.append(f"--transform={json.dumps(self._transform())}")
+        command += ["--json", f"--outputFile={report_dir / 'jest.json'}"]
+        if self.seed is not None:
+            # Shuffles test order within each file (Jest 29.2+)
+            command += ["--randomize", f"--seed={self.seed % 2**31}"]
+        if selectors:
+            # -t matches against each test's full name ("describe title test title")
+            command.append(f"--testNamePattern={'|'.join(map(re.escape, selectors))}")
+        return command
+
+    def _transform(self) -> dict[str, Any]:
+        """Jest's transform setting for the transpiler; it replaces the project's.
+
+        JavaScript keeps Jest's default, babel-jest.
+        """
+        return {
+            r"^.+\.[cm]?tsx?$": [str(TRANSFORM_SCRIPT), {"transpiler": self.transpiler}],
+            r"^.+\.[cm]?jsx?$": "babel-jest",
+        }
 
-        exit_code, output = self._run_command(command)
+    def _jest_executable(self) -> list[str]:
+        """Resolve the project's jest binary once; npx resolves it again on every call."""
+        if self._executable is None:
+            binary = find_jest_binary(self.working_dir.resolve()) if self.fast else None
+            self._executable = [str(binary)] if binary else ["npx", "jest"]
+        return self._executable
 
-        # Parse Jest output for stats
-        passed = 0
-        failed = 0
-        errors = 0
+    def cache_settings(self) -> dict[str, Any]:
+        """--ci changes how snapshots behave and transpilers don't type-check, so both are part of the key."""
+        return {**super().cache_settings(), "fast": self.fast, "transpiler": self.transpiler}
 
-        # Look for passed/failed counts in Jest output
-        # Format can be "Tests: 5 passed" or "Tests: 2 failed, 3 passed"
-        passed_match = re.search(r"(\d+) passed", output)
-        failed_match = re.search(r"(\d+) failed", output)
+    def _parse_result(
+        self, test_file: Path, exit_code: int, output: str, report_dir: Path, progress: Optional[RunProgress]
+    ) -> TestResult:
+        """Parse Jest results from the JSON report, or the output as a fallback."""
+        # Color codes would only add noise to the output shown to the LLM
+        output = ANSI_ESCAPE.sub("", output)
+        cases = self._read_report(report_dir / "jest.json")
+        if cases:
+            return TestResult.from_cases(exit_code == 0, output, cases)
+        if progress and progress.cases:
+            # Stopped early, before Jest wrote its report
+            return progress.result(exit_code, output)
 
-        if passed_match:
-            passed = int(passed_match.group(1))
-        if failed_match:
-            failed = int(failed_match.group(1))
+        # No report: fall back to the summary line, e.g. "Tests: 2 failed, 3 passed, 5 total"
+        summary = re.search(r"Tests:([^\n]*)", output)
+        counts = {"passed": 0, "failed": 0}
+        for match in re.finditer(r"(\d+) (passed|failed)", summary.group(1) if summary else output):
+            counts[match.group(2)] = int(match.group(1))
 
         # Check for errors in output
-        if "Error:" in output or "SyntaxError" in output:
-            errors = 1
+        errors = 1 if "Error:" in output or "SyntaxError" in output else 0
 
         return TestResult(
             success=exit_code == 0,
             output=output,
-            passed=passed,
-            failed=failed,
+            passed=counts["passed"],
+            failed=counts["failed"],
             errors=errors,
         )
+
+    def parse_progress(self, line: str) -> Optional[TestCaseResult]:
+        """Parse a verbose result line like "  ✓ adds numbers (3 ms)"."""
+        match = PROGRESS_LINE.match(ANSI_ESCAPE.sub("", line))
+        if not match:
+            return None
+        return TestCaseResult(name=match.group(2), outcome=PROGRESS_OUTCOMES[match.group(1)])
+
+    def _check_syntax(self, files: list[Path]) -> Optional[str]:
+        return check_js_syntax(self, files)
+
+    def _missing_import(self, test_file: Path, source_file: Path) -> Optional[str]:
+        return missing_js_import(test_file, source_file)
+
+    def _test_selectors(self, test_file: Path, cases: list[TestCaseResult]) -> Optional[list[str]]:
+        return full_test_names(cases)
+
+    @staticmethod
+    def _read_report(report: Path) -> list[TestCaseResult]:
+        """Read per-test results from the --json report, if Jest wrote one."""
+        if not report.exists():
+            return []
+        try:
+            return parse_jest_json(report)
+        except ValueError:
+            return []
+
+    def _worker_args(self, command: list[str]) -> list[str]:
+        """The sidecar already has Jest loaded, so drop the jest executable."""
+        return command[len(self._jest_executable()) :]
+
+    def _worker_command(self) -> Optional[list[str]]:
+        """Start the Node sidecar that keeps Jest loaded between runs."""
+        return ["node", str(WORKER_SCRIPT), str(self.working_dir)]
+
+    def _run_in_worker(
+        self, args: list[str], on_line: Optional[Callable[[str], bool]] = None
+    ) -> Optional[CommandResult]:
+        """Run in the sidecar, unless resource limits are set.
+
+        The sidecar runs every request in one long-lived Node process, which
+        can't take per-run rlimits, so limited runs use a subprocess instead.
+        """
+        if self.limits.cpu_seconds is not None or self.limits.memory_mb is not None:
+            return None
+        return super()._run_in_worker(args, on_line)
@@ -0,0 +1,75 @@
+/*
+ * Jest transform that transpiles TypeScript with esbuild or swc.
+ *
+ * Proven's JestRunner uses it in place of the project's TypeScript transform
+ * (typically ts-jest, which type-checks every file it transforms). Types are
+ * stripped without being checked. The transpiler is loaded from the
+ * project's node_modules.
+ *
+ * Jest keeps each result in its cacheDirectory under getCacheKey(), so a
+ * file is only transpiled again when it, the transpiler or Jest's
+ * configuration changes.
+ *
+ * Transform options: {"transpiler": "esbuild" | "swc"}
+ */
+
+"use strict";
+
+const crypto = require("crypto");
+
+const MODULES = { esbuild: "esbuild", swc: "@swc/core" };
+const loaded = new Map();
+
+function loadTranspiler(transformOptions) {
+  const name = (transformOptions.transformerConfig || {}).transpiler || "esbuild";
+  const rootDir = transformOptions.config.rootDir;
+  const key = `${name}\0${rootDir}`;
+  if (!loaded.has(key)) {
+    if (!MODULES[name]) {
+      throw new Error(`Unknown transpiler "${name}", expected esbuild or swc`);
+    }
+    const modulePath = require.resolve(MODULES[name], { paths: [rootDir] });
+    loaded.set(key, { name, module: require(modulePath) });
+  }
+  return loaded.get(key);
+}
+
+function transpile(transpiler, sourceText, sourcePath) {
+  const tsx = sourcePath.endsWith("x");
+  if (transpiler.name === "swc") {
+    return transpiler.module.transformSync(sourceText, {
+      filename: sourcePath,
+      sourceMaps: "inline",
+      module: { type: "commonjs" },
+      jsc: {
+        parser: { syntax: "typescript", tsx },
+        target: "es2020",
+        // Hoist jest.mock() calls above imports, as babel-jest does
+        transform: { hidden: { jest: true } },
+      },
+    }).code;
+  }
+  return transpiler.module.transformSync(sourceText, {
+    loader: tsx ? "tsx" : "ts",
+    format: "cjs",
+    target: `node${process.versions.node.split(".")[0]}`,
+    sourcefile: sourcePath,
+    sourcemap: "inline",
+  }).code;
+}
+
+module.exports = {
+  process(sourceText, sourcePath, transformOptions) {
+    return { code: transpile(loadTranspiler(transformOptions), sourceText, sourcePath) };
+  },
+
+  getCacheKey(sourceText, sourcePath, transformOptions) {
+    const transpiler = loadTranspiler(transformOptions);
+    return crypto
+      .createHash("sha256")
+      .update(`${transpiler.name}@${transpiler.module.version}\0${process.version}\0`)
+      .update(`${sourcePath}\0${transformOptions.configString}\0`)
+      .update(sourceText)
+      .digest("hex");
+  },
+};
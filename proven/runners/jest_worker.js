@@ -0,0 +1,170 @@
+#!/usr/bin/env node
+/*
+ * Long-lived Jest sidecar for Proven.
+ *
+ * Loads the project's Jest once and runs tests through its programmatic
+ * runCLI API, so repeated runs skip npx resolution and Node/Jest startup.
+ *
+ * Protocol (one JSON object per line on stdin/stdout):
+ *   -> {"args": ["tests/foo.test.js", "--colors", "--outputFile=out.json"], "timeout": 60}
+ *   <- {"exit_code": 1, "output": "...", "complete": true}
+ *
+ * A run still going after "timeout" seconds is answered as incomplete and
+ * the sidecar exits, since Jest can't be stopped mid-run; Proven starts a
+ * new one for the next request. A run that blocks the event loop is left
+ * to Proven's own, slightly longer, timeout.
+ *
+ * Arguments use the same spelling as the jest CLI, limited to the forms
+ * Proven generates: positional test paths, --flag, --no-flag and --key=value.
+ */
+
+"use strict";
+
+const fs = require("fs");
+const readline = require("readline");
+
+const rootDir = process.argv[2] || process.cwd();
+
+// Characters kept from the start and the end of a run's output, as Proven's OutputSpool does
+const HEAD_SIZE = 32 * 1024;
+const TAIL_SIZE = 32 * 1024;
+
+function createCapture() {
+  let head = "";
+  let tail = [];
+  let tailLength = 0;
+  let total = 0;
+  return {
+    write(text) {
+      total += text.length;
+      if (head.length < HEAD_SIZE) {
+        const room = HEAD_SIZE - head.length;
+        head += text.slice(0, room);
+        text = text.slice(room);
+      }
+      if (!text) return;
+      tail.push(text);
+      tailLength += text.length;
+      if (tailLength > 2 * TAIL_SIZE) {
+        tail = [tail.join("").slice(-TAIL_SIZE)];
+        tailLength = tail[0].length;
+      }
+    },
+    text() {
+      const end = tail.join("").slice(-TAIL_SIZE);
+      const omitted = total - head.length - end.length;
+      return omitted > 0 ? `${head}\n... [${omitted} characters omitted] ...\n${end}` : head + end;
+    },
+  };
+}
+
+function send(message) {
+  // Write straight to fd 1 so captured stdout never mixes with the protocol
+  fs.writeSync(1, JSON.stringify(message) + "\n");
+}
+
+function toArgv(args) {
+  const argv = { _: [], $0: "jest" };
+  for (const arg of args) {
+    const match = /^--([^=]+)(?:=(.*))?$/.exec(arg);
+    if (!match) {
+      argv._.push(arg);
+      continue;
+    }
+    let [, key, value] = match;
+    if (value === undefined) {
+      value = !key.startsWith("no-");
+      key = key.replace(/^no-/, "");
+    } else if (/^-?\d+$/.test(value)) {
+      value = Number(value);
+    }
+    argv[key.replace(/-([a-z])/g, (_, letter) => letter.toUpperCase())] = value;
+  }
+  return argv;
+}
+
+function loadJest() {
+  const jestPath = require.resolve("jest", { paths: [rootDir] });
+  const jest = require(jestPath);
+  if (typeof jest.runCLI !== "function") {
+    throw new Error("Installed jest does not expose runCLI");
+  }
+  return jest;
+}
+
+async function runTests(jest, request) {
+  const output = createCapture();
+  const capture = (chunk, encoding, callback) => {
+    output.write(typeof chunk === "string" ? chunk : Buffer.from(chunk).toString());
+    const done = typeof encoding === "function" ? encoding : callback;
+    if (done) done();
+    return true;
+  };
+
+  const originalStdout = process.stdout.write;
+  const originalStderr = process.stderr.write;
+  process.stdout.write = capture;
+  process.stderr.write = capture;
+
+  let exitCode = 1;
+  let complete = true;
+  let timer;
+  const expired = new Promise((resolve) => {
+    if (request.timeout) timer = setTimeout(resolve, request.timeout * 1000);
+  });
+  try {
+    const run = jest.runCLI(toArgv(request.args || []), [rootDir]);
+    const finished = await Promise.race([run, expired]);
+    if (finished) {
+      exitCode = finished.results.success ? 0 : 1;
+    } else {
+      complete = false;
+      output.write("\nTest execution timed out");
+    }
+  } catch (error) {
+    output.write(String((error && error.stack) || error) + "\n");
+  } finally {
+    clearTimeout(timer);
+    process.stdout.write = originalStdout;
+    process.stderr.write = originalStderr;
+  }
+
+  return { exit_code: exitCode, output: output.text(), complete };
+}
+
+function main() {
+  let jest;
+  try {
+    process.chdir(rootDir);
+    jest = loadJest();
+  } catch (error) {
+    send({ ready: false, error: String((error && error.message) || error) });
+    return;
+  }
+
+  send({ ready: true });
+
+  // Requests are handled one at a time, in arrival order
+  let queue = Promise.resolve();
+  const input = readline.createInterface({ input: process.stdin });
+  input.on("line", (line) => {
+    queue = queue.then(async () => {
+      let request;
+      try {
+        request = JSON.parse(line);
+      } catch (error) {
+        send({ exit_code: 1, output: `Invalid request: ${error.message}` });
+        return;
+      }
+      const response = await runTests(jest, request);
+      send(response);
+      if (!response.complete) {
+        // The timed-out run is still going and would share this process
+        process.exit(1);
+      }
+    });
+  });
+  input.on("close", () => queue.then(() => process.exit(0)));
+}
+
+main();
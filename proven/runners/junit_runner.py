@@ -0,0 +1,359 @@
+"""JUnit test runner that compiles and launches tests without Maven."""
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Optional
+
+from .base import CommandResult, RunnerSetupError, RunProgress, TestCaseResult, TestResult, TestRunner
+from .imports import missing_java_class
+from .maven_runner import check_java_syntax, java_method_names, junit_random_order
+from .reports import parse_junit_xml
+
+LAUNCHER_ARTIFACT = "org/junit/platform/junit-platform-console-standalone"
+
+# Test methods end in "()"; containers (classes, nested classes) don't
+PROGRESS_LINE = re.compile(r"[├└]─ (.+?\)) ([✔✘↷])")
+PROGRESS_OUTCOMES = {"✔": "passed", "✘": "failed", "↷": "skipped"}
+
+# Written into a compile cache folder once javac has succeeded
+COMPLETE_MARKER = ".complete"
+STAGING_SUFFIX = ".staging"
+
+# Comments, string and char literals, and braces, in the order javac reads them
+JAVA_TOKEN = re.compile(
+    r'//[^\n]*|/\*.*?\*/|"""(?:\\.|[^\\])*?"""|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|[{};]', re.S
+)
+METHOD_HEADER = re.compile(r"\)\s*(?:throws\s+[\w.<>,\s]+)?$")
+
+
+def java_interface(code: str) -> str:
+    """Reduce Java source to what classes compiled against it depend on.
+
+    Comments and method bodies are dropped; declarations, signatures and
+    field initializers (javac inlines constants into the classes that use
+    them) are kept, with whitespace collapsed.
+
+    Args:
+        code: The Java source
+
+    Returns:
+        The source's declarations
+    """
+    kept: list[str] = []
+    blocks: list[bool] = []  # Whether each open block is a method body
+    segment = ""  # Text since the last brace or semicolon, to tell a method body from a type body
+    position = 0
+    for token in JAVA_TOKEN.finditer(code):
+        text = code[position : token.start()]
+        position = token.end()
+        in_body = any(blocks)
+        if not in_body:
+            kept.append(text)
+        segment += text
+        value = token.group()
+        if value.startswith("/"):
+            continue
+        if value[0] in "\"'":
+            if not in_body:
+                kept.append(value)
+            segment += value
+            continue
+        if value == "{":
+            # Records declare their components in parentheses too
+            blocks.append(
+                in_body or (METHOD_HEADER.search(segment.strip()) is not None and not re.search(r"\brecord\b", segment))
+            )
+        elif value == "}" and blocks:
+            blocks.pop()
+            in_body = any(blocks)
+        if not in_body:
+            kept.append(value)
+        segment = ""
+    if not any(blocks):
+        kept.append(code[position:])
+    return " ".join("".join(kept).split())
+
+
+class JUnitRunner(TestRunner):
+    """Test runner for JUnit (Java) that skips the Maven lifecycle.
+
+    The project's test classpath is resolved once through Maven and cached by
+    pom.xml hash. The generated test class and its source file are compiled
+    with javac, each into its own folder of a persistent compile cache keyed
+    by the file's contents and the classpath, so a file that hasn't changed
+    is never compiled again. javac writes into a staging folder that is only
+    moved into place, with a marker file, once it succeeds, so concurrent
+    runs never see a half-written folder. The tests then run with the JUnit
+    console launcher.
+    """
+
+    runtime_commands = ("java", "javac")
+
+    def __init__(
+        self,
+        working_dir: Optional[Path] = None,
+        launcher_jar: Optional[str] = None,
+        compile_cache: Optional[Path] = None,
+    ):
+        super().__init__(working_dir)
+        self.launcher_jar = launcher_jar
+        self.compile_cache = compile_cache or Path.home() / ".proven" / "cache" / "javac"
+        self._classpath: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return "junit"
+
+    def get_test_file_pattern(self) -> str:
+        return "*Test.java"
+
+    def get_test_file_name(self, source_name: str) -> str:
+        """Generate test file name: Foo.java -> FooTest.java"""
+        path = Path(source_name)
+        return f"{path.stem}Test{path.suffix}"
+
+    def _prepare(self, test_file: Path) -> list[list[str]]:
+        """Compile the source file, then the test, unless the compile cache has them."""
+        commands = []
+        output_dirs = []
+        for java_file, output_dir in self._compile_outputs(test_file):
+            if not (output_dir / COMPLETE_MARKER).exists():
+                output_dir.parent.mkdir(parents=True, exist_ok=True)
+                staging = tempfile.mkdtemp(prefix=f"{output_dir.name}.", suffix=STAGING_SUFFIX, dir=output_dir.parent)
+                # Earlier files are published by _setup_finished before javac runs for the next one
+                classpath = os.pathsep.join([*map(str, output_dirs), self._compile_classpath()])
+                commands.append(["javac", "-proc:none", "-d", staging, "-cp", classpath, str(java_file)])
+            output_dirs.append(output_dir)
+        return commands
+
+    def _setup_finished(self, command: list[str], result: CommandResult) -> None:
+        """Move a successful javac's staging folder into the compile cache, or discard it."""
+        if "-d" not in command:
+            return
+        staging = Path(command[command.index("-d") + 1])
+        if result.exit_code != 0:
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+
+        output_dir = staging.with_name(staging.name.split(".")[0])
+        (staging / COMPLETE_MARKER).touch()
+        try:
+            os.replace(staging, output_dir)
+        except OSError:
+            if not (output_dir / COMPLETE_MARKER).exists():
+                # Left over from an interrupted or older compile: replace it
+                shutil.rmtree(output_dir, ignore_errors=True)
+                try:
+                    os.replace(staging, output_dir)
+                    return
+                except OSError:
+                    pass
+            # Another run published the same classes first
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _build_command(self, test_file: Path, report_dir: Path, selectors: Optional[list[str]] = None) -> list[str]:
+        """Build the console launcher command, writing XML reports to report_dir."""
+        class_name = self._class_name(test_file)
+        if selectors:
+            selection = [arg for method in selectors for arg in ("--select-method", f"{class_name}#{method}")]
+        else:
+            selection = ["--select-class", class_name]
+
+        command = [
+            "java",
+            "-jar",
+            self._find_launcher(),
+            "--class-path",
+            self._full_classpath(test_file),
+            *selection,
+            "--disable-banner",
+            "--disable-ansi-colors",
+            "--details=tree",
+            "--reports-dir",
+            str(report_dir),
+        ]
+        if self.seed is not None:
+            command += [f"--config={name}={value}" for name, value in junit_random_order(self.seed).items()]
+        return command
+
+    def _parse_result(
+        self, test_file: Path, exit_code: int, output: str, report_dir: Path, progress: Optional[RunProgress]
+    ) -> TestResult:
+        """Parse JUnit results from the launcher's XML reports, or its summary as a fallback."""
+        cases = []
+        for report in report_dir.glob("TEST-*.xml"):
+            try:
+                cases.extend(parse_junit_xml(report))
+            except ET.ParseError:
+                continue
+
+        if cases:
+            return TestResult.from_cases(exit_code == 0, output, cases)
+        if progress and progress.cases:
+            # Stopped early, before the launcher wrote its report
+            return progress.result(exit_code, output)
+
+        # Parse the launcher summary, e.g. "[         4 tests successful      ]"
+        counts = dict.fromkeys(("successful", "failed", "aborted"), 0)
+        for match in re.finditer(r"\[\s*(\d+) tests (successful|failed|aborted)", output):
+            counts[match.group(2)] = int(match.group(1))
+
+        return TestResult(
+            success=exit_code == 0,
+            output=output,
+            passed=counts["successful"],
+            failed=counts["failed"],
+            errors=counts["aborted"],
+        )
+
+    def _check_syntax(self, files: list[Path]) -> Optional[str]:
+        return check_java_syntax(self, files)
+
+    def _missing_import(self, test_file: Path, source_file: Path) -> Optional[str]:
+        return missing_java_class(test_file, source_file, self.working_dir)
+
+    def _test_selectors(self, test_file: Path, cases: list[TestCaseResult]) -> Optional[list[str]]:
+        return java_method_names(cases)
+
+    def cache_settings(self) -> dict[str, Any]:
+        return {**super().cache_settings(), "launcher_jar": self.launcher_jar}
+
+    def parse_progress(self, line: str) -> Optional[TestCaseResult]:
+        """Parse a tree line like "│  ├─ addsNumbers() ✔"."""
+        match = PROGRESS_LINE.search(line)
+        if not match:
+            return None
+        return TestCaseResult(name=match.group(1), outcome=PROGRESS_OUTCOMES[match.group(2)])
+
+    def _full_classpath(self, test_file: Path) -> str:
+        """Classpath for running: the compiled source and test, then the project's test classpath."""
+        output_dirs = [str(output_dir) for _, output_dir in self._compile_outputs(test_file)]
+        return os.pathsep.join(filter(None, [*output_dirs, self._resolve_classpath()]))
+
+    def _compile_classpath(self) -> str:
+        """Classpath for javac: the project's test classpath and the launcher.
+
+        The standalone launcher bundles the JUnit Jupiter API, so projects
+        without a pom.xml can still compile their tests against it.
+        """
+        return os.pathsep.join(filter(None, [self._resolve_classpath(), self._find_launcher()]))
+
+    def _compile_outputs(self, test_file: Path) -> list[tuple[Path, Path]]:
+        """Pair the source file and the test with their folders in the compile cache.
+
+        Each folder is keyed by the file's name and contents and by the
+        compile classpath. The test's key also covers the source's
+        declarations and constants, but not its method bodies, so a test is
+        reused while only the implementation changes and recompiled when a
+        signature or an inlined constant does.
+        """
+        java_files = [test_file]
+        source_file = self._find_source_file(test_file)
+        if source_file is not None:
+            java_files.insert(0, source_file)
+
+        # Classes from a newer javac don't load on an older java, so the runtime is part of the key
+        classpath_hash = hashlib.sha256(f"{self._compile_classpath()}\0{self.runtime}".encode()).hexdigest()
+        outputs = []
+        for java_file in java_files:
+            digest = hashlib.sha256(f"{classpath_hash}\0{java_file.name}\0".encode())
+            try:
+                digest.update(java_file.read_bytes())
+            except OSError:
+                pass  # Let javac report the missing file
+            if java_file == test_file and source_file is not None:
+                try:
+                    digest.update(java_interface(source_file.read_text(errors="replace")).encode())
+                except OSError:
+                    pass
+            outputs.append((java_file, self.compile_cache / digest.hexdigest()[:16]))
+        return outputs
+
+    def _resolve_classpath(self) -> str:
+        """Resolve the project's test classpath through Maven, once per pom.xml.
+
+        Raises:
+            RunnerSetupError: If Maven cannot resolve the classpath
+        """
+        if self._classpath is not None:
+            return self._classpath
+
+        pom = self.working_dir / "pom.xml"
+        if not pom.exists():
+            # Plain source tree without Maven dependencies
+            self._classpath = ""
+            return self._classpath
+
+        cache_dir = Path.home() / ".proven" / "cache" / "classpath"
+        cache_file = cache_dir / f"{hashlib.sha256(pom.read_bytes()).hexdigest()[:16]}.txt"
+        if not cache_file.exists():
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            result = self._run_command(
+                [
+                    "mvn",
+                    "-q",
+                    "dependency:build-classpath",
+                    "-Dmdep.includeScope=test",
+                    f"-Dmdep.outputFile={cache_file}",
+                ]
+            )
+            if result.exit_code != 0 or not cache_file.exists():
+                raise RunnerSetupError(f"Could not resolve the Maven test classpath:\n{result.output}")
+
+        entries = [cache_file.read_text().strip()]
+        for build_dir in ("target/classes", "target/test-classes"):
+            # Build output stays in the project, also when running from a workspace
+            if (self.project_dir / build_dir).is_dir():
+                entries.append(str(self.project_dir / build_dir))
+
+        self._classpath = os.pathsep.join(filter(None, entries))
+        return self._classpath
+
+    def _find_launcher(self) -> str:
+        """Locate the JUnit console launcher jar, preferring the configured path.
+
+        Raises:
+            RunnerSetupError: If no launcher jar can be found
+        """
+        if self.launcher_jar:
+            return self.launcher_jar
+
+        repository = Path.home() / ".m2" / "repository" / LAUNCHER_ARTIFACT
+        jars = sorted(
+            repository.glob("*/junit-platform-console-standalone-*.jar"),
+            key=lambda jar: [int(part) if part.isdigit() else 0 for part in jar.parent.name.split(".")],
+        )
+        if not jars:
+            raise RunnerSetupError(
+                "JUnit console launcher not found. Set junit.launcher_jar in your config, or run:\n"
+                "mvn dependency:get -Dartifact=org.junit.platform:junit-platform-console-standalone:1.10.2"
+            )
+        self.launcher_jar = str(jars[-1])
+        return self.launcher_jar
+
+    def _find_source_file(self, test_file: Path) -> Optional[Path]:
+        """Find the class under test: FooTest.java -> Foo.java."""
+        source_name = f"{test_file.stem.removesuffix('Test')}.java"
+
+        sibling = test_file.parent / source_name
+        if sibling.exists():
+            return sibling
+
+        for candidate in self.working_dir.rglob(source_name):
+            if "target" not in candidate.parts and "node_modules" not in candidate.parts:
+                return candidate
+        return None
+
+    @staticmethod
+    def _class_name(test_file: Path) -> str:
+        """Get the fully qualified class name from the test file's package declaration."""
+        try:
+            match = re.search(r"^\s*package\s+([\w.]+)\s*;", test_file.read_text(), re.MULTILINE)
+        except OSError:
+            match = None
+        return f"{match.group(1)}.{test_file.stem}" if match else test_file.stem
@@ -0,0 +1,94 @@
+"""Resource limits and accounting for test subprocesses."""
+
+import os
+import signal
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+@dataclass
+class ResourceLimits:
+    """Per-process rlimits applied to every test command before it starts.
+
+    Limits are inherited by, and enforced separately for, each process the
+    command starts (pytest-xdist workers, Jest workers, forked JVMs).
+    """
+
+    cpu_seconds: Optional[int] = None  # RLIMIT_CPU
+    memory_mb: Optional[int] = None  # RLIMIT_DATA, heap and other private memory
+
+    def preexec(self) -> Optional[Callable[[], None]]:
+        """A preexec_fn that applies the limits in the child, or None if there are none."""
+        if resource is None or (self.cpu_seconds is None and self.memory_mb is None):
+            return None
+        return self.apply
+
+    def apply(self) -> None:
+        """Set the limits on the current process."""
+        if resource is None:
+            return
+        if self.cpu_seconds is not None:
+            # SIGXCPU at the soft limit, SIGKILL a little later if it is ignored
+            _lower_limit(resource.RLIMIT_CPU, self.cpu_seconds, self.cpu_seconds + 5)
+        if self.memory_mb is not None:
+            memory = self.memory_mb * 1024 * 1024
+            _lower_limit(resource.RLIMIT_DATA, memory, memory)
+
+
+def _lower_limit(kind: int, soft: int, hard: int) -> None:
+    """Set an rlimit without raising it past the current hard limit."""
+    _, current_hard = resource.getrlimit(kind)
+    if current_hard != resource.RLIM_INFINITY:
+        hard = min(hard, current_hard)
+        soft = min(soft, hard)
+    resource.setrlimit(kind, (soft, hard))
+
+
+def wait_with_usage(process: subprocess.Popen) -> tuple[int, float, int]:
+    """Wait for a process and collect what it used.
+
+    Returns:
+        The exit code, CPU seconds (user + system) and peak RSS in bytes. Both
+        include descendants the process waited for; they are 0 where the
+        platform can't report them.
+    """
+    if not hasattr(os, "wait4"):
+        return process.wait(), 0.0, 0
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return process.returncode, usage.ru_utime + usage.ru_stime, peak_rss_bytes(usage.ru_maxrss)
+
+
+def peak_rss_bytes(maxrss: int) -> int:
+    """Convert ru_maxrss to bytes; Linux reports kilobytes, macOS bytes."""
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def kill_tree(process: subprocess.Popen) -> None:
+    """Kill a process started with start_new_session, and everything in its group.
+
+    Also safe after the process has exited, to clean up descendants it left
+    behind. Never polls the process, so it can't race wait_with_usage().
+    """
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        elif process.returncode is None:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def describe_signal(exit_code: int, limits: ResourceLimits) -> Optional[str]:
+    """Explain an exit caused by hitting a resource limit."""
+    sigxcpu = getattr(signal, "SIGXCPU", None)
+    if limits.cpu_seconds is not None and sigxcpu is not None and exit_code in (-sigxcpu, 128 + sigxcpu):
+        return f"Test process exceeded the CPU time limit ({limits.cpu_seconds}s)"
+    return None
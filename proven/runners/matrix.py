@@ -0,0 +1,234 @@
+"""Run one runner's tests against several runtimes at once."""
+
+import asyncio
+import copy
+import shutil
+import threading
+from collections.abc import Awaitable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .base import ProgressCallback, RunProgress, TestCaseResult, TestResult, TestRunner
+
+
+def combine_results(results: dict[str, TestResult]) -> TestResult:
+    """Merge per-runtime results into one that is GREEN only if every runtime passed.
+
+    Cases and output are labelled with their runtime, and the per-runtime
+    results are kept in the combined result's runtimes map.
+    """
+    cases = [
+        replace(case, name=f"[{runtime}] {case.name}") for runtime, result in results.items() for case in result.cases
+    ]
+    output = "\n".join(f"=== {runtime} ===\n{result.output}" for runtime, result in results.items())
+    return TestResult(
+        success=all(result.success for result in results.values()),
+        output=output,
+        passed=sum(result.passed for result in results.values()),
+        failed=sum(result.failed for result in results.values()),
+        errors=sum(result.errors for result in results.values()),
+        cases=cases,
+        # The runtimes ran side by side
+        wall_time=max((result.wall_time for result in results.values()), default=0.0),
+        cpu_time=sum(result.cpu_time for result in results.values()),
+        peak_rss=max((result.peak_rss for result in results.values()), default=0),
+        runtimes=results,
+        complete=all(result.complete for result in results.values()),
+    )
+
+
+class MatrixRunner(TestRunner):
+    """Runs every test run against a list of runtimes concurrently, e.g. python3.9 to python3.13.
+
+    Each runtime gets a copy of the wrapped runner (see TestRunner.with_runtime)
+    with its own worker and cache entries. Results are combined with
+    combine_results(), so a run is only GREEN if it passed on every runtime.
+    Static checks (preflight, prove_red) don't depend on the runtime and run
+    once.
+    """
+
+    def __init__(self, runner: TestRunner, runtimes: list[str]):
+        self.runners = {runtime: runner.with_runtime(runtime) for runtime in runtimes}
+        super().__init__(runner.working_dir)
+        self.project_dir = runner.project_dir
+        self.timeout = runner.timeout
+        self.limits = runner.limits
+        self.cache = runner.cache
+        self._first = next(iter(self.runners.values()))
+        # Runners whose runs can't overlap take turns
+        self.concurrent_runs = runner.concurrent_runs
+        self._turn = None if runner.concurrent_runs else threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self._first.name
+
+    @property
+    def timeout(self) -> float:
+        return self._first.timeout if self.__dict__.get("runners") else TestRunner.timeout
+
+    @timeout.setter
+    def timeout(self, timeout: float) -> None:
+        for runner in self.__dict__.get("runners", {}).values():
+            runner.timeout = timeout
+
+    @property
+    def environment(self) -> Any:
+        return self._first.environment if self.__dict__.get("runners") else None
+
+    @environment.setter
+    def environment(self, environment: Any) -> None:
+        for runner in self.__dict__.get("runners", {}).values():
+            runner.environment = environment
+
+    def get_test_file_pattern(self) -> str:
+        return self._first.get_test_file_pattern()
+
+    def get_test_file_name(self, source_name: str) -> str:
+        return self._first.get_test_file_name(source_name)
+
+    def _build_command(self, test_file: Path, report_dir: Path, selectors: Optional[list[str]] = None) -> list[str]:
+        return self._first._build_command(test_file, report_dir, selectors)
+
+    def _parse_result(
+        self, test_file: Path, exit_code: int, output: str, report_dir: Path, progress: Optional[RunProgress]
+    ) -> TestResult:
+        return self._first._parse_result(test_file, exit_code, output, report_dir, progress)
+
+    def run(
+        self,
+        test_file: Path,
+        on_event: Optional[ProgressCallback] = None,
+        source_file: Optional[Path] = None,
+        only: Optional[list[TestCaseResult]] = None,
+    ) -> TestResult:
+        """Run the tests on every runtime in threads, see TestRunner.run()."""
+
+        def run_one(runtime: str, runner: TestRunner) -> TestResult:
+            missing = self._missing_runtime(runtime)
+            if missing is not None:
+                return missing
+            only_here = self._cases_for(runtime, only)
+            if self._turn is None:
+                return runner.run(test_file, self._labelled(runtime, on_event), source_file, only_here)
+            with self._turn:
+                return runner.run(test_file, self._labelled(runtime, on_event), source_file, only_here)
+
+        with ThreadPoolExecutor(max_workers=len(self.runners)) as pool:
+            futures = {runtime: pool.submit(run_one, runtime, runner) for runtime, runner in self.runners.items()}
+            return combine_results({runtime: future.result() for runtime, future in futures.items()})
+
+    async def run_async(
+        self,
+        test_file: Path,
+        on_event: Optional[ProgressCallback] = None,
+        source_file: Optional[Path] = None,
+        only: Optional[list[TestCaseResult]] = None,
+    ) -> TestResult:
+        """Run the tests on every runtime concurrently, see TestRunner.run_async()."""
+        return await self._gather(
+            lambda runtime, runner: runner.run_async(
+                test_file, self._labelled(runtime, on_event), source_file, self._cases_for(runtime, only)
+            )
+        )
+
+    def rerun(
+        self,
+        test_file: Path,
+        previous: TestResult,
+        on_event: Optional[ProgressCallback] = None,
+        source_file: Optional[Path] = None,
+    ) -> TestResult:
+        """Run each runtime's last failures first; GREEN still needs a full run on every runtime."""
+        if previous.failures:
+            result = self.run(test_file, on_event, source_file, only=previous.failures)
+            if result.is_red:
+                return result
+            result.discard_log()
+        return self.run(test_file, on_event, source_file)
+
+    async def rerun_async(
+        self,
+        test_file: Path,
+        previous: TestResult,
+        on_event: Optional[ProgressCallback] = None,
+        source_file: Optional[Path] = None,
+    ) -> TestResult:
+        """Same as rerun(), using run_async()."""
+        if previous.failures:
+            result = await self.run_async(test_file, on_event, source_file, only=previous.failures)
+            if result.is_red:
+                return result
+            result.discard_log()
+        return await self.run_async(test_file, on_event, source_file)
+
+    def preflight(self, files: list[Path]) -> Optional[TestResult]:
+        return self._first.preflight(files)
+
+    def prove_red(self, test_file: Path, source_file: Path) -> Optional[TestResult]:
+        return self._first.prove_red(test_file, source_file)
+
+    def cache_settings(self) -> dict[str, Any]:
+        return {**self._first.cache_settings(), "runtime": list(self.runners)}
+
+    def in_directory(self, working_dir: Path) -> "MatrixRunner":
+        """A copy of the matrix whose runners all run from working_dir."""
+        matrix = copy.copy(self)
+        matrix.working_dir = working_dir
+        matrix.runners = {runtime: runner.in_directory(working_dir) for runtime, runner in self.runners.items()}
+        matrix._first = next(iter(matrix.runners.values()))
+        matrix._turn = None if self._turn is None else threading.Lock()
+        return matrix
+
+    def with_seed(self, seed: int) -> "MatrixRunner":
+        """A copy of the matrix whose runners all shuffle with seed."""
+        matrix = copy.copy(self)
+        matrix.cache = None
+        matrix.runners = {runtime: runner.with_seed(seed) for runtime, runner in self.runners.items()}
+        matrix._first = next(iter(matrix.runners.values()))
+        matrix._turn = None if self._turn is None else threading.Lock()
+        return matrix
+
+    def close(self) -> None:
+        for runner in self.runners.values():
+            runner.close()
+
+    async def _gather(self, run: Callable[[str, TestRunner], Awaitable[TestResult]]) -> TestResult:
+        """Run a coroutine per runtime concurrently (or in turn) and combine the results."""
+        turn = asyncio.Lock() if self._turn is not None else None
+
+        async def run_one(runtime: str, runner: TestRunner) -> TestResult:
+            missing = self._missing_runtime(runtime)
+            if missing is not None:
+                return missing
+            if turn is None:
+                return await run(runtime, runner)
+            async with turn:
+                return await run(runtime, runner)
+
+        results = await asyncio.gather(*(run_one(runtime, runner) for runtime, runner in self.runners.items()))
+        return combine_results(dict(zip(self.runners, results)))
+
+    @staticmethod
+    def _missing_runtime(runtime: str) -> Optional[TestResult]:
+        """An error result if the runtime can't be found, so it isn't silently replaced by the default."""
+        if shutil.which(runtime) is not None:
+            return None
+        return TestResult(success=False, output=f"Runtime not found: {runtime}", errors=1)
+
+    @staticmethod
+    def _cases_for(runtime: str, cases: Optional[list[TestCaseResult]]) -> Optional[list[TestCaseResult]]:
+        """The given combined cases that belong to one runtime, with their labels removed."""
+        if cases is None:
+            return None
+        prefix = f"[{runtime}] "
+        return [replace(case, name=case.name[len(prefix) :]) for case in cases if case.name.startswith(prefix)]
+
+    @staticmethod
+    def _labelled(runtime: str, on_event: Optional[ProgressCallback]) -> Optional[ProgressCallback]:
+        """Pass streamed cases on with their runtime in the name."""
+        if on_event is None:
+            return None
+        return lambda case: on_event(replace(case, name=f"[{runtime}] {case.name}"))
@@ -1,18 +1,96 @@
 """Maven test runner implementation."""
 
 import re
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
 from pathlib import Path
+from typing import Any, Optional
 
-from .base import TestResult, TestRunner
+from .base import RunProgress, TestCaseResult, TestResult, TestRunner
+from .imports import missing_java_class
+from .reports import parse_junit_xml
+
+
+def java_method_names(cases: list[TestCaseResult]) -> Optional[list[str]]:
+    """Java method names for test cases, dropping JUnit 5 parameters like "adds(int)[1]".
+
+    Returns None if a case isn't a plain method (e.g. a class-level error).
+    """
+    methods = {re.split(r"[(\[]", case.name, maxsplit=1)[0] for case in cases}
+    if not methods or not all(method.isidentifier() for method in methods):
+        return None
+    return sorted(methods)
+
+
+def junit_random_order(seed: int) -> dict[str, str]:
+    """JUnit Jupiter configuration parameters that run test methods in an order shuffled by seed."""
+    return {
+        "junit.jupiter.testmethod.order.default": "org.junit.jupiter.api.MethodOrderer$Random",
+        "junit.jupiter.execution.order.random.seed": str(seed),
+    }
+
+
+# javac errors that mean the file doesn't parse, as opposed to missing symbols
+# or types that need the project's full classpath to resolve
+JAVAC_SYNTAX_ERROR = re.compile(
+    r": error: (?:'.+' expected|class, interface, enum,? or record expected|illegal start of"
+    r"|reached end of file while parsing|not a statement|unclosed |<identifier> expected|orphaned )"
+)
+
+
+def check_java_syntax(runner: TestRunner, files: list[Path]) -> Optional[str]:
+    """Compile Java files with javac and report syntax errors only.
+
+    Without the project's classpath javac also reports unresolved symbols,
+    which are ignored here; the real build reports those.
+    """
+    java_files = [str(path) for path in files if path.suffix == ".java"]
+    if not java_files or shutil.which("javac") is None:
+        return None
+    with tempfile.TemporaryDirectory(prefix="proven-javac-") as classes_dir:
+        result = runner._run_command(["javac", "-proc:none", "-implicit:none", "-d", classes_dir, *java_files])
+    if result.exit_code != 0 and JAVAC_SYNTAX_ERROR.search(result.output):
+        return result.output
+    return None
 
 
 class MavenRunner(TestRunner):
-    """Test runner for Maven (Java/JUnit)."""
+    """Test runner for Maven (Java/JUnit).
+
+    The fast profile builds only the module that contains the test (and the
+    modules it depends on), offline and in parallel, with plugins that don't
+    affect test outcomes skipped through skip_properties (by default the
+    ones in maven.skip_properties of the config).
+    """
+
+    runtime_commands = ("java", "javac")
+    # Every build writes to the module's target folder
+    concurrent_runs = False
+
+    def __init__(
+        self,
+        working_dir: Optional[Path] = None,
+        fast: bool = False,
+        threads: str = "1C",
+        skip_properties: Optional[list[str]] = None,
+    ):
+        super().__init__(working_dir)
+        self.fast = fast
+        self.threads = threads
+        self.skip_properties = skip_properties or []
 
     @property
     def name(self) -> str:
         return "maven"
 
+    def _command_env(self) -> dict[str, str]:
+        """Maven finds Java through JAVA_HOME, so point it at the runtime's JDK."""
+        if self.runtime is None:
+            return {}
+        java = Path(shutil.which(self.runtime) or self.runtime).resolve()
+        return {"JAVA_HOME": str(java.parent.parent)}
+
     def get_test_file_pattern(self) -> str:
         return "*Test.java"
 
@@ -21,10 +99,18 @@ class MavenRunner(TestRunner):
         path = Path(source_name)
         return f"{path.stem}Test{path.suffix}"
 
-    def run(self, test_file: Path) -> TestResult:
-        """Run Maven tests."""
+    def _prepare(self, test_file: Path) -> list[list[str]]:
+        """Remove stale surefire reports so they are not mistaken for this run's."""
+        for report in self._report_files(test_file):
+            report.unlink(missing_ok=True)
+        return []
+
+    def _build_command(self, test_file: Path, report_dir: Path, selectors: Optional[list[str]] = None) -> list[str]:
+        """Build the Maven command; surefire writes its own reports under target/."""
         # Maven runs all tests in the project, but we can specify a test class
         test_class = test_file.stem  # e.g., "CalculatorTest"
+        if selectors:
+            test_class += "#" + "+".join(selectors)  # e.g., "CalculatorTest#adds+divides"
 
         command = [
             "mvn",
@@ -32,8 +118,51 @@ class MavenRunner(TestRunner):
             f"-Dtest={test_class}",
             "-q",  # Quiet mode for cleaner output
         ]
+        if self.fast:
+            module = self._module_dir(test_file)
+            if module != self.working_dir.resolve():
+                # Build the test's module and what it depends on, not the whole reactor
+                command += ["-pl", module.relative_to(self.working_dir.resolve()).as_posix(), "-am"]
+            command += ["-o", "-T", self.threads]
+            # Upstream modules built by -am have no tests matching -Dtest
+            command += ["-DfailIfNoTests=false", "-Dsurefire.failIfNoSpecifiedTests=false"]
+            command += [f"-D{prop}=true" for prop in self.skip_properties]
+        if self.seed is not None:
+            # Surefire shuffles test classes; JUnit reads its parameters from the properties it passes on
+            command += ["-Dsurefire.runOrder=random", f"-Dsurefire.runOrder.random.seed={self.seed}"]
+            command += [f"-D{name}={value}" for name, value in junit_random_order(self.seed).items()]
+        return command
+
+    def cache_settings(self) -> dict[str, Any]:
+        """Skipped plugins (e.g. enforcer) can change whether the build passes."""
+        settings = super().cache_settings()
+        if self.fast:
+            settings["skip_properties"] = self.skip_properties
+        return settings
+
+    def _parse_result(
+        self, test_file: Path, exit_code: int, output: str, report_dir: Path, progress: Optional[RunProgress]
+    ) -> TestResult:
+        """Parse surefire results from its XML reports, or the output as a fallback.
+
+        Quiet surefire output has no per-test lines, so progress callbacks only
+        see results once the run has finished.
+        """
+        # Maven reports "BUILD SUCCESS" or "BUILD FAILURE"
+        success = "BUILD SUCCESS" in output and exit_code == 0
+
+        cases = []
+        for report in self._report_files(test_file):
+            try:
+                cases.extend(parse_junit_xml(report))
+            except ET.ParseError:
+                continue
 
-        exit_code, output = self._run_command(command)
+        if cases:
+            if progress:
+                for case in cases:
+                    progress.on_event(case)
+            return TestResult.from_cases(success, output, cases)
 
         # Parse Maven/Surefire output for stats
         passed = 0
@@ -52,12 +181,6 @@ class MavenRunner(TestRunner):
             errors = int(summary_match.group(3))
             passed = total - failed - errors
 
-        # Also check for "BUILD SUCCESS" or "BUILD FAILURE"
-        if "BUILD SUCCESS" in output and exit_code == 0:
-            success = True
-        else:
-            success = False
-
         return TestResult(
             success=success,
             output=output,
@@ -65,3 +188,29 @@ class MavenRunner(TestRunner):
             failed=failed,
             errors=errors,
         )
+
+    def _check_syntax(self, files: list[Path]) -> Optional[str]:
+        return check_java_syntax(self, files)
+
+    def _missing_import(self, test_file: Path, source_file: Path) -> Optional[str]:
+        return missing_java_class(test_file, source_file, self.working_dir)
+
+    def _test_selectors(self, test_file: Path, cases: list[TestCaseResult]) -> Optional[list[str]]:
+        return java_method_names(cases)
+
+    def _module_dir(self, test_file: Path) -> Path:
+        """The directory of the Maven module containing test_file: its nearest pom.xml."""
+        root = self.working_dir.resolve()
+        path = (self.working_dir / test_file).resolve()
+        for directory in path.parents:
+            if directory == root or root not in directory.parents:
+                break
+            if (directory / "pom.xml").exists():
+                return directory
+        return root
+
+    def _report_files(self, test_file: Path) -> list[Path]:
+        """Surefire XML reports for a test class, in its module's target directory."""
+        reports_dir = self._module_dir(test_file) / "target" / "surefire-reports"
+        test_class = test_file.stem
+        return [*reports_dir.glob(f"TEST-{test_class}.xml"), *reports_dir.glob(f"TEST-*.{test_class}.xml")]
@@ -0,0 +1,130 @@
+"""Bounded-memory capture of test command output."""
+
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import IO, Optional
+
+HEAD_SIZE = 32 * 1024  # characters kept from the start of the output
+TAIL_SIZE = 32 * 1024  # characters kept from the end of the output
+LOG_LIMIT = 64 * 1024 * 1024  # characters written to a log file at most
+
+# Log files spooled inside the current collect_logs() block
+_collected_logs: ContextVar[Optional[list[str]]] = ContextVar("proven_collected_logs", default=None)
+
+
+def elide(text: str, head: int, tail: int) -> str:
+    """Keep the first head and last tail characters of text, marking the gap."""
+    if len(text) <= head + tail:
+        return text
+    omitted = len(text) - head - tail
+    return f"{text[:head]}\n... [{omitted} characters omitted] ...\n{text[len(text) - tail :]}"
+
+
+def discard_log(path: Optional[str]) -> None:
+    """Delete a log file that nothing will read again."""
+    if path:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+@contextmanager
+def collect_logs() -> Iterator[None]:
+    """Delete every log file spooled inside the block when it ends.
+
+    Tasks and threads started in the block (asyncio.gather, to_thread)
+    inherit it, so concurrent blocks only delete their own logs.
+    """
+    logs: list[str] = []
+    token = _collected_logs.set(logs)
+    try:
+        yield
+    finally:
+        _collected_logs.reset(token)
+        for path in logs:
+            discard_log(path)
+
+
+class OutputSpool:
+    """Captures output while holding at most head_size + tail_size characters.
+
+    The first head_size characters and a ring of the last tail_size are kept
+    in memory. Once output outgrows them, it is also written to a temporary
+    log file, up to log_limit characters, so the full output of all but
+    runaway commands stays available. The file is deleted by discard_log(),
+    or at the end of the collect_logs() block it was created in.
+    """
+
+    def __init__(self, head_size: int = HEAD_SIZE, tail_size: int = TAIL_SIZE, log_limit: int = LOG_LIMIT):
+        self.head_size = head_size
+        self.tail_size = tail_size
+        self.log_limit = log_limit
+        self.total = 0
+        self._logged = 0
+        self._head: list[str] = []
+        self._head_len = 0
+        self._tail: list[str] = []
+        self._tail_len = 0
+        self._log: Optional[IO[str]] = None
+
+    @property
+    def log_path(self) -> Optional[str]:
+        """Path of the full log file, if output was large enough to need one."""
+        return self._log.name if self._log is not None else None
+
+    def write(self, text: str) -> None:
+        """Append a chunk of output."""
+        if not text:
+            return
+        self.total += len(text)
+
+        if self._head_len < self.head_size:
+            room = self.head_size - self._head_len
+            self._head.append(text[:room])
+            self._head_len += min(room, len(text))
+            text = text[room:]
+            if not text:
+                return
+
+        if self._log is None:
+            self._log = tempfile.NamedTemporaryFile(
+                "w", prefix="proven-log-", suffix=".txt", encoding="utf-8", errors="replace", delete=False
+            )
+            logs = _collected_logs.get()
+            if logs is not None:
+                logs.append(self._log.name)
+            self._log.writelines(self._head)
+            self._logged = self._head_len
+        if self._logged < self.log_limit:
+            chunk = text[: self.log_limit - self._logged]
+            self._log.write(chunk)
+            self._logged += len(chunk)
+            if self._logged >= self.log_limit:
+                self._log.write(f"\n... [log truncated at {self.log_limit} characters] ...\n")
+
+        self._tail.append(text)
+        self._tail_len += len(text)
+        if self._tail_len > 2 * self.tail_size:
+            kept = "".join(self._tail)[-self.tail_size :]
+            self._tail = [kept]
+            self._tail_len = len(kept)
+
+    def getvalue(self) -> str:
+        """The captured output, with the middle elided if it didn't fit in memory."""
+        head = "".join(self._head)
+        tail = "".join(self._tail)
+        if self._head_len + self._tail_len == self.total:
+            return head + tail
+        tail = tail[-self.tail_size :]
+        omitted = self.total - len(head) - len(tail)
+        log = "full log" if self.total <= self.log_limit else f"first {self.log_limit} characters"
+        return f"{head}\n... [{omitted} characters omitted, {log}: {self.log_path}] ...\n{tail}"
+
+    def close(self) -> None:
+        """Flush and close the log file; it is kept on disk until discarded."""
+        if self._log is not None and not self._log.closed:
+            self._log.close()
@@ -1,14 +1,115 @@
 """Pytest test runner implementation."""
 
+import ast
+import os
 import re
+import subprocess
+import traceback
+import xml.etree.ElementTree as ET
 from pathlib import Path
+from typing import Any, Optional
 
-from .base import TestResult, TestRunner
+from .base import RunProgress, TestCaseResult, TestResult, TestRunner
+from .imports import missing_python_import
+from .reports import parse_junit_xml
+
+WORKER_SERVER = Path(__file__).parent / "pytest_worker_server.py"
+XDIST_PLUGIN = "xdist.plugin"
+
+PROGRESS_LINE = re.compile(r"^(\S+::.+?) (PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS)\b")
+# pytest-xdist reports "[gw0] [ 50%] PASSED tests/test_foo.py::test_bar" instead
+XDIST_PROGRESS_LINE = re.compile(r"^\[gw\d+\] \[\s*\d+%\] (PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS) (\S+::.+?)\s*$")
+PROGRESS_OUTCOMES = {
+    "PASSED": "passed",
+    "XPASS": "passed",
+    "FAILED": "failed",
+    "ERROR": "error",
+    "SKIPPED": "skipped",
+    "XFAIL": "skipped",
+}
+
+
+def check_python_syntax(files: list[Path]) -> Optional[str]:
+    """Compile Python files in-process; no interpreter or test framework startup needed."""
+    for path in files:
+        if path.suffix != ".py":
+            continue
+        try:
+            compile(path.read_bytes(), str(path), "exec", dont_inherit=True)
+        except (SyntaxError, ValueError) as e:
+            return "".join(traceback.format_exception_only(type(e), e))
+    return None
+
+
+def available_cores() -> int:
+    """CPU cores this process may run on, respecting affinity masks where supported."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def count_tests(test_file: Path) -> int:
+    """Estimate the number of tests in a file without importing it.
+
+    Counts test functions and methods, multiplied out by parametrize
+    decorators whose argument values are literal lists or tuples. Returns 0
+    if the file can't be parsed.
+    """
+    try:
+        tree = ast.parse(test_file.read_bytes())
+    except (OSError, SyntaxError, ValueError):
+        return 0
+
+    total = 0
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
+            total += sum(_parametrized_count(item) for item in node.body if _is_test_function(item))
+        elif _is_test_function(node):
+            total += _parametrized_count(node)
+    return total
+
+
+def _is_test_function(node: ast.stmt) -> bool:
+    return isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test")
+
+
+def _parametrized_count(node: ast.stmt) -> int:
+    """Number of test cases a function expands to, counting literal parametrize values."""
+    count = 1
+    for decorator in getattr(node, "decorator_list", []):
+        if (
+            isinstance(decorator, ast.Call)
+            and isinstance(decorator.func, ast.Attribute)
+            and decorator.func.attr == "parametrize"
+            and len(decorator.args) >= 2
+            and isinstance(decorator.args[1], (ast.List, ast.Tuple))
+        ):
+            count *= max(len(decorator.args[1].elts), 1)
+    return count
 
 
 class PytestRunner(TestRunner):
     """Test runner for pytest."""
 
+    runtime_commands = ("python",)
+
+    def __init__(
+        self,
+        working_dir: Optional[Path] = None,
+        use_worker: bool = False,
+        parallel: bool = False,
+        tests_per_worker: int = 8,
+        lean: bool = False,
+        plugins: Optional[list[str]] = None,
+    ):
+        super().__init__(working_dir, use_worker)
+        self.parallel = parallel
+        self.tests_per_worker = tests_per_worker
+        self.lean = lean
+        self.plugins = plugins or []
+        # (runtime, module) -> whether the interpreter can import it
+        self._importable: dict[tuple[Optional[str], str], bool] = {}
+
     @property
     def name(self) -> str:
         return "pytest"
@@ -21,46 +122,160 @@ class PytestRunner(TestRunner):
         stem = Path(source_name).stem
         return f"test_{stem}.py"
 
-    def run(self, test_file: Path) -> TestResult:
-        """Run pytest on the specified file."""
+    def _build_command(self, test_file: Path, report_dir: Path, selectors: Optional[list[str]] = None) -> list[str]:
+        """Build the pytest command, writing a JUnit XML report to report_dir."""
         command = [
             "python",
             "-m",
             "pytest",
-            str(test_file),
+            *(selectors or [str(test_file)]),
             "-v",
             "--tb=short",
+            f"--junitxml={report_dir / 'junit.xml'}",
+            "-o",
+            "junit_family=xunit1",  # Adds file/line attributes for node IDs
         ]
+        workers = self._xdist_workers(test_file, selectors)
+        if self.lean:
+            plugins = self.plugins
+            if workers > 1 and XDIST_PLUGIN not in plugins:
+                plugins = [*plugins, XDIST_PLUGIN]
+            command += [arg for plugin in plugins for arg in ("-p", plugin)]
+            # A cache dir per run, so concurrent runs never share .pytest_cache
+            command += ["--import-mode=importlib", "-o", f"cache_dir={report_dir / 'pytest_cache'}"]
+        if workers > 1:
+            command += ["-n", str(workers)]
+        if self.seed is not None and self._can_import("pytest_randomly"):
+            # Shuffles the order and reseeds random, Faker and NumPy before each test
+            command += ["-p", "randomly", f"--randomly-seed={self.seed}"]
+        return command
 
-        exit_code, output = self._run_command(command)
+    def _command_env(self) -> dict[str, str]:
+        """The lean profile skips scanning entry points for installed plugins."""
+        env = {"PYTEST_DISABLE_PLUGIN_AUTOLOAD": "1"} if self.lean else {}
+        if self.seed is not None:
+            env["PYTHONHASHSEED"] = str(self.seed % 2**32)
+        return env
 
-        # Parse pytest output for stats
-        passed = 0
-        failed = 0
-        errors = 0
+    def cache_settings(self) -> dict[str, Any]:
+        """Import mode and plugins can change outcomes, so the lean profile is part of the key."""
+        settings = super().cache_settings()
+        if self.lean:
+            settings["lean_plugins"] = self.plugins
+        return settings
 
-        # Look for summary line like "1 passed, 2 failed, 1 error"
-        summary_match = re.search(
-            r"(\d+) passed|(\d+) failed|(\d+) error",
-            output,
-        )
+    def _xdist_workers(self, test_file: Path, selectors: Optional[list[str]]) -> int:
+        """Pick a pytest-xdist worker count from the cores and the number of tests.
+
+        Each worker gets at least tests_per_worker tests, so small suites stay
+        serial instead of paying for worker startup. Returns 1 (serial) when
+        parallel runs are off or pytest-xdist isn't installed.
+        """
+        if not self.parallel:
+            return 1
+        tests = len(selectors) if selectors else count_tests(test_file)
+        workers = min(available_cores(), tests // max(self.tests_per_worker, 1))
+        if workers < 2 or not self._xdist_installed():
+            return 1
+        return workers
+
+    def _xdist_installed(self) -> bool:
+        return self._can_import("xdist")
 
-        if summary_match:
-            passed_match = re.search(r"(\d+) passed", output)
-            failed_match = re.search(r"(\d+) failed", output)
-            error_match = re.search(r"(\d+) error", output)
+    def _can_import(self, module: str) -> bool:
+        """Check once whether the project's interpreter can import a module, e.g. a plugin."""
+        key = (self.runtime, module)
+        if key not in self._importable:
+            try:
+                check = subprocess.run(
+                    ["python", "-c", f"import {module}"], cwd=self.working_dir, capture_output=True, env=self._environ()
+                )
+                self._importable[key] = check.returncode == 0
+            except OSError:
+                self._importable[key] = False
+        return self._importable[key]
 
-            if passed_match:
-                passed = int(passed_match.group(1))
-            if failed_match:
-                failed = int(failed_match.group(1))
-            if error_match:
-                errors = int(error_match.group(1))
+    def _parse_result(
+        self, test_file: Path, exit_code: int, output: str, report_dir: Path, progress: Optional[RunProgress]
+    ) -> TestResult:
+        """Parse pytest results from the JUnit XML report, or the output as a fallback."""
+        cases = self._read_report(report_dir / "junit.xml")
+        if cases:
+            return TestResult.from_cases(exit_code == 0, output, cases)
+        if progress and progress.cases:
+            # Stopped early, before pytest wrote its report
+            return progress.result(exit_code, output)
+
+        # No report (e.g. pytest crashed before writing it): fall back to the
+        # summary line like "2 failed, 1 passed, 1 error in 0.1s"
+        counts = {"passed": 0, "failed": 0, "error": 0}
+        for match in re.finditer(r"(\d+) (passed|failed|error)", output):
+            counts[match.group(2)] = int(match.group(1))
 
         return TestResult(
             success=exit_code == 0,
             output=output,
-            passed=passed,
-            failed=failed,
-            errors=errors,
+            passed=counts["passed"],
+            failed=counts["failed"],
+            errors=counts["error"],
         )
+
+    def parse_progress(self, line: str) -> Optional[TestCaseResult]:
+        """Parse a verbose result line like "tests/test_foo.py::test_bar PASSED [ 50%]"."""
+        match = PROGRESS_LINE.match(line)
+        if match:
+            return TestCaseResult(name=match.group(1), outcome=PROGRESS_OUTCOMES[match.group(2)])
+        match = XDIST_PROGRESS_LINE.match(line)
+        if match:
+            return TestCaseResult(name=match.group(2), outcome=PROGRESS_OUTCOMES[match.group(1)])
+        return None
+
+    def _check_syntax(self, files: list[Path]) -> Optional[str]:
+        return check_python_syntax(files)
+
+    def _missing_import(self, test_file: Path, source_file: Path) -> Optional[str]:
+        return missing_python_import(test_file, source_file, self.working_dir, self._environ())
+
+    def _test_selectors(self, test_file: Path, cases: list[TestCaseResult]) -> Optional[list[str]]:
+        """Select cases by node ID, anchored on test_file so the rootdir doesn't matter."""
+        node_ids = []
+        for case in cases:
+            if case.file:
+                node_id = self.node_id(case)
+            elif "::" in case.name:
+                node_id = case.name  # Already a node ID, from live output
+            else:
+                return None  # e.g. a collection error, which has no node ID
+            node_ids.append("::".join([str(test_file), node_id.split("::", 1)[1]]))
+        return node_ids or None
+
+    @staticmethod
+    def node_id(case: TestCaseResult) -> str:
+        """Build a pytest node ID from a JUnit XML test case.
+
+        tests/test_foo.py + tests.test_foo.TestBar + test_baz[1]
+        -> tests/test_foo.py::TestBar::test_baz[1]
+        """
+        module_parts = Path(case.file).with_suffix("").parts
+        class_parts = case.classname.split(".")[len(module_parts) :]
+        return "::".join([case.file, *class_parts, case.name])
+
+    @staticmethod
+    def _read_report(report: Path) -> list[TestCaseResult]:
+        """Read per-test results from the JUnit XML report, if pytest wrote one."""
+        if not report.exists():
+            return []
+        try:
+            return parse_junit_xml(report)
+        except ET.ParseError:
+            return []
+
+    def _worker_args(self, command: list[str]) -> list[str]:
+        """The worker already runs pytest, so drop "python -m pytest"."""
+        return command[3:]
+
+    def _worker_command(self) -> Optional[list[str]]:
+        """Start the fork-server in the project's interpreter (needs fork())."""
+        if not hasattr(os, "fork"):
+            return None
+        return ["python", str(WORKER_SERVER), str(self.working_dir)]
@@ -0,0 +1,211 @@
+"""Fork-server that keeps pytest warm between test runs.
+
+This script is launched with the project's own interpreter, so it must only
+depend on the standard library and pytest. It imports pytest, its plugins and
+the project's root conftest once, then forks a fresh child for every run so
+each run starts from the same clean, pre-imported state.
+
+Protocol (one JSON object per line):
+    -> {"args": ["tests/test_foo.py", "-v"], "timeout": 60, "cpu_seconds": null, "memory_mb": null}
+    <- {"pgid": 4321}
+    <- {"exit_code": 1, "output": "...", "cpu_time": 0.8, "peak_rss": 52428800, "complete": true}
+
+The "pgid" line names the process group the run's child leads, so the
+client can kill it if the server itself stops responding. "complete" is
+false when the run timed out or was killed by a signal.
+"""
+
+import json
+import os
+import resource
+import signal
+import sys
+import tempfile
+import time
+import traceback
+from importlib.metadata import entry_points
+from typing import IO, Callable, Optional
+
+# Bytes sent from the start and the end of a run's output, as Proven's OutputSpool keeps
+HEAD_SIZE = 32 * 1024
+TAIL_SIZE = 32 * 1024
+
+
+def warm_up(rootdir: str) -> None:
+    """Import pytest, its entry-point plugins (unless autoload is disabled) and the root conftest."""
+    if rootdir not in sys.path:
+        sys.path.insert(0, rootdir)
+
+    import pytest  # noqa: F401
+
+    if os.environ.get("PYTEST_DISABLE_PLUGIN_AUTOLOAD"):
+        # Lean profile: each run loads its allow-listed plugins with -p
+        plugins = []
+    else:
+        try:
+            plugins = entry_points(group="pytest11")
+        except TypeError:  # Python 3.9
+            plugins = entry_points().get("pytest11", [])
+
+    for plugin in plugins:
+        try:
+            plugin.load()
+        except Exception:
+            pass
+
+    if os.path.exists(os.path.join(rootdir, "conftest.py")):
+        try:
+            import conftest  # noqa: F401
+        except Exception:
+            # Let the real run report the conftest error
+            sys.modules.pop("conftest", None)
+
+
+def limit_resources(cpu_seconds: Optional[int], memory_mb: Optional[int]) -> None:
+    """Apply CPU-time and memory rlimits to the current process."""
+    limits = []
+    if cpu_seconds is not None:
+        limits.append((resource.RLIMIT_CPU, cpu_seconds, cpu_seconds + 5))
+    if memory_mb is not None:
+        limits.append((resource.RLIMIT_DATA, memory_mb * 1024 * 1024, memory_mb * 1024 * 1024))
+    for kind, soft, hard in limits:
+        _, current_hard = resource.getrlimit(kind)
+        if current_hard != resource.RLIM_INFINITY:
+            hard = min(hard, current_hard)
+            soft = min(soft, hard)
+        resource.setrlimit(kind, (soft, hard))
+
+
+def run_in_child(
+    args: list,
+    timeout: float,
+    cpu_seconds: Optional[int] = None,
+    memory_mb: Optional[int] = None,
+    started: Optional[Callable[[int], None]] = None,
+) -> dict:
+    """Fork a child that runs pytest with the given args and collect its output and usage.
+
+    started, if given, is called with the child's pid (also its process
+    group) as soon as it has been forked.
+    """
+    import pytest
+
+    with tempfile.TemporaryFile() as log:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+
+        if pid == 0:
+            # Child: own process group so a timeout can kill the whole tree
+            os.setpgid(0, 0)
+            devnull = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(devnull, 0)
+            os.dup2(log.fileno(), 1)
+            os.dup2(log.fileno(), 2)
+            code = 1
+            try:
+                limit_resources(cpu_seconds, memory_mb)
+                code = int(pytest.main(args))
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+
+        # Set on both sides of the fork, so the group exists before anyone signals it
+        try:
+            os.setpgid(pid, pid)
+        except OSError:
+            pass  # The child has already moved, or exited
+        if started is not None:
+            started(pid)
+
+        deadline = time.monotonic() + timeout
+        status = None
+        while status is None:
+            finished, raw_status, usage = os.wait4(pid, os.WNOHANG)
+            if finished:
+                status = raw_status
+            elif time.monotonic() > deadline:
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                os.waitpid(pid, 0)
+                return {"exit_code": 1, "output": "Test execution timed out", "complete": False}
+            else:
+                time.sleep(0.005)
+
+        # Clean up anything the run left behind in its process group
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        output = read_head_and_tail(log)
+
+    exit_code = os.waitstatus_to_exitcode(status)
+    complete = exit_code >= 0
+    if not complete:
+        output += f"\nTest process killed by signal {-exit_code}"
+        exit_code = 1
+    peak_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return {
+        "exit_code": exit_code,
+        "output": output,
+        "cpu_time": usage.ru_utime + usage.ru_stime,
+        "peak_rss": peak_rss,
+        "complete": complete,
+    }
+
+
+def read_head_and_tail(log: IO[bytes]) -> str:
+    """Read the start and end of a log, without loading the middle of a long one."""
+    size = log.seek(0, os.SEEK_END)
+    log.seek(0)
+    if size <= HEAD_SIZE + TAIL_SIZE:
+        return log.read().decode(errors="replace")
+    head = log.read(HEAD_SIZE).decode(errors="replace")
+    log.seek(size - TAIL_SIZE)
+    tail = log.read().decode(errors="replace")
+    return f"{head}\n... [{size - HEAD_SIZE - TAIL_SIZE} characters omitted] ...\n{tail}"
+
+
+def main() -> None:
+    """Warm up, then serve run requests until stdin closes."""
+    rootdir = sys.argv[1] if len(sys.argv) > 1 else os.getcwd()
+    # Run as a script, so its own folder is first on sys.path, where Proven's
+    # modules (output.py, cache.py, ...) would shadow the project's
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path[:] = [path for path in sys.path if os.path.abspath(path or os.curdir) != here]
+
+    # Keep the protocol channel private; anything printed during warm-up or
+    # by the server itself goes to stderr instead.
+    protocol = os.fdopen(os.dup(1), "w", buffering=1)
+    os.dup2(2, 1)
+
+    try:
+        warm_up(rootdir)
+    except Exception as e:
+        protocol.write(json.dumps({"ready": False, "error": f"{type(e).__name__}: {e}"}) + "\n")
+        return
+
+    protocol.write(json.dumps({"ready": True}) + "\n")
+
+    def started(pid: int) -> None:
+        protocol.write(json.dumps({"pgid": pid}) + "\n")
+
+    for line in iter(sys.stdin.readline, ""):
+        request = json.loads(line)
+        response = run_in_child(
+            request["args"],
+            request.get("timeout", 60),
+            request.get("cpu_seconds"),
+            request.get("memory_mb"),
+            started,
+        )
+        protocol.write(json.dumps(response) + "\n")
+
+
+if __name__ == "__main__":
+    main()
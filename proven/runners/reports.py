@@ -0,0 +1,89 @@
+"""Parsers for machine-readable test reports (JUnit XML, Jest JSON)."""
+
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from .base import TestCaseResult
+
+# Jest assertion statuses -> our outcomes
+JEST_OUTCOMES = {
+    "passed": "passed",
+    "failed": "failed",
+    "pending": "skipped",
+    "skipped": "skipped",
+    "todo": "skipped",
+    "disabled": "skipped",
+}
+
+
+def parse_junit_xml(path: Path) -> list[TestCaseResult]:
+    """Parse a JUnit XML report (pytest --junitxml, surefire, JUnit console launcher).
+
+    The file is streamed with iterparse and each <testcase> is discarded once
+    read, so large reports are handled in a single pass.
+    """
+    cases = []
+    for _, element in ET.iterparse(str(path), events=("end",)):
+        if element.tag != "testcase":
+            continue
+
+        outcome = "passed"
+        message = ""
+        for child in element:
+            if child.tag in ("failure", "error", "skipped"):
+                outcome = {"failure": "failed", "error": "error", "skipped": "skipped"}[child.tag]
+                message = (child.text or child.get("message") or "").strip()
+                break
+
+        cases.append(
+            TestCaseResult(
+                name=element.get("name", ""),
+                outcome=outcome,
+                duration=float(element.get("time") or 0),
+                message=message,
+                classname=element.get("classname", ""),
+                file=element.get("file", ""),
+            )
+        )
+        element.clear()
+
+    return cases
+
+
+def parse_jest_json(path: Path) -> list[TestCaseResult]:
+    """Parse a Jest --json report.
+
+    Suites that fail before running any test (syntax errors, missing modules)
+    are reported as a single errored case named after the test file.
+    """
+    with open(path) as f:
+        report = json.load(f)
+
+    cases = []
+    for suite in report.get("testResults", []):
+        assertions = suite.get("assertionResults", [])
+        if not assertions and suite.get("status") == "failed":
+            cases.append(
+                TestCaseResult(
+                    name=suite.get("name", ""),
+                    outcome="error",
+                    message=suite.get("message", "").strip(),
+                    file=suite.get("name", ""),
+                )
+            )
+            continue
+
+        for assertion in assertions:
+            cases.append(
+                TestCaseResult(
+                    name=assertion.get("fullName") or assertion.get("title", ""),
+                    outcome=JEST_OUTCOMES.get(assertion.get("status"), "failed"),
+                    duration=(assertion.get("duration") or 0) / 1000,
+                    message="\n".join(assertion.get("failureMessages") or []).strip(),
+                    classname=" ".join(assertion.get("ancestorTitles") or []),
+                    file=suite.get("name", ""),
+                )
+            )
+
+    return cases
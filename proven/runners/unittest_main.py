@@ -0,0 +1,138 @@
+"""Run unittest tests and write a JSON report of every test case.
+
+This script is run with the project's interpreter, or called in a forked
+copy of Proven's own, so it must only depend on the standard library.
+
+Usage:
+    python unittest_main.py REPORT [--seed SEED] [unittest arguments...]
+
+REPORT receives a JSON list of test cases, each with name, classname,
+outcome, duration and message. The remaining arguments are the same as for
+`python -m unittest`, e.g. `-v tests/test_foo.py -k "*.TestFoo.test_bar"`.
+With --seed, test methods run in an order shuffled by SEED.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+import unittest
+
+
+class ReportingResult(unittest.TextTestResult):
+    """A TextTestResult that also keeps a record of each test case."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cases: list[dict] = []
+        self._started = time.perf_counter()
+
+    def getDescription(self, test):
+        # Never add the docstring's first line, which verbose output prints on
+        # a line of its own, so each result stays on one parseable line
+        return str(test)
+
+    def startTest(self, test):
+        self._started = time.perf_counter()
+        super().startTest(test)
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self._record(test, "passed")
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._record(test, "failed", self._exc_info_to_string(err, test))
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._record(test, "error", self._exc_info_to_string(err, test))
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._record(test, "skipped", reason)
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self._record(test, "skipped", "expected failure")
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self._record(test, "failed", "unexpected success")
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+        if err is not None:
+            outcome = "failed" if issubclass(err[0], test.failureException) else "error"
+            self._record(subtest, outcome, self._exc_info_to_string(err, test))
+
+    def _record(self, test, outcome: str, message: str = "") -> None:
+        if hasattr(test, "_subDescription"):
+            classname, name = test.test_case.id().rsplit(".", 1)
+            name += f" {test._subDescription()}"
+        elif " " in test.id():
+            # Errors in fixtures, e.g. "setUpClass (test_foo.TestFoo)"
+            classname, name = "", test.id()
+        else:
+            # Also covers modules that failed to import
+            classname, _, name = test.id().rpartition(".")
+        self.cases.append(
+            {
+                "name": name,
+                "classname": classname,
+                "outcome": outcome,
+                "duration": round(time.perf_counter() - self._started, 6),
+                "message": message,
+            }
+        )
+
+
+def _import_test_files(args: list[str]) -> list[str]:
+    """Make test files importable by module name, from their own folders.
+
+    Like pytest's default import mode, each test file's folder goes on
+    sys.path (with the working directory), so "tests/test_foo.py" is imported
+    as "test_foo" and doesn't depend on "tests" being a package.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path[:] = [path for path in sys.path if os.path.abspath(path or os.curdir) != here]
+    folders = [os.path.dirname(os.path.abspath(arg)) for arg in args if arg.endswith(".py")]
+    for folder in reversed([*folders, os.getcwd()]):
+        if folder not in sys.path:
+            sys.path.insert(0, folder)
+    return [os.path.splitext(os.path.basename(arg))[0] if arg.endswith(".py") else arg for arg in args]
+
+
+def _shuffled_loader(seed: str) -> unittest.TestLoader:
+    """A loader that orders test methods by a hash of the seed and their name, instead of alphabetically."""
+
+    def key(name: str) -> str:
+        return hashlib.sha256(f"{seed}\0{name}".encode()).hexdigest()
+
+    loader = unittest.TestLoader()
+    loader.sortTestMethodsUsing = lambda a, b: (key(a) > key(b)) - (key(a) < key(b))
+    return loader
+
+
+def main(argv: list[str]) -> int:
+    """Run the tests named in argv and write the report. Returns the exit code."""
+    report, *args = argv
+    loader = unittest.defaultTestLoader
+    if args[:1] == ["--seed"]:
+        loader = _shuffled_loader(args[1])
+        args = args[2:]
+    args = _import_test_files(args)
+
+    runner = unittest.TextTestRunner(stream=sys.stderr, verbosity=2, resultclass=ReportingResult)
+    program = unittest.main(
+        module=None, argv=["python -m unittest", *args], testRunner=runner, testLoader=loader, exit=False
+    )
+
+    with open(report, "w", encoding="utf-8") as f:
+        json.dump(program.result.cases, f)
+    return 0 if program.result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,224 @@
+"""Unittest runner implementation."""
+
+import json
+import os
+import re
+import signal
+import sys
+import traceback
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from . import unittest_main
+from .base import RunProgress, TestCaseResult, TestResult, TestRunner
+from .imports import missing_python_import
+from .pytest_runner import check_python_syntax
+
+UNITTEST_MAIN = Path(unittest_main.__file__)
+REPORT_NAME = "unittest.json"
+
+# Verbose lines like "test_add (test_calc.TestCalc.test_add) ... ok"
+PROGRESS_LINE = re.compile(
+    r"^\s*(\w+) \(([\w.]+)\).*? \.\.\. (ok|FAIL|ERROR|skipped|expected failure|unexpected success)\b"
+)
+PROGRESS_OUTCOMES = {
+    "ok": "passed",
+    "FAIL": "failed",
+    "ERROR": "error",
+    "skipped": "skipped",
+    "expected failure": "skipped",
+    "unexpected success": "failed",
+}
+
+
+class ForkedProcess:
+    """Popen-like handle on a forked child, so the base runner can stream, kill and reap it."""
+
+    def __init__(self, pid: int, stdout: IO):
+        self.pid = pid
+        self.stdout = stdout
+        self.returncode: Optional[int] = None
+
+    def wait(self) -> int:
+        if self.returncode is None:
+            _, status = os.waitpid(self.pid, 0)
+            self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode
+
+    def kill(self) -> None:
+        os.kill(self.pid, signal.SIGKILL)
+
+
+class UnittestRunner(TestRunner):
+    """Test runner for unittest.
+
+    By default tests run with `python` in a subprocess. With in_process=True
+    (on platforms with fork) they run in a forked copy of Proven's own
+    interpreter instead, with unittest already imported, so no new Python
+    process has to start. Each fork imports the test and source modules
+    afresh. Forking a process with threads running is only safe for the
+    standard-library code the child runs, so it is opt-in.
+    """
+
+    runtime_commands = ("python",)
+
+    def __init__(self, working_dir: Optional[Path] = None, in_process: bool = False):
+        super().__init__(working_dir)
+        self.in_process = in_process and hasattr(os, "fork")
+
+    @property
+    def name(self) -> str:
+        return "unittest"
+
+    def get_test_file_pattern(self) -> str:
+        return "test_*.py"
+
+    def get_test_file_name(self, source_name: str) -> str:
+        """Generate test file name: foo.py -> test_foo.py"""
+        return f"test_{Path(source_name).stem}.py"
+
+    def _build_command(self, test_file: Path, report_dir: Path, selectors: Optional[list[str]] = None) -> list[str]:
+        """Build the unittest command, writing a JSON report to report_dir."""
+        command = ["python", str(UNITTEST_MAIN), str(report_dir / REPORT_NAME)]
+        if self.seed is not None:
+            command += ["--seed", str(self.seed)]
+        command += ["-v", str(test_file)]
+        for selector in selectors or []:
+            # A pattern containing "*" must match the whole test ID
+            command += ["-k", f"*.{selector}"]
+        return command
+
+    def _popen(self, command: list[str], **options: Any) -> Any:
+        """Fork instead of starting a new interpreter when running in-process.
+
+        A fork runs Proven's interpreter, with its hash seed, so with a job
+        environment, another runtime or a seed the tests run in a subprocess
+        instead.
+        """
+        if not self.in_process or self.environment is not None or self.runtime is not None or self.seed is not None:
+            return super()._popen(command, **options)
+
+        read_fd, write_fd = os.pipe()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            self._run_child(command[2:], read_fd, write_fd)
+
+        # A process group of its own, set on both sides of the fork so that
+        # kill_tree() can't signal the old group before the child has moved
+        try:
+            os.setpgid(pid, pid)
+        except OSError:
+            pass  # The child has already moved, or exited
+        os.close(write_fd)
+        if options.get("encoding"):
+            stdout = os.fdopen(read_fd, "r", encoding=options["encoding"], errors=options.get("errors", "strict"))
+        else:
+            stdout = os.fdopen(read_fd, "rb")
+        return ForkedProcess(pid, stdout)
+
+    def _command_env(self) -> dict[str, str]:
+        return {"PYTHONHASHSEED": str(self.seed % 2**32)} if self.seed is not None else {}
+
+    def _run_child(self, args: list[str], read_fd: int, write_fd: int) -> None:
+        """Run unittest_main in the forked child and exit; never returns."""
+        code = 1
+        try:
+            # A process group of its own, as for subprocesses, so the tree can be killed
+            os.setpgid(0, 0)
+            os.close(read_fd)
+            devnull = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(devnull, 0)
+            os.dup2(write_fd, 1)
+            os.dup2(write_fd, 2)
+            sys.stdout = open(1, "w", encoding="utf-8", errors="replace", buffering=1, closefd=False)
+            sys.stderr = open(2, "w", encoding="utf-8", errors="replace", buffering=1, closefd=False)
+            os.chdir(self.working_dir)
+            self.limits.apply()
+            self._forget_project_modules(args)
+            code = unittest_main.main(args)
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+    def _forget_project_modules(self, args: list[str]) -> None:
+        """Drop already-imported modules that the project's files would shadow.
+
+        The fork inherits Proven's sys.modules, so a project module that
+        shares a name with one of them (e.g. a source file called json.py)
+        must be imported again from the project.
+        """
+        folders = {Path.cwd(), *(Path(arg).resolve().parent for arg in args if arg.endswith(".py"))}
+        for folder in folders:
+            for path in folder.iterdir():
+                if path.suffix == ".py" or (path.is_dir() and (path / "__init__.py").exists()):
+                    sys.modules.pop(path.stem, None)
+
+    def _parse_result(
+        self, test_file: Path, exit_code: int, output: str, report_dir: Path, progress: Optional[RunProgress]
+    ) -> TestResult:
+        """Parse results from the JSON report, or the output as a fallback."""
+        cases = self._read_report(report_dir / REPORT_NAME, test_file)
+        if cases:
+            return TestResult.from_cases(exit_code == 0, output, cases)
+        if progress and progress.cases:
+            # Stopped early, before the report was written
+            return progress.result(exit_code, output)
+
+        # No report, e.g. the run crashed: fall back to the summary lines
+        # "Ran 3 tests in 0.001s" and "FAILED (failures=1, errors=1)"
+        ran = re.search(r"^Ran (\d+) tests?", output, re.MULTILINE)
+        failed = re.search(r"failures=(\d+)", output)
+        errors = re.search(r"errors=(\d+)", output)
+        failed_count = int(failed.group(1)) if failed else 0
+        error_count = int(errors.group(1)) if errors else (0 if ran else 1)
+        return TestResult(
+            success=exit_code == 0,
+            output=output,
+            passed=max(int(ran.group(1)) - failed_count - error_count, 0) if ran else 0,
+            failed=failed_count,
+            errors=error_count,
+        )
+
+    def parse_progress(self, line: str) -> Optional[TestCaseResult]:
+        """Parse a verbose result line like "test_add (test_calc.TestCalc.test_add) ... ok"."""
+        match = PROGRESS_LINE.match(line)
+        if not match:
+            return None
+        name, classname = match.group(1), match.group(2)
+        # Python 3.11+ prints the full test ID, older versions only the class
+        classname = classname.removesuffix(f".{name}")
+        return TestCaseResult(name=name, outcome=PROGRESS_OUTCOMES[match.group(3)], classname=classname)
+
+    def _check_syntax(self, files: list[Path]) -> Optional[str]:
+        return check_python_syntax(files)
+
+    def _missing_import(self, test_file: Path, source_file: Path) -> Optional[str]:
+        return missing_python_import(test_file, source_file, self.working_dir, self._environ())
+
+    def _test_selectors(self, test_file: Path, cases: list[TestCaseResult]) -> Optional[list[str]]:
+        """Select cases as "TestClass.test_method", matched with -k patterns."""
+        selectors = []
+        for case in cases:
+            if not case.classname or case.classname.startswith("unittest."):
+                return None  # e.g. an import or setUpClass error
+            method = case.name.split(" ")[0]  # Subtests run with their test method
+            selectors.append(f"{case.classname.rsplit('.', 1)[-1]}.{method}")
+        return list(dict.fromkeys(selectors)) or None
+
+    def cache_settings(self) -> dict[str, Any]:
+        """Forked and subprocess runs use different interpreters."""
+        return {**super().cache_settings(), "in_process": self.in_process}
+
+    @staticmethod
+    def _read_report(report: Path, test_file: Path) -> list[TestCaseResult]:
+        """Read per-test results from the JSON report, if the run wrote one."""
+        try:
+            cases = json.loads(report.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+        return [TestCaseResult(file=str(test_file), **case) for case in cases]
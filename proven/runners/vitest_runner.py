@@ -0,0 +1,148 @@
+"""Vitest test runner implementation."""
+
+import re
+from pathlib import Path
+from typing import Callable, Optional
+
+from .base import CommandResult, RunProgress, TestCaseResult, TestResult, TestRunner
+from .imports import missing_js_import
+from .jest_runner import ANSI_ESCAPE, check_js_syntax, find_node_binary, full_test_names
+from .reports import parse_jest_json
+
+WORKER_SCRIPT = Path(__file__).parent / "vitest_worker.js"
+REPORT_NAME = "vitest.json"
+
+# Verbose lines like " ✓ src/sum.test.js > sum > adds numbers 2ms" (1.x prints only the title)
+PROGRESS_LINE = re.compile(r"^\s*([✓×↓])\s+(?:.* > )?(.+?)(?:\s+\d+(?:\.\d+)?\s*m?s)?(?:\s+\[skipped\])?\s*$")
+PROGRESS_OUTCOMES = {"✓": "passed", "×": "failed", "↓": "skipped"}
+# Per-file lines use the same marks, e.g. " ✓ src/sum.test.js (3 tests) 5ms"
+FILE_LINE = re.compile(r"\.[cm]?[jt]sx? \(\d+(?: tests?)?(?: \| \d+ \w+)*\)$")
+
+
+class VitestRunner(TestRunner):
+    """Test runner for Vitest (JavaScript/TypeScript).
+
+    By default Vitest is started once in a Node sidecar that keeps its Vite
+    server running, so each run reuses the warm module graph and transform
+    cache and only re-transforms files that changed. Without the sidecar,
+    or if it can't start, each run calls `vitest run`.
+    """
+
+    runtime_commands = ("node",)
+
+    def __init__(self, working_dir: Optional[Path] = None, use_worker: bool = True):
+        super().__init__(working_dir, use_worker)
+        self._executable: Optional[list[str]] = None
+
+    @property
+    def name(self) -> str:
+        return "vitest"
+
+    def get_test_file_pattern(self) -> str:
+        return "*.test.{js,ts,jsx,tsx}"
+
+    def get_test_file_name(self, source_name: str) -> str:
+        """Generate test file name: foo.ts -> foo.test.ts"""
+        path = Path(source_name)
+        return f"{path.stem}.test{path.suffix}"
+
+    def _build_command(self, test_file: Path, report_dir: Path, selectors: Optional[list[str]] = None) -> list[str]:
+        """Build the `vitest run` command, writing a JSON report to report_dir."""
+        command = [
+            *self._vitest_executable(),
+            "run",
+            str(test_file),
+            "--reporter=verbose",
+            "--reporter=json",
+            f"--outputFile.json={report_dir / REPORT_NAME}",
+        ]
+        if selectors:
+            # -t matches against each test's full name ("describe title test title")
+            command.append(f"--testNamePattern={'|'.join(map(re.escape, selectors))}")
+        if self.seed is not None:
+            command += ["--sequence.shuffle", f"--sequence.seed={self.seed % 2**31}"]
+        return command
+
+    def _vitest_executable(self) -> list[str]:
+        """Resolve the project's vitest binary once, falling back to npx."""
+        if self._executable is None:
+            binary = find_node_binary(self.working_dir.resolve(), "vitest")
+            self._executable = [str(binary)] if binary else ["npx", "vitest"]
+        return self._executable
+
+    def _command_env(self) -> dict[str, str]:
+        # Output goes into prompts, so it is left without colors
+        return {"NO_COLOR": "1"}
+
+    def _parse_result(
+        self, test_file: Path, exit_code: int, output: str, report_dir: Path, progress: Optional[RunProgress]
+    ) -> TestResult:
+        """Parse Vitest results from its JSON report, or the output as a fallback."""
+        output = ANSI_ESCAPE.sub("", output)
+        cases = self._read_report(report_dir / REPORT_NAME)
+        if cases:
+            return TestResult.from_cases(exit_code == 0, output, cases)
+        if progress and progress.cases:
+            # Stopped early, before Vitest wrote its report
+            return progress.result(exit_code, output)
+
+        # No report: fall back to the summary line, e.g. "Tests  2 failed | 3 passed (5)"
+        summary = re.search(r"^\s*Tests\s+([^\n]*)", output, re.MULTILINE)
+        counts = {"passed": 0, "failed": 0}
+        for match in re.finditer(r"(\d+) (passed|failed)", summary.group(1) if summary else ""):
+            counts[match.group(2)] = int(match.group(1))
+
+        return TestResult(
+            success=exit_code == 0,
+            output=output,
+            passed=counts["passed"],
+            failed=counts["failed"],
+            # No summary means the run failed before any test ran
+            errors=0 if summary else int(exit_code != 0),
+        )
+
+    def parse_progress(self, line: str) -> Optional[TestCaseResult]:
+        """Parse a verbose result line like " ✓ sum.test.js > sum > adds numbers 2ms"."""
+        match = PROGRESS_LINE.match(ANSI_ESCAPE.sub("", line))
+        if not match or FILE_LINE.search(match.group(2)):
+            return None
+        return TestCaseResult(name=match.group(2), outcome=PROGRESS_OUTCOMES[match.group(1)])
+
+    def _check_syntax(self, files: list[Path]) -> Optional[str]:
+        return check_js_syntax(self, files)
+
+    def _missing_import(self, test_file: Path, source_file: Path) -> Optional[str]:
+        return missing_js_import(test_file, source_file)
+
+    def _test_selectors(self, test_file: Path, cases: list[TestCaseResult]) -> Optional[list[str]]:
+        return full_test_names(cases)
+
+    @staticmethod
+    def _read_report(report: Path) -> list[TestCaseResult]:
+        """Read per-test results from the JSON report, which uses Jest's format."""
+        if not report.exists():
+            return []
+        try:
+            return parse_jest_json(report)
+        except ValueError:
+            return []
+
+    def _worker_args(self, command: list[str]) -> list[str]:
+        """The sidecar already has Vitest running, so drop `vitest run`."""
+        return command[len(self._vitest_executable()) + 1 :]
+
+    def _worker_command(self) -> Optional[list[str]]:
+        """Start the Node sidecar that keeps Vitest's server running between runs."""
+        return ["node", str(WORKER_SCRIPT), str(self.working_dir)]
+
+    def _run_in_worker(
+        self, args: list[str], on_line: Optional[Callable[[str], bool]] = None
+    ) -> Optional[CommandResult]:
+        """Run in the sidecar, unless resource limits are set.
+
+        The sidecar runs every request in one long-lived Node process, which
+        can't take per-run rlimits, so limited runs use a subprocess instead.
+        """
+        if self.limits.cpu_seconds is not None or self.limits.memory_mb is not None:
+            return None
+        return super()._run_in_worker(args, on_line)
@@ -0,0 +1,273 @@
+#!/usr/bin/env node
+/*
+ * Long-lived Vitest sidecar for Proven.
+ *
+ * Starts Vitest once through its Node API and keeps its Vite server running,
+ * so the module graph and transform cache stay warm between runs. Each
+ * request reruns only the given test files, after invalidating the modules
+ * whose files changed since the previous run.
+ *
+ * Protocol (one JSON object per line on stdin/stdout):
+ *   -> {"args": ["tests/foo.test.js", "--reporter=json", "--outputFile.json=out.json"], "timeout": 60}
+ *   <- {"exit_code": 1, "output": "...", "complete": true}
+ *
+ * A run still going after "timeout" seconds is answered as incomplete and
+ * the sidecar exits, since Vitest can't be stopped mid-run; Proven starts a
+ * new one for the next request. A run that blocks the event loop is left
+ * to Proven's own, slightly longer, timeout.
+ *
+ * Arguments use the same spelling as `vitest run`, limited to the ones
+ * Proven generates: positional test paths, --outputFile.json=PATH and
+ * --testNamePattern=PATTERN. Reporters are fixed to verbose and json.
+ * Works with Vitest 1.x to 3.x.
+ */
+
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const readline = require("readline");
+const { pathToFileURL } = require("url");
+
+const rootDir = path.resolve(process.argv[2] || process.cwd());
+
+// Characters kept from the start and the end of a run's output, as Proven's OutputSpool does
+const HEAD_SIZE = 32 * 1024;
+const TAIL_SIZE = 32 * 1024;
+
+function createCapture() {
+  let head = "";
+  let tail = [];
+  let tailLength = 0;
+  let total = 0;
+  return {
+    write(text) {
+      total += text.length;
+      if (head.length < HEAD_SIZE) {
+        const room = HEAD_SIZE - head.length;
+        head += text.slice(0, room);
+        text = text.slice(room);
+      }
+      if (!text) return;
+      tail.push(text);
+      tailLength += text.length;
+      if (tailLength > 2 * TAIL_SIZE) {
+        tail = [tail.join("").slice(-TAIL_SIZE)];
+        tailLength = tail[0].length;
+      }
+    },
+    text() {
+      const end = tail.join("").slice(-TAIL_SIZE);
+      const omitted = total - head.length - end.length;
+      return omitted > 0 ? `${head}\n... [${omitted} characters omitted] ...\n${end}` : head + end;
+    },
+  };
+}
+
+function send(message) {
+  // Write straight to fd 1 so captured stdout never mixes with the protocol
+  fs.writeSync(1, JSON.stringify(message) + "\n");
+}
+
+function parseArgs(args) {
+  const request = { files: [], outputFile: null, testNamePattern: null };
+  for (const arg of args) {
+    const match = /^--([^=]+)(?:=(.*))?$/.exec(arg);
+    if (!match) {
+      request.files.push(path.resolve(rootDir, arg));
+    } else if (match[1] === "outputFile.json") {
+      request.outputFile = match[2];
+    } else if (match[1] === "testNamePattern") {
+      request.testNamePattern = match[2];
+    }
+  }
+  return request;
+}
+
+function exportTarget(entry) {
+  // "./dist/node.js", {"import": "./dist/node.js"} or {"import": {"default": ...}}
+  return typeof entry === "string" ? entry : exportTarget(entry.import || entry.default);
+}
+
+function findPackage(name) {
+  // Node's lookup: node_modules in the project or the nearest parent (hoisted monorepos)
+  for (let dir = rootDir; ; dir = path.dirname(dir)) {
+    const candidate = path.join(dir, "node_modules", name);
+    if (fs.existsSync(path.join(candidate, "package.json"))) {
+      return candidate;
+    }
+    if (path.dirname(dir) === dir) {
+      throw new Error(`Cannot find ${name} in ${rootDir} or its parents`);
+    }
+  }
+}
+
+async function loadVitest() {
+  // vitest/node is ESM only, so it can't be require()d; find its entry point
+  // in the project's copy of vitest and import it
+  const packageDir = findPackage("vitest");
+  const manifest = JSON.parse(fs.readFileSync(path.join(packageDir, "package.json"), "utf8"));
+  const entry = path.join(packageDir, exportTarget(manifest.exports["./node"]));
+  const { createVitest } = await import(pathToFileURL(entry).href);
+  return createVitest("test", { root: rootDir, watch: false, reporters: ["verbose", "json"] });
+}
+
+// File -> "mtime:size" when the previous run finished
+const fileStamps = new Map();
+
+function stamp(file) {
+  try {
+    const stats = fs.statSync(file);
+    return `${stats.mtimeMs}:${stats.size}`;
+  } catch (error) {
+    return "missing";
+  }
+}
+
+function moduleGraph(vitest) {
+  // Vitest 3 calls its Vite server `vite`, older versions `server`
+  return (vitest.vite || vitest.server).moduleGraph;
+}
+
+function invalidateChanged(vitest) {
+  const graph = moduleGraph(vitest);
+  for (const [file, modules] of graph.fileToModulesMap) {
+    if (fileStamps.has(file) && fileStamps.get(file) !== stamp(file)) {
+      for (const mod of modules) {
+        graph.invalidateModule(mod);
+      }
+    }
+  }
+}
+
+function recordStamps(vitest) {
+  for (const file of moduleGraph(vitest).fileToModulesMap.keys()) {
+    fileStamps.set(file, stamp(file));
+  }
+}
+
+function setTestNamePattern(vitest, pattern) {
+  if (typeof vitest.setGlobalTestNamePattern === "function") {
+    // Vitest 3
+    if (pattern) {
+      vitest.setGlobalTestNamePattern(pattern);
+    } else {
+      vitest.resetGlobalTestNamePattern();
+    }
+  } else {
+    vitest.configOverride.testNamePattern = pattern ? new RegExp(pattern) : undefined;
+  }
+}
+
+let started = false;
+
+async function runFiles(vitest, files) {
+  if (typeof vitest.runTestSpecifications === "function") {
+    // Vitest 3: init() sets up reporters without running anything
+    if (!started) {
+      await vitest.init();
+      started = true;
+    }
+    const specifications = await vitest.getRelevantTestSpecifications(files);
+    await vitest.runTestSpecifications(specifications);
+  } else if (!started) {
+    started = true;
+    await vitest.start(files);
+  } else {
+    await vitest.rerunFiles(files);
+  }
+}
+
+function hasFailures(tasks) {
+  return tasks.some(
+    (task) => (task.result && task.result.state === "fail") || (Array.isArray(task.tasks) && hasFailures(task.tasks))
+  );
+}
+
+async function runTests(vitest, request) {
+  const output = createCapture();
+  const capture = (chunk, encoding, callback) => {
+    output.write(typeof chunk === "string" ? chunk : Buffer.from(chunk).toString());
+    const done = typeof encoding === "function" ? encoding : callback;
+    if (done) done();
+    return true;
+  };
+
+  const originalStdout = process.stdout.write;
+  const originalStderr = process.stderr.write;
+  process.stdout.write = capture;
+  process.stderr.write = capture;
+
+  let exitCode = 1;
+  let complete = true;
+  let timer;
+  const expired = new Promise((resolve) => {
+    if (request.timeout) timer = setTimeout(() => resolve(false), request.timeout * 1000);
+  });
+  try {
+    const { files, outputFile, testNamePattern } = parseArgs(request.args || []);
+    vitest.config.outputFile = outputFile ? { json: outputFile } : undefined;
+    setTestNamePattern(vitest, testNamePattern);
+    invalidateChanged(vitest);
+
+    const finished = await Promise.race([runFiles(vitest, files).then(() => true), expired]);
+    if (finished) {
+      const results = vitest.state.getFiles(files);
+      const failed = results.length === 0 || hasFailures(results) || vitest.state.getUnhandledErrors().length > 0;
+      exitCode = failed ? 1 : 0;
+    } else {
+      complete = false;
+      output.write("\nTest execution timed out");
+    }
+  } catch (error) {
+    output.write(String((error && error.stack) || error) + "\n");
+  } finally {
+    clearTimeout(timer);
+    process.stdout.write = originalStdout;
+    process.stderr.write = originalStderr;
+    recordStamps(vitest);
+  }
+
+  return { exit_code: exitCode, output: output.text(), complete };
+}
+
+async function main() {
+  let vitest;
+  try {
+    process.chdir(rootDir);
+    vitest = await loadVitest();
+  } catch (error) {
+    send({ ready: false, error: String((error && error.message) || error) });
+    return;
+  }
+
+  send({ ready: true });
+
+  // Requests are handled one at a time, in arrival order
+  let queue = Promise.resolve();
+  const input = readline.createInterface({ input: process.stdin });
+  input.on("line", (line) => {
+    queue = queue.then(async () => {
+      let request;
+      try {
+        request = JSON.parse(line);
+      } catch (error) {
+        send({ exit_code: 1, output: `Invalid request: ${error.message}` });
+        return;
+      }
+      const response = await runTests(vitest, request);
+      send(response);
+      if (!response.complete) {
+        // The timed-out run is still going and would share this process
+        process.exit(1);
+      }
+    });
+  });
+  input.on("close", () =>
+    queue
+      .then(() => vitest.close())
+      .finally(() => process.exit(0))
+  );
+}
+
+main();
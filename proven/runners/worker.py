@@ -0,0 +1,160 @@
+"""Persistent worker processes that keep a test framework warm between runs."""
+
+import json
+import os
+import select
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+# Seconds a worker may take to warm up and report ready
+START_TIMEOUT = 60.0
+# Bytes a message may take; workers send only the head and tail of long output
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+
+class WorkerError(Exception):
+    """Raised when a worker process cannot be started or stops responding."""
+
+
+class WorkerTimeout(WorkerError):
+    """Raised when a worker does not answer a request in time."""
+
+
+class WorkerProcess:
+    """A long-lived helper process speaking line-delimited JSON over stdin/stdout.
+
+    The worker announces itself with a ``{"ready": true}`` line once it has
+    finished warming up, then answers one JSON response line per request line.
+    Before a response it may send ``{"pgid": N}`` for a process group it
+    started the run in, so a request that times out can kill that group too.
+    """
+
+    def __init__(self, command: list[str], cwd: Optional[Path] = None, env: Optional[dict[str, str]] = None):
+        self.command = command
+        self.cwd = cwd or Path.cwd()
+        self.env = env
+        self._process: Optional[subprocess.Popen] = None
+        self._buffer = bytearray()
+        self._pgid: Optional[int] = None
+        # Requests may come from several threads (e.g. asyncio.to_thread)
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        """Check if the worker process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self, timeout: float = START_TIMEOUT) -> None:
+        """Start the worker and wait up to timeout seconds for it to report ready."""
+        self._buffer.clear()
+        try:
+            self._process = subprocess.Popen(
+                self.command,
+                cwd=self.cwd,
+                env=self.env,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                # Unbuffered, so select() sees every byte not yet in self._buffer
+                bufsize=0,
+            )
+        except (FileNotFoundError, PermissionError) as e:
+            raise WorkerError(f"Could not start worker: {e}") from e
+
+        message = self._read(timeout)
+        if not message.get("ready"):
+            self.close()
+            raise WorkerError(message.get("error", "Worker failed to start"))
+
+    def request(self, payload: dict[str, Any], timeout: Optional[float] = None) -> dict[str, Any]:
+        """Send a request to the worker and return its response.
+
+        Raises:
+            WorkerTimeout: If no response arrives within timeout (the worker is killed)
+            WorkerError: If the worker has died or the pipe is broken
+        """
+        with self._lock:
+            if not self.alive:
+                self.start()
+
+            assert self._process is not None and self._process.stdin is not None
+            try:
+                self._process.stdin.write((json.dumps(payload) + "\n").encode())
+            except (BrokenPipeError, OSError) as e:
+                self.close()
+                raise WorkerError(f"Worker pipe closed: {e}") from e
+
+            return self._read(timeout)
+
+    def close(self) -> None:
+        """Stop the worker process."""
+        if self._process is None:
+            return
+        try:
+            if self._process.stdin:
+                self._process.stdin.close()
+            self._process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+            self._process.wait()
+        finally:
+            self._process = None
+
+    def _read(self, timeout: Optional[float] = None) -> dict[str, Any]:
+        """Read one JSON message from the worker, noting any process group it announces first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            line = self._read_line(deadline, timeout)
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError as e:
+                self.close()
+                raise WorkerError(f"Invalid worker response: {line.strip()}") from e
+            if isinstance(message, dict) and set(message) == {"pgid"}:
+                self._pgid = message["pgid"]
+                continue
+            self._pgid = None
+            return message
+
+    def _read_line(self, deadline: Optional[float], timeout: Optional[float]) -> str:
+        """Read one line from the worker, killing it (and its run) at the deadline."""
+        assert self._process is not None and self._process.stdout is not None
+        fd = self._process.stdout.fileno()
+        searched = 0
+        while (newline := self._buffer.find(b"\n", searched)) < 0:
+            searched = len(self._buffer)
+            # select() only works on pipes on POSIX; elsewhere we block
+            if deadline is not None and os.name == "posix":
+                ready, _, _ = select.select([fd], [], [], max(deadline - time.monotonic(), 0))
+                if not ready:
+                    self._kill_run()
+                    self._process.kill()
+                    self.close()
+                    raise WorkerTimeout(f"Worker did not respond within {timeout}s")
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                self.close()
+                raise WorkerError("Worker exited unexpectedly")
+            self._buffer += chunk
+            if len(self._buffer) > MAX_MESSAGE_SIZE:
+                self._kill_run()
+                self._process.kill()
+                self.close()
+                raise WorkerError(f"Worker sent a message over {MAX_MESSAGE_SIZE} bytes")
+        line = self._buffer[:newline].decode(errors="replace")
+        del self._buffer[: newline + 1]
+        return line
+
+    def _kill_run(self) -> None:
+        """Kill the process group of the run in progress, which would outlive the worker."""
+        if self._pgid is None or not hasattr(os, "killpg"):
+            return
+        try:
+            os.killpg(self._pgid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        self._pgid = None
@@ -1,6 +1,7 @@
 """TDD workflow engine."""
 
 from .engine import TDDEngine
+from .mutation import MutationTester
 from .prompts import TDDPrompts
 
-__all__ = ["TDDEngine", "TDDPrompts"]
+__all__ = ["MutationTester", "TDDEngine", "TDDPrompts"]
@@ -1,17 +1,24 @@
 """TDD workflow engine that orchestrates the Red-Green-Refactor cycle."""
 
-from dataclasses import dataclass
+import asyncio
+import random
+from dataclasses import dataclass, replace
 from enum import Enum
 from pathlib import Path
 from typing import Callable, Optional
 
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 from rich.syntax import Syntax
 
 from ..providers.base import LLMProvider
-from ..runners.base import TestResult, TestRunner
+from ..runners.base import ProgressCallback, TestCaseResult, TestResult, TestRunner
+from ..runners.environments import EnvironmentBuildError, EnvironmentPool, JobEnvironment
+from ..runners.output import collect_logs
+from .mutation import Mutant, MutationReport, MutationTester
 from .prompts import TDDPrompts
+from .workspace import Workspace
 
 
 class TDDPhase(Enum):
@@ -32,6 +39,7 @@ class TDDResult:
     source_file: Path
     final_test_result: TestResult
     phase: TDDPhase
+    mutation: Optional[MutationReport] = None
 
 
 class TDDEngine:
@@ -43,11 +51,28 @@ class TDDEngine:
         runner: TestRunner,
         console: Optional[Console] = None,
         language: str = "python",
+        isolate: bool = False,
+        workspace_root: Optional[Path] = None,
+        environments: Optional[EnvironmentPool] = None,
+        stability_runs: int = 0,
+        mutation: Optional[MutationTester] = None,
+        mutation_feedback: bool = False,
     ):
         self.provider = provider
         self.runner = runner
         self.console = console or Console()
         self.language = language
+        # Write and test in a private copy of the project, see Workspace
+        self.isolate = isolate
+        self.workspace_root = workspace_root
+        # Templates cloned into each workspace as its dependency environment
+        self.environments = environments
+        # Shuffled reruns a passing suite must survive before it counts as GREEN
+        self.stability_runs = stability_runs
+        # Mutants of the implementation a GREEN suite is run against, and whether
+        # the tests are regenerated to catch the ones that survive
+        self.mutation = mutation
+        self.mutation_feedback = mutation_feedback
         self.prompts = TDDPrompts()
 
     async def run(
@@ -57,6 +82,7 @@ class TDDEngine:
         source_file: Path,
         on_approval: Optional[Callable[[str, str], bool]] = None,
         max_iterations: int = 3,
+        force_red_run: bool = False,
     ) -> TDDResult:
         """Execute the full TDD workflow.
 
@@ -66,10 +92,83 @@ class TDDEngine:
             source_file: Where to write implementation
             on_approval: Callback to ask user for approval (phase, code) -> bool
             max_iterations: Max attempts to make tests pass
+            force_red_run: Run the tests in the RED phase even when they are
+                certain to fail (e.g. they import a module that doesn't exist)
 
         Returns:
-            TDDResult with generated code and test results
+            TDDResult with generated code and test results. Log files of the
+            full output of its test runs are deleted by the time it returns.
         """
+        with collect_logs():
+            return await self._run(request, test_file, source_file, on_approval, max_iterations, force_red_run)
+
+    async def _run(
+        self,
+        request: str,
+        test_file: Path,
+        source_file: Path,
+        on_approval: Optional[Callable[[str, str], bool]],
+        max_iterations: int,
+        force_red_run: bool,
+    ) -> TDDResult:
+        """Run the workflow in the project, or in a workspace promoted to it once GREEN."""
+        if not self.isolate:
+            return await self._cycle(
+                self.runner, request, test_file, source_file, on_approval, max_iterations, force_red_run
+            )
+
+        # Mirroring and deleting the project copy is blocking file I/O, kept off the event loop
+        workspace = await asyncio.to_thread(Workspace, self.runner.project_dir, self.workspace_root)
+        try:
+            runner = self.runner.in_directory(workspace.root)
+            if self.environments is not None:
+                runner.environment = await self._provision(workspace)
+            try:
+                result = await self._cycle(
+                    runner,
+                    request,
+                    workspace.path(test_file),
+                    workspace.path(source_file),
+                    on_approval,
+                    max_iterations,
+                    force_red_run,
+                )
+            finally:
+                runner.close()
+
+            if result.final_test_result.is_green:
+                await asyncio.to_thread(workspace.promote, [test_file, source_file])
+                self.console.print(f"[dim]Promoted {test_file} and {source_file} to the project[/dim]")
+            else:
+                self.console.print("[dim]Tests are failing, so the project was left unchanged[/dim]")
+        finally:
+            await asyncio.to_thread(workspace.close)
+
+        result.test_file = test_file
+        result.source_file = source_file
+        return result
+
+    async def _provision(self, workspace: Workspace) -> Optional[JobEnvironment]:
+        """Clone the project's dependency environment into the workspace, or None to use the project's own."""
+        try:
+            return await asyncio.to_thread(
+                self.environments.provision, workspace.project_dir, workspace.root, self.language
+            )
+        except EnvironmentBuildError as e:
+            self.console.print(f"[yellow]Using the project's dependencies: {escape(str(e))}[/yellow]")
+            return None
+
+    async def _cycle(
+        self,
+        runner: TestRunner,
+        request: str,
+        test_file: Path,
+        source_file: Path,
+        on_approval: Optional[Callable[[str, str], bool]],
+        max_iterations: int,
+        force_red_run: bool,
+    ) -> TDDResult:
+        """Run Red -> Green with the given runner, writing the files where they are given."""
         # Phase 1: RED - Generate tests
         self.console.print(Panel("[bold red]PHASE 1: RED[/bold red] - Generating tests first...", border_style="red"))
 
@@ -88,8 +187,13 @@ class TDDEngine:
         self.console.print(f"[dim]Tests written to {test_file}[/dim]")
 
         # Run tests - they should FAIL (no implementation yet)
-        self.console.print("\n[bold]Running tests (expecting failure)...[/bold]")
-        red_result = self.runner.run(test_file)
+        red_result = None if force_red_run else runner.prove_red(test_file, source_file)
+        if red_result is not None:
+            self.console.print(f"\n[dim]Skipping the test run, failure is certain: {escape(red_result.output)}[/dim]")
+        else:
+            self.console.print("\n[bold]Running tests (expecting failure)...[/bold]")
+            # RED only needs to see the tests fail, so stop at the first failure
+            red_result = await self._run_tests(runner, test_file, source_file, on_event=self._stop_on_failure)
 
         if red_result.is_green:
             self.console.print(
@@ -123,20 +227,22 @@ class TDDEngine:
 
         # Run tests - they should PASS now
         iteration = 0
-        green_result = self.runner.run(test_file)
+        green_result = await self._run_tests(runner, test_file, source_file)
+        green_result = await self._check_stability(runner, test_file, source_file, green_result)
 
         while green_result.is_red and iteration < max_iterations:
             iteration += 1
             self.console.print(f"\n[yellow]Tests still failing. Iteration {iteration}/{max_iterations}...[/yellow]")
-            self.console.print(f"[dim]{green_result.output}[/dim]")
+            self.console.print(f"[dim]{escape(green_result.compact())}[/dim]")
 
             # Ask LLM to fix the implementation
             implementation_code = await self._fix_implementation(
-                request, test_code, implementation_code, green_result.output
+                request, test_code, implementation_code, self._failure_output(green_result)
             )
             source_file.write_text(implementation_code)
 
-            green_result = self.runner.run(test_file)
+            green_result = await self._run_tests(runner, test_file, source_file, previous=green_result)
+            green_result = await self._check_stability(runner, test_file, source_file, green_result)
 
         if green_result.is_green:
             self.console.print(
@@ -145,7 +251,22 @@ class TDDEngine:
             )
         else:
             self.console.print(f"\n[bold red]Tests still failing after {max_iterations} iterations[/bold red]")
-            self.console.print(f"[dim]{green_result.output}[/dim]")
+            self.console.print(f"[dim]{escape(green_result.compact())}[/dim]")
+
+        mutation = None
+        if green_result.is_green and self.mutation is not None and self.language == "python":
+            test_code, green_result, mutation = await self._test_mutants(
+                runner, request, test_code, implementation_code, test_file, source_file, green_result, on_approval
+            )
+
+        for runtime, result in green_result.runtimes.items():
+            state = "[green]pass[/green]" if result.is_green else "[red]fail[/red]"
+            self.console.print(
+                f"  {escape(runtime)}: {state} [dim]({result.passed} passed, {result.failed} failed)[/dim]"
+            )
+
+        if self.runner.cache is not None:
+            self.console.print(f"[dim]Result cache: {self.runner.cache.stats()}[/dim]")
 
         return TDDResult(
             test_code=test_code,
@@ -154,8 +275,172 @@ class TDDEngine:
             source_file=source_file,
             final_test_result=green_result,
             phase=TDDPhase.GREEN if green_result.is_green else TDDPhase.RED,
+            mutation=mutation,
         )
 
+    async def _run_tests(
+        self,
+        runner: TestRunner,
+        test_file: Path,
+        source_file: Path,
+        previous: Optional[TestResult] = None,
+        on_event: Optional[ProgressCallback] = None,
+    ) -> TestResult:
+        """Run the tests, unless the preflight check finds code that doesn't compile.
+
+        With a previous result, the tests that failed last time are rerun first
+        and GREEN is only reported after a full run.
+        """
+        preflight = await asyncio.to_thread(runner.preflight, [test_file, source_file])
+        if preflight is not None:
+            self.console.print("[yellow]Code does not compile, skipping the test run[/yellow]")
+            return preflight
+
+        on_event = on_event or self._show_progress
+        if previous is None:
+            return await runner.run_async(test_file, on_event=on_event, source_file=source_file)
+        return await runner.rerun_async(test_file, previous, on_event=on_event, source_file=source_file)
+
+    async def _check_stability(
+        self, runner: TestRunner, test_file: Path, source_file: Path, result: TestResult
+    ) -> TestResult:
+        """Rerun a GREEN suite stability_runs times at once, each with its own seed and test order.
+
+        Every test gets a flake rate, the share of reruns it didn't pass.
+        Tests that failed any rerun are marked failed, which turns the
+        result RED. Reruns that report no tests at all (e.g. the framework
+        rejected the shuffle options) are left out of the rates.
+        """
+        if self.stability_runs < 1 or not result.is_green:
+            return result
+        self.console.print(f"[dim]Checking stability: {self.stability_runs} reruns in shuffled order...[/dim]")
+
+        seeds = [random.randrange(2**32) for _ in range(self.stability_runs)]
+        seeded = [runner.with_seed(seed) for seed in seeds]
+        # Runners that can't share a working directory rerun in turn
+        turn = asyncio.Semaphore(len(seeded) if runner.concurrent_runs else 1)
+
+        async def rerun(copy: TestRunner, seed: int) -> TestResult:
+            # Selected tests run in the given order where the framework allows it (pytest without pytest-randomly)
+            order = random.Random(seed).sample(result.cases, len(result.cases))
+            async with turn:
+                return await copy.run_async(test_file, source_file=source_file, only=order or None)
+
+        try:
+            reruns = await asyncio.gather(*(rerun(copy, seed) for copy, seed in zip(seeded, seeds)))
+        finally:
+            for copy in seeded:
+                copy.close()
+
+        counted = [rerun for rerun in reruns if rerun.cases]
+        if len(counted) < len(reruns):
+            self.console.print(f"[yellow]{len(reruns) - len(counted)} stability reruns reported no tests[/yellow]")
+        if not counted:
+            return result
+
+        cases = []
+        flake_rates = {}
+        for case in result.cases:
+            failed = [
+                message for message in (self._rerun_failure(case, rerun) for rerun in counted) if message is not None
+            ]
+            flake_rates[self._case_id(case)] = len(failed) / len(counted)
+            if failed:
+                message = f"Flaky: failed {len(failed)} of {len(counted)} reruns in shuffled order\n{failed[0]}"
+                case = replace(case, outcome="failed", message=message)
+                self.console.print(f"  [red]FLAKY[/red] {escape(case.name)} ({len(failed)}/{len(counted)})")
+            cases.append(case)
+        for rerun in reruns:
+            rerun.discard_log()
+
+        if not any(flake_rates.values()):
+            self.console.print("[dim]No flaky tests[/dim]")
+            result.flake_rates = flake_rates
+            return result
+        stable = TestResult.from_cases(False, result.output, cases)
+        stable.flake_rates = flake_rates
+        stable.runtimes = result.runtimes
+        stable.log_path = result.log_path
+        return stable
+
+    @staticmethod
+    def _case_id(case: TestCaseResult) -> str:
+        """Identify a test across runs, e.g. "test_calc.TestAdd::test_zero".
+
+        Names alone collide between classes and modules; the classname
+        includes the module, where the file isn't reported by every run.
+        """
+        return f"{case.classname}::{case.name}" if case.classname else case.name
+
+    @classmethod
+    def _rerun_failure(cls, case: TestCaseResult, rerun: TestResult) -> Optional[str]:
+        """Why a test didn't pass in a rerun, or None if it passed (or was skipped)."""
+        for other in rerun.cases:
+            if cls._case_id(other) == cls._case_id(case):
+                return other.message or other.outcome if other.is_failure else None
+        # Missing from a failed rerun, e.g. the run crashed before reaching it
+        return None if rerun.is_green else rerun.compact(1000)
+
+    async def _test_mutants(
+        self,
+        runner: TestRunner,
+        request: str,
+        test_code: str,
+        implementation_code: str,
+        test_file: Path,
+        source_file: Path,
+        result: TestResult,
+        on_approval: Optional[Callable[[str, str], bool]],
+    ) -> tuple[str, TestResult, MutationReport]:
+        """Run the GREEN suite against mutants of the implementation, then ask for tests that kill the survivors.
+
+        The stronger tests are kept only if they are approved and pass on the
+        real implementation; then just the survivors are tested again.
+
+        Returns:
+            The test code, its result and the mutation report
+        """
+        self.console.print(
+            Panel(
+                "[bold magenta]MUTATION TESTING[/bold magenta] - Planting bugs the tests should catch...",
+                border_style="magenta",
+            )
+        )
+        report = await self.mutation.run(runner, test_file, source_file, result)
+        self._show_mutation(report)
+        if not report.survived or not self.mutation_feedback:
+            return test_code, result, report
+
+        stronger = await self._strengthen_tests(request, test_code, implementation_code, report.survived)
+        self._display_code(stronger, "Stronger tests", "python")
+        if on_approval and not on_approval("stronger tests", stronger):
+            self.console.print("[yellow]Keeping the original tests[/yellow]")
+            return test_code, result, report
+
+        test_file.write_text(stronger)
+        stronger_result = await self._run_tests(runner, test_file, source_file)
+        stronger_result = await self._check_stability(runner, test_file, source_file, stronger_result)
+        if not stronger_result.is_green:
+            test_file.write_text(test_code)
+            self.console.print("[yellow]The new tests fail on the implementation, keeping the original tests[/yellow]")
+            return test_code, result, report
+
+        retest = await self.mutation.run(runner, test_file, source_file, stronger_result, mutants=report.survived)
+        report = MutationReport(
+            killed=report.killed + retest.killed, survived=retest.survived, not_run=report.not_run + retest.not_run
+        )
+        self._show_mutation(report)
+        return stronger, stronger_result, report
+
+    def _show_mutation(self, report: MutationReport) -> None:
+        """Print the mutation score and the mutants that survived."""
+        if report.total == 0:
+            self.console.print("[dim]No mutants to test[/dim]")
+            return
+        self.console.print(f"[bold]Mutation score: {report.summary()}[/bold]")
+        for mutant in report.survived:
+            self.console.print(f"  [yellow]SURVIVED[/yellow] {escape(str(mutant))}")
+
     async def _generate_tests(self, request: str) -> str:
         """Generate test code for the request."""
         system = self.prompts.test_generation(self.runner.name, self.language)
@@ -208,6 +493,54 @@ Write the corrected implementation:"""
         response = await self.provider.generate(prompt, system)
         return self.prompts.extract_code_block(response, self.language)
 
+    async def _strengthen_tests(
+        self, request: str, test_code: str, implementation_code: str, survivors: list[Mutant]
+    ) -> str:
+        """Regenerate the tests so they also fail for the surviving mutants."""
+        system = self.prompts.strengthen_tests(self.runner.name, self.language)
+        bugs = "\n".join(f"- {mutant}" for mutant in survivors)
+        prompt = f"""These tests pass, but they also pass with any one of the bugs below planted in the implementation.
+Add tests that catch them.
+
+Original requirement:
+{request}
+
+Tests:
+```{self.language}
+{test_code}
+```
+
+Implementation:
+```{self.language}
+{implementation_code}
+```
+
+Planted bugs the tests miss (line numbers refer to the implementation):
+{bugs}
+
+Write the complete test file:"""
+
+        response = await self.provider.generate(prompt, system)
+        return self.prompts.extract_code_block(response, self.language)
+
+    def _show_progress(self, case: TestCaseResult) -> bool:
+        """Print a test result as it streams in. Never stops the run."""
+        style = "green" if case.outcome == "passed" else "red" if case.is_failure else "dim"
+        self.console.print(f"  [{style}]{case.outcome.upper()}[/{style}] {escape(case.name)}")
+        return False
+
+    def _stop_on_failure(self, case: TestCaseResult) -> bool:
+        """Print a test result and stop the run once any test fails."""
+        self._show_progress(case)
+        return case.is_failure
+
+    @staticmethod
+    def _failure_output(result: TestResult) -> str:
+        """Summarize failing test cases for a prompt, falling back to the raw output."""
+        if not result.failures:
+            return result.compact()
+        return "\n\n".join(f"{case.name} ({case.outcome}):\n{case.message}" for case in result.failures)
+
     def _display_code(self, code: str, title: str, language: str) -> None:
         """Display code with syntax highlighting."""
         syntax = Syntax(code, language, theme="monokai", line_numbers=True)
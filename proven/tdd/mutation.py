@@ -0,0 +1,354 @@
+"""Mutation testing: check that the tests fail for small bugs planted in the source file."""
+
+import ast
+import asyncio
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Optional
+
+from ..runners.base import TestCaseResult, TestResult, TestRunner
+from ..runners.imports import is_main_guard
+from ..runners.pytest_runner import available_cores
+from .workspace import Workspace
+
+# Operator swaps, each to an operator that is valid in the same place
+BINARY_SWAPS: dict[type, type] = {
+    ast.Add: ast.Sub,
+    ast.Sub: ast.Add,
+    ast.Mult: ast.Div,
+    ast.Div: ast.Mult,
+    ast.FloorDiv: ast.Mult,
+    ast.Mod: ast.FloorDiv,
+    ast.Pow: ast.Mult,
+    ast.BitAnd: ast.BitOr,
+    ast.BitOr: ast.BitAnd,
+    ast.LShift: ast.RShift,
+    ast.RShift: ast.LShift,
+}
+COMPARE_SWAPS: dict[type, type] = {
+    ast.Lt: ast.LtE,
+    ast.LtE: ast.Lt,
+    ast.Gt: ast.GtE,
+    ast.GtE: ast.Gt,
+    ast.Eq: ast.NotEq,
+    ast.NotEq: ast.Eq,
+    ast.Is: ast.IsNot,
+    ast.IsNot: ast.Is,
+    ast.In: ast.NotIn,
+    ast.NotIn: ast.In,
+}
+# Type hints don't change behavior, so mutating them only makes mutants nothing can kill
+SKIPPED_FIELDS = frozenset({"annotation", "returns", "type_comment"})
+# Seconds a mutant's test run may take at least, however fast the tests were on the real source
+MIN_MUTANT_TIMEOUT = 5.0
+# Workers when none are configured: one per core, up to this many
+DEFAULT_MAX_WORKERS = 4
+# Returned by _changed_constant for values that have no mutation
+_UNCHANGED = object()
+
+
+@dataclass
+class Mutant:
+    """A copy of the source file with one small change."""
+
+    line: int
+    description: str  # e.g. "a + b -> a - b"
+    code: str
+
+    def __str__(self) -> str:
+        return f"line {self.line}: {self.description}"
+
+
+@dataclass
+class MutationReport:
+    """Which mutants the tests killed (failed for) and which survived."""
+
+    killed: list[Mutant] = field(default_factory=list)
+    survived: list[Mutant] = field(default_factory=list)
+    not_run: list[Mutant] = field(default_factory=list)  # Left over when the time budget ran out
+
+    @property
+    def total(self) -> int:
+        return len(self.killed) + len(self.survived) + len(self.not_run)
+
+    @property
+    def score(self) -> Optional[float]:
+        """Share of the tested mutants that were killed, or None if none were tested."""
+        tested = len(self.killed) + len(self.survived)
+        return len(self.killed) / tested if tested else None
+
+    def summary(self) -> str:
+        """Describe the score, e.g. "80% (8 of 10 mutants killed, 2 not run)"."""
+        if self.score is None:
+            return f"no score ({self.total} mutants, none tested)"
+        text = f"{self.score:.0%} ({len(self.killed)} of {len(self.killed) + len(self.survived)} mutants killed"
+        if self.not_run:
+            text += f", {len(self.not_run)} not run"
+        return text + ")"
+
+
+class _Mutator:
+    """Walks a module in a fixed order, listing mutation sites and applying the one at target.
+
+    Sites are numbered in the same order for every parse of the same code,
+    so each mutant is made by parsing the source again and applying one.
+    """
+
+    def __init__(self, target: Optional[int] = None):
+        self.target = target
+        self.sites: list[tuple[int, str]] = []
+
+    def apply(self, tree: ast.Module) -> ast.Module:
+        self._walk(tree)
+        return tree
+
+    def _visit(self, node: ast.AST) -> ast.AST:
+        if _is_docstring(node) or isinstance(node, ast.JoinedStr) or is_main_guard(node):
+            return node
+        for description, mutated in _mutations(node):
+            self.sites.append((getattr(node, "lineno", 0), description))
+            if len(self.sites) - 1 == self.target:
+                return ast.copy_location(mutated, node)
+        self._walk(node)
+        return node
+
+    def _walk(self, node: ast.AST) -> None:
+        for name, value in ast.iter_fields(node):
+            if name in SKIPPED_FIELDS:
+                continue
+            if isinstance(value, list):
+                value[:] = [self._visit(item) if isinstance(item, ast.AST) else item for item in value]
+            elif isinstance(value, ast.AST):
+                setattr(node, name, self._visit(value))
+
+
+def generate_mutants(source: str, max_mutants: Optional[int] = None) -> list[Mutant]:
+    """Make AST-level mutants of Python source: swapped operators, changed constants and removed branches.
+
+    Args:
+        source: The module's code
+        max_mutants: Keep at most this many, spread evenly over the module
+
+    Returns:
+        The mutants, each with its code unparsed from the mutated tree, or an
+        empty list if the source doesn't parse
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    counter = _Mutator()
+    original = ast.unparse(counter.apply(tree))
+    sites = counter.sites
+
+    indices = range(len(sites))
+    if max_mutants is not None and len(sites) > max_mutants:
+        indices = sorted({index * len(sites) // max_mutants for index in range(max_mutants)})
+
+    mutants = []
+    for index in indices:
+        code = ast.unparse(_Mutator(index).apply(ast.parse(source)))
+        if code != original:
+            line, description = sites[index]
+            mutants.append(Mutant(line, description, code))
+    return mutants
+
+
+class MutationTester:
+    """Runs a passing test suite against mutants of its source file, several at once.
+
+    Each worker tests mutants in its own workspace, where only the test and
+    source files are copied and the rest of the working directory is
+    linked, writing one mutant at a time over the source file. A run stops
+    at the first failing test, which is all it takes to kill the mutant.
+    Verdicts are stored in the runner's result cache, so unchanged tests and
+    code are never run against the same mutant twice. The budget covers the
+    whole stage, setup included, and mutants left when it runs out are
+    reported as not run.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        budget: float = 60.0,
+        max_mutants: Optional[int] = 50,
+        workspace_root: Optional[Path] = None,
+    ):
+        self.workers = workers
+        self.budget = budget
+        self.max_mutants = max_mutants
+        self.workspace_root = workspace_root
+
+    async def run(
+        self,
+        runner: TestRunner,
+        test_file: Path,
+        source_file: Path,
+        baseline: TestResult,
+        mutants: Optional[list[Mutant]] = None,
+    ) -> MutationReport:
+        """Test the mutants of source_file, generating them if none are given.
+
+        Args:
+            runner: The runner the suite passed with
+            test_file: The test file, inside the runner's working directory
+            source_file: The file to mutate, inside the runner's working directory
+            baseline: The passing result on the real source, which sets the
+                timeout for each mutant's run
+            mutants: Mutants to test instead of generating them, e.g. the
+                survivors of an earlier run
+
+        Returns:
+            The killed, surviving and untested mutants. Files that aren't
+            Python get no mutants.
+        """
+        deadline = time.monotonic() + self.budget
+        if mutants is None:
+            mutants = generate_mutants(source_file.read_text(), self.max_mutants) if source_file.suffix == ".py" else []
+        report = MutationReport()
+        if not mutants:
+            return report
+
+        pending = iter(mutants)
+        workers = self.workers or min(available_cores(), DEFAULT_MAX_WORKERS)
+        workers = min(workers, len(mutants)) if runner.concurrent_runs else 1
+
+        async def work() -> None:
+            workspace = await asyncio.to_thread(
+                Workspace, runner.working_dir, self.workspace_root, copied=[test_file, source_file]
+            )
+            copy = runner.in_directory(workspace.root)
+            copy.environment = runner.environment
+            copy.cache = None  # Verdicts are cached instead, see _killed()
+            # A mutant that makes the code loop forever is killed by the timeout
+            copy.timeout = min(runner.timeout, max(MIN_MUTANT_TIMEOUT, baseline.wall_time * 5))
+            try:
+                for mutant in pending:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        report.not_run.append(mutant)
+                        continue
+                    try:
+                        killed = await asyncio.wait_for(
+                            self._killed(runner, copy, workspace, test_file, source_file, mutant), remaining
+                        )
+                    except asyncio.TimeoutError:
+                        report.not_run.append(mutant)
+                        continue
+                    (report.killed if killed else report.survived).append(mutant)
+            finally:
+                copy.close()
+                await asyncio.to_thread(workspace.close)
+
+        await asyncio.gather(*(work() for _ in range(workers)))
+        # Workers finish in any order; list mutants in source order
+        position = {id(mutant): index for index, mutant in enumerate(mutants)}
+        for group in (report.killed, report.survived, report.not_run):
+            group.sort(key=lambda mutant: position[id(mutant)])
+        return report
+
+    @staticmethod
+    async def _killed(
+        runner: TestRunner,
+        copy: TestRunner,
+        workspace: Workspace,
+        test_file: Path,
+        source_file: Path,
+        mutant: Mutant,
+    ) -> bool:
+        """Write the mutant over the workspace's source file and check whether any test fails."""
+        test_copy, source_copy = workspace.path(test_file), workspace.path(source_file)
+        source_copy.write_text(mutant.code)
+        # Bytecode caches only check the file's size and mtime in whole seconds, which mutants can share
+        for cached in source_copy.parent.glob(f"__pycache__/{source_copy.stem}.*.pyc"):
+            cached.unlink(missing_ok=True)
+
+        key = None
+        if runner.cache is not None:
+            settings = {**runner.cache_settings(), "mutation": True}
+            key = runner.cache.key(runner.name, [test_copy, source_copy], settings)
+            cached = runner.cache.get(key)
+            if cached is not None:
+                return cached.is_red
+
+        failed = []
+
+        def stop_at_failure(case: TestCaseResult) -> bool:
+            if case.is_failure:
+                failed.append(case)
+            return case.is_failure
+
+        result = await copy.run_async(test_copy, on_event=stop_at_failure, source_file=source_copy)
+        # A timeout or crash kills the mutant too, but may not happen next time, so only certain verdicts are kept
+        if key is not None and (result.complete or failed):
+            runner.cache.put(
+                key, replace(result, output="", cases=result.failures or failed, runtimes={}, complete=True)
+            )
+        result.discard_log()
+        return result.is_red
+
+
+def _mutations(node: ast.AST) -> list[tuple[str, ast.AST]]:
+    """The mutations that apply to one node, as (description, replacement node) pairs."""
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_SWAPS:
+        swapped = _replace_node(node, op=BINARY_SWAPS[type(node.op)]())
+        return [(_change(node, swapped), swapped)]
+    if isinstance(node, ast.AugAssign) and type(node.op) in BINARY_SWAPS:
+        swapped = _replace_node(node, op=BINARY_SWAPS[type(node.op)]())
+        return [(_change(node, swapped), swapped)]
+    if isinstance(node, ast.BoolOp):
+        swapped = _replace_node(node, op=ast.Or() if isinstance(node.op, ast.And) else ast.And())
+        return [(_change(node, swapped), swapped)]
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+        return [(_change(node, node.operand), node.operand)]
+    if isinstance(node, ast.Compare):
+        mutations = []
+        for position, op in enumerate(node.ops):
+            if type(op) in COMPARE_SWAPS:
+                ops = [*node.ops[:position], COMPARE_SWAPS[type(op)](), *node.ops[position + 1 :]]
+                swapped = _replace_node(node, ops=ops)
+                mutations.append((_change(node, swapped), swapped))
+        return mutations
+    if isinstance(node, ast.Constant):
+        value = _changed_constant(node.value)
+        if value is _UNCHANGED:
+            return []
+        changed = ast.Constant(value=value)
+        return [(_change(node, changed), changed)]
+    if isinstance(node, ast.If):
+        # The branch never runs; an else branch (if any) always does
+        removed = _replace_node(node, test=ast.Constant(value=False))
+        return [(f"removed the `if {_short(node.test)}` branch", removed)]
+    return []
+
+
+def _changed_constant(value: object) -> object:
+    """A different value of the same type: flipped bools, numbers plus one, empty strings."""
+    if isinstance(value, bool):
+        return not value
+    if isinstance(value, (int, float)):
+        return value + 1
+    if isinstance(value, str) and value:
+        return ""
+    return _UNCHANGED
+
+
+def _replace_node(node: ast.AST, **fields: object) -> ast.AST:
+    """A shallow copy of node with some fields replaced."""
+    copy = type(node)(**{**dict(ast.iter_fields(node)), **fields})
+    return ast.copy_location(copy, node)
+
+
+def _change(before: ast.AST, after: ast.AST) -> str:
+    return f"{_short(before)} -> {_short(after)}"
+
+
+def _short(node: ast.AST, limit: int = 60) -> str:
+    text = ast.unparse(node)
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def _is_docstring(node: ast.AST) -> bool:
+    """Bare string statements, which are docstrings or comments."""
+    return isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)
@@ -48,6 +48,25 @@ OUTPUT FORMAT:
 
 The tests are your specification. Write code that makes them pass."""
 
+    @staticmethod
+    def strengthen_tests(test_framework: str, language: str = "python") -> str:
+        """Get the system prompt for adding tests that catch surviving mutants."""
+        return f"""You are strengthening a passing test suite. Its tests still pass when small bugs are planted in the
+implementation, so they would not catch those bugs.
+
+CRITICAL RULES:
+1. Keep every existing test
+2. Add tests that FAIL for each planted bug listed, while PASSING for the current implementation
+3. Test behavior through the public interface, not the exact code that was changed
+4. Use the {test_framework} testing framework
+5. Do NOT change the implementation
+
+OUTPUT FORMAT:
+- Return ONLY the complete test file, existing and new tests together
+- Include necessary imports
+- Use proper {test_framework} conventions for {language}
+- Do NOT include explanations outside of code comments"""
+
     @staticmethod
     def refactor() -> str:
         """Get the system prompt for refactoring while keeping tests green."""
@@ -0,0 +1,115 @@
+"""Isolated per-job copies of the project to write and test generated code in."""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+# Only read by test runs, so linked into the workspace instead of copied
+SHARED_DIRS = frozenset({".git", ".hg", ".svn", "node_modules", ".venv", "venv", ".tox", ".nox"})
+# Caches and build output that each workspace produces for itself
+SKIPPED_DIRS = frozenset(
+    {"__pycache__", ".pytest_cache", ".mypy_cache", ".ruff_cache", ".proven", "target", "build", "dist"}
+)
+
+
+def scratch_root() -> Path:
+    """A RAM-backed directory for workspaces (/dev/shm on Linux), or the temp directory."""
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm
+    return Path(tempfile.gettempdir())
+
+
+class Workspace:
+    """A private copy of the project for one job.
+
+    Project files are copied into a scratch directory, by default in RAM;
+    dependency and VCS folders (node_modules, .venv, .git) are symlinked
+    rather than copied. Generated files are written and tested here, so
+    concurrent jobs can't overwrite each other's files, and only reach the
+    project when promoted.
+
+    With copied, only those files are copied and every other file is
+    symlinked, which makes a workspace in milliseconds for jobs that only
+    rewrite a known set of files.
+    """
+
+    def __init__(self, project_dir: Path, root: Optional[Path] = None, copied: Optional[list[Path]] = None):
+        self.project_dir = project_dir.resolve()
+        self._copied = None if copied is None else {str(self.project_dir / self._relative(path)) for path in copied}
+        self.root = Path(tempfile.mkdtemp(prefix="proven-job-", dir=root or scratch_root())).resolve()
+        try:
+            self._mirror(self.project_dir, self.root)
+        except BaseException:
+            self.close()
+            raise
+
+    def path(self, project_path: Path) -> Path:
+        """Map a project path (absolute, or relative to the project) to the same path in the workspace.
+
+        Raises:
+            ValueError: If the path is outside the project
+        """
+        return self.root / self._relative(project_path)
+
+    def promote(self, project_paths: list[Path]) -> None:
+        """Replace project files with their workspace versions.
+
+        Every file is first copied next to its destination, then renamed into
+        place, so each one is replaced atomically and nothing is replaced if
+        a copy fails.
+        """
+        staged: list[tuple[str, Path]] = []
+        try:
+            for project_path in project_paths:
+                target = self.project_dir / self._relative(project_path)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                fd, temp = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".proven", dir=target.parent)
+                os.close(fd)
+                staged.append((temp, target))
+                shutil.copy2(self.root / self._relative(project_path), temp)
+            for temp, target in staged:
+                os.replace(temp, target)
+        finally:
+            for temp, _ in staged:
+                if os.path.exists(temp):
+                    os.unlink(temp)
+
+    def close(self) -> None:
+        """Delete the workspace."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def __enter__(self) -> "Workspace":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _relative(self, project_path: Path) -> Path:
+        absolute = project_path if project_path.is_absolute() else self.project_dir / project_path
+        try:
+            return absolute.resolve().relative_to(self.project_dir)
+        except ValueError:
+            raise ValueError(f"{project_path} is outside the project {self.project_dir}") from None
+
+    def _mirror(self, source: Path, target: Path) -> None:
+        """Recreate the source directory under target, copying files (or linking them) and linking shared folders."""
+        with os.scandir(source) as entries:
+            for entry in entries:
+                destination = target / entry.name
+                if entry.path == str(self.root):
+                    continue  # The workspace itself, when its root is inside the project
+                if entry.is_symlink():
+                    os.symlink(os.readlink(entry.path), destination)
+                elif entry.is_dir():
+                    if entry.name in SHARED_DIRS:
+                        os.symlink(entry.path, destination, target_is_directory=True)
+                    elif entry.name not in SKIPPED_DIRS:
+                        destination.mkdir()
+                        self._mirror(Path(entry.path), destination)
+                elif self._copied is None or entry.path in self._copied:
+                    shutil.copy2(entry.path, destination)
+                else:
+                    os.symlink(entry.path, destination)
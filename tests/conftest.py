@@ -74,14 +74,23 @@ def mock_test_runner(temp_cwd: Path) -> MagicMock:
     runner = MagicMock()
     runner.name = "pytest"
     runner.working_dir = temp_cwd
+    runner.cache = None
+    runner.preflight = MagicMock(return_value=None)
+    runner.prove_red = MagicMock(return_value=None)
 
     # Default to failing first, then passing
-    runner.run = MagicMock(
+    runner.run_async = AsyncMock(
         side_effect=[
             TestResult(success=False, output="FAILED", passed=0, failed=1, errors=0),
             TestResult(success=True, output="PASSED", passed=1, failed=0, errors=0),
         ]
     )
+
+    # Reruns go through run_async, so tests only need to script its results
+    async def rerun_async(test_file: Path, previous: TestResult, **kwargs) -> TestResult:
+        return await runner.run_async(test_file, **kwargs)
+
+    runner.rerun_async = AsyncMock(side_effect=rerun_async)
     return runner
 
 
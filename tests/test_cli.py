@@ -6,8 +6,30 @@ from unittest.mock import MagicMock, patch
 import pytest
 from typer.testing import CliRunner
 
-from proven.config import APIKeys, Config
-from proven.main import app, get_provider, get_runner
+from proven.config import (
+    APIKeys,
+    CacheConfig,
+    Config,
+    EnvironmentsConfig,
+    JestConfig,
+    JUnitConfig,
+    LimitsConfig,
+    MatrixConfig,
+    MavenConfig,
+    MutationConfig,
+    PytestConfig,
+    UnittestConfig,
+    VitestConfig,
+    WorkspaceConfig,
+)
+from proven.main import (
+    app,
+    get_environment_pool,
+    get_language_for_framework,
+    get_mutation_tester,
+    get_provider,
+    get_runner,
+)
 
 runner = CliRunner()
 
@@ -167,6 +189,37 @@ class TestGetRunner:
 
         assert runner.name == "pytest"
 
+    def test_get_runner_pytest_worker(self):
+        """Test that the pytest worker option is passed to the runner."""
+        config = Config(test_framework="pytest", pytest=PytestConfig(worker=True))
+        runner = get_runner(config)
+
+        assert runner.use_worker is True
+
+    def test_get_runner_pytest_parallel(self):
+        """Test that the pytest-xdist options are passed to the runner."""
+        config = Config(test_framework="pytest", pytest=PytestConfig(parallel=True, tests_per_worker=4))
+        runner = get_runner(config)
+
+        assert runner.parallel is True
+        assert runner.tests_per_worker == 4
+
+    def test_get_runner_pytest_lean(self):
+        """Test that the lean profile options are passed to the runner."""
+        config = Config(test_framework="pytest", pytest=PytestConfig(lean=True, plugins=["xdist.plugin"]))
+        runner = get_runner(config)
+
+        assert runner.lean is True
+        assert runner.plugins == ["xdist.plugin"]
+
+    def test_get_runner_unittest(self):
+        """Test getting the unittest runner."""
+        config = Config(test_framework="unittest", unittest=UnittestConfig(in_process=False))
+        runner = get_runner(config)
+
+        assert runner.name == "unittest"
+        assert runner.in_process is False
+
     def test_get_runner_jest(self):
         """Test getting Jest runner."""
         config = Config(test_framework="jest")
@@ -174,12 +227,94 @@ class TestGetRunner:
 
         assert runner.name == "jest"
 
+    def test_get_runner_jest_worker(self):
+        """Test that the Jest worker option is passed to the runner."""
+        config = Config(test_framework="jest", jest=JestConfig(worker=True))
+        runner = get_runner(config)
+
+        assert runner.use_worker is True
+
+    def test_get_runner_limits(self):
+        """Test that the timeout and resource limits are passed to the runner."""
+        config = Config(test_framework="maven", limits=LimitsConfig(timeout=300, cpu_seconds=120, memory_mb=2048))
+        runner = get_runner(config)
+
+        assert runner.timeout == 300
+        assert runner.limits.cpu_seconds == 120
+        assert runner.limits.memory_mb == 2048
+
+    def test_get_runner_jest_fast(self):
+        """Test that the fast Jest profile options are passed to the runner."""
+        config = Config(test_framework="jest", jest=JestConfig(fast=True, cache_directory="/tmp/jest-cache"))
+        runner = get_runner(config)
+
+        assert runner.fast is True
+        assert runner.cache_directory == Path("/tmp/jest-cache")
+
     def test_get_runner_maven(self):
         """Test getting Maven runner."""
         config = Config(test_framework="maven")
         runner = get_runner(config)
 
         assert runner.name == "maven"
+        assert "checkstyle.skip" in runner.skip_properties
+
+    def test_get_runner_maven_fast(self):
+        """Test that the fast Maven profile options are passed to the runner."""
+        config = Config(test_framework="maven", maven=MavenConfig(fast=True, threads="4", skip_properties=[]))
+        runner = get_runner(config)
+
+        assert (runner.fast, runner.threads, runner.skip_properties) == (True, "4", [])
+
+    def test_get_runner_jest_transpiler(self):
+        """Test that the Jest transpiler is passed to the runner."""
+        runner = get_runner(Config(test_framework="jest", jest=JestConfig(transpiler="esbuild")))
+
+        assert runner.transpiler == "esbuild"
+
+    def test_language_for_typescript(self):
+        """Test that TypeScript output only applies to JavaScript frameworks."""
+        assert get_language_for_framework("jest", typescript=True) == "typescript"
+        assert get_language_for_framework("vitest") == "javascript"
+        assert get_language_for_framework("pytest", typescript=True) == "python"
+
+    def test_get_runner_vitest(self):
+        """Test getting the Vitest runner, with its sidecar on by default."""
+        assert get_runner(Config(test_framework="vitest")).use_worker is True
+        assert get_runner(Config(test_framework="vitest", vitest=VitestConfig(worker=False))).use_worker is False
+
+    def test_get_runner_junit(self):
+        """Test getting the Maven-free JUnit runner."""
+        config = Config(test_framework="junit")
+        runner = get_runner(config)
+
+        assert runner.name == "junit"
+
+    def test_get_runner_junit_compile_cache(self):
+        """Test that the JUnit compile cache folder is passed to the runner."""
+        config = Config(test_framework="junit", junit=JUnitConfig(compile_cache="~/javac-cache"))
+        runner = get_runner(config)
+
+        assert runner.compile_cache == Path.home() / "javac-cache"
+
+    def test_get_runner_uses_result_cache(self):
+        """Test that the result cache is attached unless disabled."""
+        cached = get_runner(Config(test_framework="pytest", cache=CacheConfig(max_size_mb=5)))
+        uncached = get_runner(Config(test_framework="pytest", cache=CacheConfig(enabled=False)))
+
+        assert cached.cache is not None
+        assert cached.cache.max_bytes == 5 * 1024 * 1024
+        assert uncached.cache is None
+
+    def test_get_runner_matrix(self):
+        """Test that configured runtimes wrap the runner in a matrix."""
+        config = Config(test_framework="jest", matrix=MatrixConfig(runtimes=["node18", "node20"]))
+        runner = get_runner(config)
+
+        assert runner.name == "jest"
+        assert list(runner.runners) == ["node18", "node20"]
+        assert [matrix_runner.runtime for matrix_runner in runner.runners.values()] == ["node18", "node20"]
+        assert runner.cache is runner.runners["node18"].cache
 
     def test_get_runner_invalid(self):
         """Test getting invalid runner raises error."""
@@ -189,6 +324,47 @@ class TestGetRunner:
             get_runner(config)
 
 
+class TestGetEnvironmentPool:
+    """Tests for the get_environment_pool helper function."""
+
+    def test_pool_needs_workspaces(self):
+        """Test that environments are only cloned into isolated workspaces."""
+        environments = EnvironmentsConfig(enabled=True)
+
+        assert get_environment_pool(Config(environments=environments)) is None
+        assert get_environment_pool(Config(workspace=WorkspaceConfig(enabled=True))) is None
+
+    def test_pool_settings(self):
+        """Test that the pool gets its folders and packages from the config."""
+        config = Config(
+            workspace=WorkspaceConfig(enabled=True),
+            environments=EnvironmentsConfig(
+                enabled=True, root="~/envs", wheelhouse="~/wheels", python_packages=["pytest", "hypothesis"]
+            ),
+        )
+        pool = get_environment_pool(config)
+
+        assert pool.root == Path.home() / "envs"
+        assert pool.wheelhouse == Path.home() / "wheels"
+        assert pool.npm_cache is None
+        assert pool.python_packages == ["pytest", "hypothesis"]
+
+
+class TestGetMutationTester:
+    """Tests for the get_mutation_tester helper function."""
+
+    def test_enabled_by_default(self):
+        """Test that mutation testing runs by default, with its workspaces next to the job workspaces."""
+        tester = get_mutation_tester(Config(workspace=WorkspaceConfig(root="~/scratch")))
+
+        assert (tester.workers, tester.budget, tester.max_mutants) == (None, 60.0, 50)
+        assert tester.workspace_root == Path.home() / "scratch"
+
+    def test_disabled(self):
+        """Test that mutation testing can be turned off."""
+        assert get_mutation_tester(Config(mutation=MutationConfig(enabled=False))) is None
+
+
 class TestGenerateCommand:
     """Tests for the generate command."""
 
@@ -242,6 +418,31 @@ class TestGenerateCommand:
         # Should have attempted to run
         mock_engine_class.assert_called_once()
 
+    @patch("proven.main.get_provider")
+    @patch("proven.main.get_runner")
+    @patch("proven.main.TDDEngine")
+    @patch("proven.main.load_config")
+    def test_generate_typescript(
+        self, mock_load_config, mock_engine_class, mock_get_runner, mock_get_provider, temp_home: Path, temp_cwd: Path
+    ):
+        """Test that typescript makes generate write .ts files and ask for TypeScript."""
+        mock_load_config.return_value = Config(
+            api_keys=APIKeys(anthropic="test-key"), test_framework="jest", typescript=True
+        )
+        calls = []
+
+        async def mock_run(**kwargs):
+            calls.append(kwargs)
+            return MagicMock()
+
+        mock_engine_class.return_value.run = mock_run
+
+        runner.invoke(app, ["generate", "Create an add function", "--yes"])
+
+        assert mock_engine_class.call_args.kwargs["language"] == "typescript"
+        assert calls[0]["test_file"] == Path("tests") / "create.test.ts"
+        assert calls[0]["source_file"] == Path("src") / "create.ts"
+
 
 class TestAPIKeyPrompt:
     """Tests for API key prompting."""
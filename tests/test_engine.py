@@ -1,13 +1,22 @@
 """Tests for the TDD engine."""
 
+import asyncio
+import os
+import sys
+import threading
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from proven.runners.base import TestResult
+from proven.runners.base import TestCaseResult, TestResult
+from proven.runners.cache import ResultCache
+from proven.runners.environments import EnvironmentBuildError, EnvironmentPool, JobEnvironment
+from proven.runners.pytest_runner import PytestRunner
 from proven.tdd.engine import TDDEngine, TDDPhase, TDDResult
+from proven.tdd.mutation import MutationTester, generate_mutants
 from proven.tdd.prompts import TDDPrompts
+from proven.tdd.workspace import Workspace
 
 
 class TestTDDPrompts:
@@ -193,7 +202,7 @@ class TestTDDEngine:
         )
 
         # Runner returns fail then pass
-        mock_test_runner.run = MagicMock(
+        mock_test_runner.run_async = AsyncMock(
             side_effect=[
                 TestResult(success=False, output="FAILED", failed=1),
                 TestResult(success=True, output="PASSED", passed=1),
@@ -226,7 +235,7 @@ class TestTDDEngine:
         )
 
         # Fail first implementation, then pass
-        mock_test_runner.run = MagicMock(
+        mock_test_runner.run_async = AsyncMock(
             side_effect=[
                 TestResult(success=False, output="RED", failed=1),  # Initial
                 TestResult(success=False, output="FAILED", failed=1),  # First impl
@@ -245,6 +254,563 @@ class TestTDDEngine:
         assert mock_llm_provider.generate.call_count == 3
         assert result.phase == TDDPhase.GREEN
 
+    @pytest.mark.asyncio
+    async def test_fix_prompt_uses_failing_cases(self, engine, mock_llm_provider, mock_test_runner, temp_cwd: Path):
+        """Test that fix prompts include only failing test cases when available."""
+        test_file = temp_cwd / "tests" / "test_example.py"
+        source_file = temp_cwd / "src" / "example.py"
+
+        mock_llm_provider.generate = AsyncMock(
+            side_effect=[
+                "```python\ndef test_example():\n    pass\n```",
+                "```python\ndef example():\n    pass\n```",
+                "```python\ndef example():\n    return 42\n```",
+            ]
+        )
+        cases = [
+            TestCaseResult(name="test_ok", outcome="passed"),
+            TestCaseResult(name="test_answer", outcome="failed", message="assert None == 42"),
+        ]
+        mock_test_runner.run_async = AsyncMock(
+            side_effect=[
+                TestResult(success=False, output="RED", failed=1),
+                TestResult.from_cases(False, "HUGE RAW OUTPUT", cases),
+                TestResult(success=True, output="PASSED", passed=2),
+            ]
+        )
+
+        await engine.run(
+            request="Create example",
+            test_file=test_file,
+            source_file=source_file,
+            on_approval=lambda phase, code: True,
+        )
+
+        fix_prompt = mock_llm_provider.generate.call_args_list[2][0][0]
+        assert "test_answer (failed):\nassert None == 42" in fix_prompt
+        assert "HUGE RAW OUTPUT" not in fix_prompt
+
+    @pytest.mark.asyncio
+    async def test_fix_iterations_rerun_failed_tests_first(
+        self, engine, mock_llm_provider, mock_test_runner, temp_cwd: Path
+    ):
+        """Test that fix iterations hand the previous result to rerun_async."""
+        mock_llm_provider.generate = AsyncMock(
+            side_effect=[
+                "```python\ndef test_example():\n    pass\n```",
+                "```python\ndef example():\n    pass\n```",
+                "```python\ndef example():\n    return 42\n```",
+            ]
+        )
+        first_attempt = TestResult(success=False, output="FAILED", failed=1)
+        mock_test_runner.run_async = AsyncMock(
+            side_effect=[
+                TestResult(success=False, output="RED", failed=1),
+                first_attempt,
+                TestResult(success=True, output="PASSED", passed=1),
+            ]
+        )
+
+        await engine.run(
+            request="Create example",
+            test_file=temp_cwd / "tests" / "test_example.py",
+            source_file=temp_cwd / "src" / "example.py",
+            on_approval=lambda phase, code: True,
+        )
+
+        mock_test_runner.rerun_async.assert_called_once()
+        assert mock_test_runner.rerun_async.call_args[0][1] is first_attempt
+
+    @pytest.mark.asyncio
+    async def test_preflight_failure_skips_test_run(self, engine, mock_llm_provider, mock_test_runner, temp_cwd):
+        """Test that code failing the preflight check goes to the fix prompt without a test run."""
+        mock_llm_provider.generate = AsyncMock(
+            side_effect=[
+                "```python\ndef test_example():\n    pass\n```",
+                "```python\ndef example(:\n    pass\n```",
+                "```python\ndef example():\n    return 42\n```",
+            ]
+        )
+        syntax_error = TestResult(success=False, output="SyntaxError: invalid syntax", errors=1)
+        mock_test_runner.preflight = MagicMock(side_effect=[None, syntax_error, None])
+        mock_test_runner.run_async = AsyncMock(
+            side_effect=[
+                TestResult(success=False, output="RED", failed=1),
+                TestResult(success=True, output="PASSED", passed=1),
+            ]
+        )
+
+        result = await engine.run(
+            request="Create example",
+            test_file=temp_cwd / "tests" / "test_example.py",
+            source_file=temp_cwd / "src" / "example.py",
+            on_approval=lambda phase, code: True,
+        )
+
+        assert mock_test_runner.run_async.call_count == 2
+        assert "SyntaxError: invalid syntax" in mock_llm_provider.generate.call_args_list[2][0][0]
+        assert result.phase == TDDPhase.GREEN
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("force_red_run", [False, True])
+    async def test_red_run_skipped_when_failure_is_proven(
+        self, engine, mock_llm_provider, mock_test_runner, temp_cwd, force_red_run
+    ):
+        """Test that a statically proven RED skips the test run unless forced."""
+        mock_llm_provider.generate = AsyncMock(
+            side_effect=[
+                "```python\ndef test_example():\n    pass\n```",
+                "```python\ndef example():\n    pass\n```",
+            ]
+        )
+        mock_test_runner.prove_red = MagicMock(
+            return_value=TestResult(success=False, output="Tests import example", errors=1)
+        )
+        results = [TestResult(success=True, output="PASSED", passed=1)]
+        if force_red_run:
+            results.insert(0, TestResult(success=False, output="RED", failed=1))
+        mock_test_runner.run_async = AsyncMock(side_effect=results)
+
+        result = await engine.run(
+            request="Create example",
+            test_file=temp_cwd / "tests" / "test_example.py",
+            source_file=temp_cwd / "src" / "example.py",
+            on_approval=lambda phase, code: True,
+            force_red_run=force_red_run,
+        )
+
+        assert mock_test_runner.run_async.call_count == (2 if force_red_run else 1)
+        assert result.phase == TDDPhase.GREEN
+
+    @pytest.mark.asyncio
+    async def test_red_phase_stops_at_first_failure(self, engine, mock_llm_provider, mock_test_runner, temp_cwd):
+        """Test that the RED run asks the runner to stop once a test fails."""
+        mock_llm_provider.generate = AsyncMock(
+            side_effect=[
+                "```python\ndef test_example():\n    pass\n```",
+                "```python\ndef example():\n    pass\n```",
+            ]
+        )
+
+        await engine.run(
+            request="Create example",
+            test_file=temp_cwd / "tests" / "test_example.py",
+            source_file=temp_cwd / "src" / "example.py",
+            on_approval=lambda phase, code: True,
+        )
+
+        red_callback = mock_test_runner.run_async.call_args_list[0].kwargs["on_event"]
+        green_callback = mock_test_runner.run_async.call_args_list[1].kwargs["on_event"]
+        assert red_callback(TestCaseResult(name="test_a", outcome="passed")) is False
+        assert red_callback(TestCaseResult(name="test_b", outcome="failed")) is True
+        assert green_callback(TestCaseResult(name="test_b", outcome="failed")) is False
+
+
+def _provider(value: int) -> MagicMock:
+    """A provider whose tests and implementation agree on value()."""
+    provider = MagicMock()
+    provider.generate = AsyncMock(
+        side_effect=[
+            f"```python\nfrom example import value\n\ndef test_value():\n    assert value() == {value}\n```",
+            f"```python\ndef value():\n    return {value}\n```",
+        ]
+    )
+    return provider
+
+
+class TestIsolatedWorkspaces:
+    """Tests for running workflows in isolated workspaces."""
+
+    @pytest.fixture
+    def project(self, temp_cwd: Path) -> Path:
+        """A small Python project with a dependency folder and caches."""
+        (temp_cwd / "pytest.ini").write_text("[pytest]\npythonpath = src\n")
+        (temp_cwd / "src").mkdir()
+        (temp_cwd / "src" / "helpers.py").write_text("HELP = 1\n")
+        (temp_cwd / "node_modules" / "left-pad").mkdir(parents=True)
+        (temp_cwd / "src" / "__pycache__").mkdir()
+        return temp_cwd
+
+    def test_workspace_mirrors_project(self, project: Path, temp_dir: Path):
+        """Test that files are copied, dependency folders linked and caches left out."""
+        with Workspace(project, root=temp_dir) as workspace:
+            copy = workspace.path(Path("src/helpers.py"))
+            copy.write_text("HELP = 2\n")
+
+            assert copy.parent.parent == workspace.root
+            assert (project / "src" / "helpers.py").read_text() == "HELP = 1\n"
+            assert (workspace.root / "node_modules").is_symlink()
+            assert not (workspace.root / "src" / "__pycache__").exists()
+            with pytest.raises(ValueError, match="outside the project"):
+                workspace.path(temp_dir / "elsewhere.py")
+
+        assert not workspace.root.exists()
+
+    def test_workspace_copies_only_given_files(self, project: Path, temp_dir: Path):
+        """Test that a workspace with copied files links every other file to the project."""
+        (project / "src" / "main.py").write_text("MAIN = 1\n")
+
+        with Workspace(project, root=temp_dir, copied=[Path("src/main.py")]) as workspace:
+            assert not workspace.path(Path("src/main.py")).is_symlink()
+            assert workspace.path(Path("src/helpers.py")).is_symlink()
+            assert workspace.path(Path("src/helpers.py")).read_text() == "HELP = 1\n"
+
+    def test_promote_replaces_files(self, project: Path, temp_dir: Path):
+        """Test that promoted files land in the project and leave no temporary files behind."""
+        with Workspace(project, root=temp_dir) as workspace:
+            workspace.path(Path("src/helpers.py")).write_text("HELP = 2\n")
+            workspace.path(Path("tests")).mkdir()
+            workspace.path(Path("tests/test_helpers.py")).write_text("def test_help(): pass\n")
+
+            workspace.promote([Path("src/helpers.py"), project / "tests" / "test_helpers.py"])
+
+        assert (project / "src" / "helpers.py").read_text() == "HELP = 2\n"
+        assert (project / "tests" / "test_helpers.py").exists()
+        assert sorted(os.listdir(project / "src")) == ["__pycache__", "helpers.py"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_workflows_are_isolated(self, project: Path, temp_dir: Path):
+        """Test that two workflows writing the same files each test their own code."""
+        runner = PytestRunner(working_dir=project)
+        engines = [
+            TDDEngine(
+                provider=_provider(value), runner=runner, console=MagicMock(), isolate=True, workspace_root=temp_dir
+            )
+            for value in (1, 2)
+        ]
+
+        results = await asyncio.gather(
+            *(
+                engine.run(
+                    request="Return a value",
+                    test_file=Path("tests/test_example.py"),
+                    source_file=Path("src/example.py"),
+                    force_red_run=True,
+                )
+                for engine in engines
+            )
+        )
+
+        assert [result.phase for result in results] == [TDDPhase.GREEN, TDDPhase.GREEN]
+        assert results[0].source_file == Path("src/example.py")
+        # Whichever job was promoted last, its tests and implementation arrive together
+        value = (project / "src" / "example.py").read_text().split("return ")[1].strip()
+        assert f"value() == {value}" in (project / "tests" / "test_example.py").read_text()
+        assert os.listdir(temp_dir) == ["project"]  # Workspaces are deleted
+
+    @pytest.mark.asyncio
+    async def test_workspace_file_io_runs_off_the_event_loop(self, project: Path, temp_dir: Path):
+        """Test that the workspace is copied, promoted and deleted in worker threads."""
+        engine = TDDEngine(
+            provider=_provider(1), runner=PytestRunner(working_dir=project), console=MagicMock(), isolate=True,
+            workspace_root=temp_dir,
+        )  # fmt: skip
+        loop_thread = threading.get_ident()
+        threads: list[int] = []
+
+        def record(method):
+            def wrapper(*args, **kwargs):
+                threads.append(threading.get_ident())
+                return method(*args, **kwargs)
+
+            return wrapper
+
+        with patch.object(Workspace, "__init__", record(Workspace.__init__)):
+            with patch.object(Workspace, "promote", record(Workspace.promote)):
+                with patch.object(Workspace, "close", record(Workspace.close)):
+                    result = await engine.run(
+                        request="Return a value",
+                        test_file=Path("tests/test_example.py"),
+                        source_file=Path("src/example.py"),
+                        force_red_run=True,
+                    )
+
+        assert result.phase == TDDPhase.GREEN
+        assert len(threads) == 3 and loop_thread not in threads
+
+    @pytest.mark.asyncio
+    async def test_failing_workflow_leaves_project_unchanged(self, project: Path, temp_dir: Path):
+        """Test that files are only promoted once the tests pass."""
+        provider = _provider(1)
+        provider.generate.side_effect = [
+            "```python\nfrom example import value\n\ndef test_value():\n    assert value() == 1\n```",
+            "```python\ndef value():\n    return 0\n```",
+        ]
+        engine = TDDEngine(
+            provider=provider,
+            runner=PytestRunner(working_dir=project),
+            console=MagicMock(),
+            isolate=True,
+            workspace_root=temp_dir,
+        )
+
+        result = await engine.run(
+            request="Return a value",
+            test_file=project / "tests" / "test_example.py",
+            source_file=project / "src" / "example.py",
+            max_iterations=0,
+        )
+
+        assert result.phase == TDDPhase.RED
+        assert not (project / "tests").exists()
+        assert not (project / "src" / "example.py").exists()
+
+    @pytest.mark.asyncio
+    async def test_workspace_gets_cloned_environment(self, project: Path, temp_dir: Path):
+        """Test that tests run with the environment provisioned into the workspace."""
+        pool = MagicMock(spec=EnvironmentPool)
+
+        def provision(project_dir: Path, working_dir: Path, language: str) -> JobEnvironment:
+            (working_dir / "node_modules").unlink()
+            (working_dir / ".venv" / "bin").mkdir(parents=True)
+            os.symlink(sys.executable, working_dir / ".venv" / "bin" / "python")
+            return JobEnvironment(pool, "python", working_dir / ".venv", working_dir)
+
+        pool.provision.side_effect = provision
+        pool.wheelhouse = None
+        engine = TDDEngine(
+            provider=_provider(1),
+            runner=PytestRunner(working_dir=project),
+            console=MagicMock(),
+            isolate=True,
+            workspace_root=temp_dir,
+            environments=pool,
+        )
+
+        result = await engine.run(
+            request="Return a value",
+            test_file=Path("tests/test_example.py"),
+            source_file=Path("src/example.py"),
+            force_red_run=True,
+        )
+
+        assert result.phase == TDDPhase.GREEN
+        project_dir, working_dir, language = pool.provision.call_args.args
+        assert (project_dir, language) == (project.resolve(), "python")
+        assert working_dir.parent == temp_dir.resolve()
+        assert not (project / ".venv").exists()
+
+    @pytest.mark.asyncio
+    async def test_environment_build_failure_uses_project_dependencies(self, project: Path, temp_dir: Path):
+        """Test that a template that can't be built doesn't stop the workflow."""
+        pool = MagicMock(spec=EnvironmentPool)
+        pool.provision.side_effect = EnvironmentBuildError("npm ci failed")
+        console = MagicMock()
+        engine = TDDEngine(
+            provider=_provider(1),
+            runner=PytestRunner(working_dir=project),
+            console=console,
+            isolate=True,
+            workspace_root=temp_dir,
+            environments=pool,
+        )
+
+        result = await engine.run(
+            request="Return a value", test_file=Path("tests/test_example.py"), source_file=Path("src/example.py")
+        )
+
+        assert result.phase == TDDPhase.GREEN
+        assert any("npm ci failed" in str(call) for call in console.print.call_args_list)
+
+
+class TestStabilityCheck:
+    """Tests for rerunning GREEN suites in shuffled order."""
+
+    @staticmethod
+    def _engine(test_code: str, runs: int = 3) -> TDDEngine:
+        provider = MagicMock()
+        provider.generate = AsyncMock(
+            side_effect=[f"```python\n{test_code}```", "```python\ndef value():\n    return 1\n```"]
+        )
+        return TDDEngine(provider=provider, runner=PytestRunner(), console=MagicMock(), stability_runs=runs)
+
+    @pytest.mark.asyncio
+    async def test_flaky_test_turns_red(self, temp_cwd: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test that a test which only passes without a hash seed is reported flaky and fails the run."""
+        monkeypatch.delenv("PYTHONHASHSEED", raising=False)
+        engine = self._engine(
+            "import os\nfrom example import value\n\n"
+            "def test_value():\n    assert value() == 1\n\n"
+            "def test_unseeded():\n    assert 'PYTHONHASHSEED' not in os.environ\n"
+        )
+
+        result = await engine.run(
+            request="Return a value",
+            test_file=Path("test_example.py"),
+            source_file=Path("example.py"),
+            max_iterations=0,
+        )
+
+        assert result.phase == TDDPhase.RED
+        rates = {name.split("::")[-1]: rate for name, rate in result.final_test_result.flake_rates.items()}
+        assert rates == {"test_value": 0.0, "test_unseeded": 1.0}
+        assert [case.message.splitlines()[0] for case in result.final_test_result.failures] == [
+            "Flaky: failed 3 of 3 reruns in shuffled order"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_tests_with_the_same_name_are_told_apart(self, temp_cwd: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test that only the flaky one of two same-named tests in different classes is reported."""
+        monkeypatch.delenv("PYTHONHASHSEED", raising=False)
+        engine = self._engine(
+            "import os\nfrom example import value\n\n"
+            "class TestStable:\n    def test_value(self):\n        assert value() == 1\n\n"
+            "class TestFlaky:\n    def test_value(self):\n        assert 'PYTHONHASHSEED' not in os.environ\n",
+            runs=2,
+        )
+
+        result = await engine.run(
+            request="Return a value",
+            test_file=Path("test_example.py"),
+            source_file=Path("example.py"),
+            max_iterations=0,
+        )
+
+        assert result.final_test_result.flake_rates == {
+            "test_example.TestStable::test_value": 0.0,
+            "test_example.TestFlaky::test_value": 1.0,
+        }
+        assert [case.classname for case in result.final_test_result.failures] == ["test_example.TestFlaky"]
+
+    @pytest.mark.asyncio
+    async def test_stable_suite_stays_green(self, temp_cwd: Path):
+        """Test that a suite passing every rerun is GREEN with zero flake rates."""
+        engine = self._engine("from example import value\n\ndef test_value():\n    assert value() == 1\n", runs=2)
+
+        result = await engine.run(
+            request="Return a value", test_file=Path("test_example.py"), source_file=Path("example.py")
+        )
+
+        assert result.phase == TDDPhase.GREEN
+        assert list(result.final_test_result.flake_rates.values()) == [0.0]
+
+
+MUTATION_SOURCE = '''"""Sign helpers."""
+
+
+def sign(x: int) -> int:
+    """The sign of x."""
+    if x < 0:
+        return -1
+    return 1 if x > 0 else 0
+
+
+if __name__ == "__main__":
+    print(sign(-5))
+'''
+# Passes, but only checks negative numbers
+WEAK_TESTS = "from sign import sign\n\ndef test_negative():\n    assert sign(-5) == -1\n"
+STRONG_TESTS = (
+    WEAK_TESTS + "\ndef test_positive():\n    assert sign(1) == 1\n\ndef test_zero():\n    assert sign(0) == 0\n"
+)
+
+
+class TestMutationTesting:
+    """Tests for running GREEN suites against mutants of the implementation."""
+
+    @pytest.fixture
+    def project(self, temp_cwd: Path) -> Path:
+        (temp_cwd / "sign.py").write_text(MUTATION_SOURCE)
+        (temp_cwd / "test_sign.py").write_text(WEAK_TESTS)
+        (temp_cwd / "conftest.py").write_text("import pytest\n")
+        return temp_cwd
+
+    def test_generate_mutants(self):
+        """Test operator, constant and branch mutants, skipping docstrings, type hints and the main guard."""
+        mutants = generate_mutants(MUTATION_SOURCE)
+        descriptions = [mutant.description for mutant in mutants]
+
+        assert "x < 0 -> x <= 0" in descriptions
+        assert "removed the `if x < 0` branch" in descriptions
+        assert "-1 -> 1" in descriptions
+        assert "0 -> 1" in descriptions
+        assert {mutant.line for mutant in mutants} == {6, 7, 8}
+        assert all(mutant.code != MUTATION_SOURCE for mutant in mutants)
+        assert len(generate_mutants(MUTATION_SOURCE, max_mutants=3)) == 3
+        assert generate_mutants("def broken(:\n") == []
+
+    @pytest.mark.asyncio
+    async def test_weak_tests_leave_survivors(self, project: Path, temp_dir: Path):
+        """Test that mutants only on untested paths survive, and verdicts are reused from the cache."""
+        runner = PytestRunner(working_dir=project, lean=True)
+        runner.cache = ResultCache(directory=temp_dir / "cache")
+        tester = MutationTester(workers=4, workspace_root=temp_dir)
+        baseline = await runner.run_async(Path("test_sign.py"))
+
+        report = await tester.run(runner, Path("test_sign.py"), Path("sign.py"), baseline)
+
+        assert report.total == len(generate_mutants(MUTATION_SOURCE, max_mutants=50))
+        assert "removed the `if x < 0` branch" in [mutant.description for mutant in report.killed]
+        assert "x > 0 -> x >= 0" in [mutant.description for mutant in report.survived]
+        assert 0 < report.score < 1 and not report.not_run
+        assert sorted(os.listdir(temp_dir)) == ["cache", "project"]  # Worker workspaces are deleted
+
+        hits = runner.cache.hits
+        again = await tester.run(runner, Path("test_sign.py"), Path("sign.py"), baseline)
+
+        assert runner.cache.hits - hits == report.total
+        assert again.summary() == report.summary()
+
+    @pytest.mark.asyncio
+    async def test_budget_leaves_mutants_untested(self, project: Path, temp_dir: Path):
+        """Test that mutants left when the budget runs out are not run and don't count in the score."""
+        runner = PytestRunner(working_dir=project, lean=True)
+        tester = MutationTester(budget=0, workspace_root=temp_dir)
+
+        report = await tester.run(runner, Path("test_sign.py"), Path("sign.py"), TestResult(success=True, output=""))
+
+        assert len(report.not_run) == report.total > 0
+        assert report.score is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "stronger, kept", [(STRONG_TESTS, True), (WEAK_TESTS + "\ndef test_x():\n    assert 0\n", False)]
+    )
+    async def test_survivors_feed_stronger_tests(self, temp_cwd: Path, temp_dir: Path, stronger: str, kept: bool):
+        """Test that surviving mutants are sent back for stronger tests, which are kept only if they pass."""
+        provider = MagicMock()
+        provider.generate = AsyncMock(
+            side_effect=[f"```python\n{WEAK_TESTS}```", f"```python\n{MUTATION_SOURCE}```", f"```python\n{stronger}```"]
+        )
+        engine = TDDEngine(
+            provider=provider,
+            runner=PytestRunner(lean=True),
+            console=MagicMock(),
+            mutation=MutationTester(workspace_root=temp_dir),
+            mutation_feedback=True,
+        )
+
+        result = await engine.run(
+            request="Sign of a number", test_file=Path("test_sign.py"), source_file=Path("sign.py")
+        )
+
+        feedback = provider.generate.call_args_list[2].args[0]
+        assert "line 8: x > 0 -> x >= 0" in feedback
+        assert result.phase == TDDPhase.GREEN
+        assert (result.test_code == stronger.strip()) is kept
+        assert (temp_cwd / "test_sign.py").read_text().strip() == result.test_code
+        assert (result.mutation.score == 1.0) is kept
+
+    @pytest.mark.asyncio
+    async def test_survivors_are_only_reported_by_default(self, temp_cwd: Path, temp_dir: Path):
+        """Test that without mutation_feedback the score is reported and the tests are left alone."""
+        provider = MagicMock()
+        provider.generate = AsyncMock(side_effect=[f"```python\n{WEAK_TESTS}```", f"```python\n{MUTATION_SOURCE}```"])
+        engine = TDDEngine(
+            provider=provider,
+            runner=PytestRunner(lean=True),
+            console=MagicMock(),
+            mutation=MutationTester(workspace_root=temp_dir),
+        )
+
+        result = await engine.run(
+            request="Sign of a number", test_file=Path("test_sign.py"), source_file=Path("sign.py")
+        )
+
+        assert provider.generate.call_count == 2
+        assert result.phase == TDDPhase.GREEN
+        assert result.mutation.survived and result.test_code == WEAK_TESTS.strip()
+
 
 class TestTDDResult:
     """Tests for the TDDResult dataclass."""
@@ -1,12 +1,58 @@
 """Tests for test runners."""
 
+import asyncio
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
 from pathlib import Path
+from typing import Optional
 from unittest.mock import patch
 
-from proven.runners.base import TestResult
-from proven.runners.jest_runner import JestRunner
+import pytest
+
+from proven.config import DEFAULT_SKIP_PROPERTIES
+from proven.runners.base import CommandResult, TestCaseResult, TestResult, runtime_shims
+from proven.runners.cache import ResultCache
+from proven.runners.environments import EnvironmentBuildError, EnvironmentPool, JobEnvironment, clone_tree
+from proven.runners.imports import missing_java_class, missing_js_import, missing_python_import
+from proven.runners.jest_runner import TRANSFORM_SCRIPT, JestRunner
+from proven.runners.jest_runner import WORKER_SCRIPT as JEST_WORKER_SCRIPT
+from proven.runners.junit_runner import JUnitRunner, java_interface
+from proven.runners.limits import ResourceLimits
+from proven.runners.matrix import MatrixRunner, combine_results
 from proven.runners.maven_runner import MavenRunner
-from proven.runners.pytest_runner import PytestRunner
+from proven.runners.output import OutputSpool, collect_logs
+from proven.runners.pytest_runner import PytestRunner, count_tests
+from proven.runners.pytest_worker_server import read_head_and_tail
+from proven.runners.reports import parse_jest_json, parse_junit_xml
+from proven.runners.unittest_runner import UnittestRunner
+from proven.runners.vitest_runner import WORKER_SCRIPT as VITEST_WORKER_SCRIPT
+from proven.runners.vitest_runner import VitestRunner
+from proven.runners.worker import WorkerError, WorkerProcess, WorkerTimeout
+
+ECHO_WORKER = """
+import json, sys, time
+print(json.dumps({"ready": True}), flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    time.sleep(request.get("sleep", 0))
+    print(json.dumps({"exit_code": 0, "output": request["echo"]}), flush=True)
+"""
+
+
+def _is_running(pid: int) -> bool:
+    """Check if a process exists and isn't a zombie waiting to be reaped."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    stat = Path(f"/proc/{pid}/stat")
+    return not (stat.exists() and stat.read_text().rsplit(")", 1)[1].split()[0] == "Z")
 
 
 class TestTestResult:
@@ -40,6 +86,76 @@ class TestTestResult:
         assert passing.is_green and not passing.is_red
         assert failing.is_red and not failing.is_green
 
+    def test_from_cases_counts_outcomes(self):
+        """Test that counts are derived from per-test-case results."""
+        cases = [
+            TestCaseResult(name="a", outcome="passed"),
+            TestCaseResult(name="b", outcome="failed", message="assert 1 == 2"),
+            TestCaseResult(name="c", outcome="error"),
+            TestCaseResult(name="d", outcome="skipped"),
+        ]
+
+        result = TestResult.from_cases(False, "output", cases)
+
+        assert (result.passed, result.failed, result.errors) == (1, 1, 1)
+        assert [case.name for case in result.failures] == ["b", "c"]
+
+
+class TestReports:
+    """Tests for machine-readable report parsing."""
+
+    def test_parse_junit_xml(self, temp_dir: Path):
+        """Test parsing a JUnit XML report into test cases."""
+        report = temp_dir / "junit.xml"
+        report.write_text(
+            '<testsuites><testsuite name="pytest" tests="4">'
+            '<testcase classname="tests.test_calc.TestAdd" name="test_ok" file="tests/test_calc.py" time="0.01"/>'
+            '<testcase classname="tests.test_calc.TestAdd" name="test_bad" file="tests/test_calc.py" time="0.02">'
+            '<failure message="assert 3 == 4">E   assert 3 == 4</failure></testcase>'
+            '<testcase classname="tests.test_calc" name="test_err" file="tests/test_calc.py">'
+            '<error message="ImportError">boom</error></testcase>'
+            '<testcase classname="tests.test_calc" name="test_skip"><skipped message="later"/></testcase>'
+            "</testsuite></testsuites>"
+        )
+
+        cases = parse_junit_xml(report)
+
+        assert [case.outcome for case in cases] == ["passed", "failed", "error", "skipped"]
+        assert cases[1].message == "E   assert 3 == 4"
+        assert cases[1].duration == 0.02
+        assert cases[3].message == "later"
+        assert PytestRunner.node_id(cases[1]) == "tests/test_calc.py::TestAdd::test_bad"
+        assert PytestRunner.node_id(cases[2]) == "tests/test_calc.py::test_err"
+
+    def test_parse_jest_json(self, temp_dir: Path):
+        """Test parsing a Jest --json report into test cases."""
+        report = temp_dir / "jest.json"
+        report.write_text(
+            json.dumps(
+                {
+                    "testResults": [
+                        {
+                            "name": "/repo/calc.test.js",
+                            "status": "failed",
+                            "assertionResults": [
+                                {"fullName": "add works", "status": "passed", "duration": 5},
+                                {"fullName": "add fails", "status": "failed", "failureMessages": ["Expected 4"]},
+                                {"fullName": "add later", "status": "todo"},
+                            ],
+                        },
+                        {"name": "/repo/broken.test.js", "status": "failed", "message": "SyntaxError"},
+                    ]
+                }
+            )
+        )
+
+        cases = parse_jest_json(report)
+
+        assert [case.outcome for case in cases] == ["passed", "failed", "skipped", "error"]
+        assert cases[0].duration == 0.005
+        assert cases[1].message == "Expected 4"
+        assert cases[3].name == "/repo/broken.test.js"
+
 
 class TestPytestRunner:
     """Tests for the pytest runner."""
@@ -66,7 +182,7 @@ class TestPytestRunner:
         runner = PytestRunner(working_dir=temp_cwd)
 
         with patch.object(runner, "_run_command") as mock_run:
-            mock_run.return_value = (0, "5 passed in 0.1s")
+            mock_run.return_value = CommandResult(0, "5 passed in 0.1s")
 
             result = runner.run(temp_cwd / "test_example.py")
 
@@ -78,7 +194,7 @@ class TestPytestRunner:
         runner = PytestRunner(working_dir=temp_cwd)
 
         with patch.object(runner, "_run_command") as mock_run:
-            mock_run.return_value = (1, "2 failed, 3 passed in 0.2s")
+            mock_run.return_value = CommandResult(1, "2 failed, 3 passed in 0.2s")
 
             result = runner.run(temp_cwd / "test_example.py")
 
@@ -91,12 +207,503 @@ class TestPytestRunner:
         runner = PytestRunner(working_dir=temp_cwd)
 
         with patch.object(runner, "_run_command") as mock_run:
-            mock_run.return_value = (1, "1 error in 0.1s")
+            mock_run.return_value = CommandResult(1, "1 error in 0.1s")
 
             result = runner.run(temp_cwd / "test_example.py")
 
             assert result.errors == 1
 
+    def test_run_uses_worker_when_enabled(self, temp_cwd: Path):
+        """Test that worker mode runs pytest through the worker."""
+        runner = PytestRunner(working_dir=temp_cwd, use_worker=True)
+
+        with patch.object(runner, "_run_in_worker", return_value=CommandResult(0, "3 passed in 0.1s")) as mock_worker:
+            with patch.object(runner, "_run_command") as mock_run:
+                result = runner.run(temp_cwd / "test_example.py")
+
+        mock_worker.assert_called_once()
+        mock_run.assert_not_called()
+        assert result.passed == 3
+
+    def test_run_reads_junit_report(self, temp_cwd: Path):
+        """Test that per-test cases come from the JUnit XML report."""
+        runner = PytestRunner(working_dir=temp_cwd)
+
+        def fake_pytest(command, on_line=None):
+            report = next(arg for arg in command if arg.startswith("--junitxml="))
+            Path(report.split("=", 1)[1]).write_text(
+                '<testsuite><testcase classname="test_example" name="test_a" file="test_example.py"/>'
+                '<testcase classname="test_example" name="test_b" file="test_example.py">'
+                '<failure message="nope"/></testcase></testsuite>'
+            )
+            return CommandResult(1, "noisy output mentioning 99 passed")
+
+        with patch.object(runner, "_run_command", side_effect=fake_pytest):
+            result = runner.run(temp_cwd / "test_example.py")
+
+        assert (result.passed, result.failed) == (1, 1)
+        assert [case.name for case in result.failures] == ["test_b"]
+
+    def test_run_falls_back_when_worker_dies(self, temp_cwd: Path):
+        """Test that a dead worker falls back to the subprocess path."""
+        runner = PytestRunner(working_dir=temp_cwd, use_worker=True)
+
+        with (
+            patch.object(WorkerProcess, "start"),
+            patch.object(WorkerProcess, "request", side_effect=WorkerError("died")),
+        ):
+            with patch.object(runner, "_run_command", return_value=CommandResult(1, "1 failed in 0.1s")) as mock_run:
+                result = runner.run(temp_cwd / "test_example.py")
+
+        mock_run.assert_called_once()
+        assert result.failed == 1
+        assert runner.use_worker is True
+
+    def test_run_disables_worker_that_cannot_start(self, temp_cwd: Path):
+        """Test that worker mode is turned off when the worker fails to start."""
+        runner = PytestRunner(working_dir=temp_cwd, use_worker=True)
+
+        with patch.object(WorkerProcess, "start", side_effect=WorkerError("no python")):
+            with patch.object(runner, "_run_command", return_value=CommandResult(0, "1 passed in 0.1s")) as mock_run:
+                runner.run(temp_cwd / "test_example.py")
+
+        mock_run.assert_called_once()
+        assert runner.use_worker is False
+
+    def test_parse_progress(self):
+        """Test parsing verbose per-test lines."""
+        runner = PytestRunner()
+
+        passed = runner.parse_progress("tests/test_a.py::TestX::test_y[a b] PASSED          [ 50%]")
+        failed = runner.parse_progress("tests/test_a.py::test_z FAILED                   [100%]")
+
+        assert (passed.name, passed.outcome) == ("tests/test_a.py::TestX::test_y[a b]", "passed")
+        assert (failed.name, failed.outcome) == ("tests/test_a.py::test_z", "failed")
+        assert runner.parse_progress("collected 2 items") is None
+        assert runner.parse_progress("FAILED tests/test_a.py::test_z - assert 1 == 2") is None
+
+    def test_parse_progress_xdist(self):
+        """Test parsing the per-test lines pytest-xdist workers report."""
+        runner = PytestRunner()
+
+        case = runner.parse_progress("[gw1] [ 57%] FAILED tests/test_a.py::test_z[3] ")
+
+        assert (case.name, case.outcome) == ("tests/test_a.py::test_z[3]", "failed")
+        assert runner.parse_progress("tests/test_a.py::test_z[3] ") is None
+
+    def test_count_tests(self, temp_dir: Path):
+        """Test estimating the number of tests, including literal parametrize values."""
+        test_file = temp_dir / "test_sample.py"
+        test_file.write_text(
+            "import pytest\n\n"
+            "@pytest.mark.parametrize('a', [1, 2, 3])\n"
+            "@pytest.mark.parametrize('b', (1, 2))\n"
+            "def test_grid(a, b):\n    pass\n\n"
+            "@pytest.mark.parametrize('c', range(100))\n"
+            "def test_dynamic(c):\n    pass\n\n"
+            "class TestGroup:\n    def test_one(self):\n        pass\n\n    def helper(self):\n        pass\n\n"
+            "def helper():\n    pass\n"
+        )
+
+        assert count_tests(test_file) == 6 + 1 + 1
+        assert count_tests(temp_dir / "missing.py") == 0
+
+    @pytest.mark.parametrize(("tests", "cores", "expected"), [(40, 4, "4"), (40, 2, "2"), (20, 8, "2"), (10, 8, None)])
+    def test_build_command_parallel(self, temp_dir: Path, tests: int, cores: int, expected: Optional[str]):
+        """Test that the xdist worker count follows cores and suite size, staying serial for small suites."""
+        test_file = temp_dir / "test_sample.py"
+        test_file.write_text(
+            f"import pytest\n\n@pytest.mark.parametrize('v', {list(range(tests))})\ndef test_v(v):\n    pass\n"
+        )
+        runner = PytestRunner(working_dir=temp_dir, parallel=True, tests_per_worker=8)
+
+        with patch("proven.runners.pytest_runner.available_cores", return_value=cores):
+            with patch.object(runner, "_xdist_installed", return_value=True):
+                command = runner._build_command(test_file, temp_dir)
+
+        if expected is None:
+            assert "-n" not in command
+        else:
+            assert command[command.index("-n") + 1] == expected
+
+    def test_build_command_parallel_needs_xdist(self, temp_dir: Path):
+        """Test that runs stay serial when pytest-xdist isn't installed."""
+        runner = PytestRunner(working_dir=temp_dir, parallel=True, tests_per_worker=1)
+        selectors = [f"test_sample.py::test_{i}" for i in range(20)]
+
+        with patch.object(runner, "_xdist_installed", return_value=False):
+            command = runner._build_command(temp_dir / "test_sample.py", temp_dir, selectors)
+
+        assert "-n" not in command
+
+    def test_build_command_lean(self, temp_dir: Path):
+        """Test the lean profile: allow-listed plugins, importlib imports and a per-run cache dir."""
+        runner = PytestRunner(working_dir=temp_dir, lean=True, plugins=["pytest_asyncio.plugin"])
+
+        command = runner._build_command(temp_dir / "test_sample.py", temp_dir / "report")
+
+        assert command[command.index("-p") + 1] == "pytest_asyncio.plugin"
+        assert "--import-mode=importlib" in command
+        assert f"cache_dir={temp_dir / 'report' / 'pytest_cache'}" in command
+        assert runner._command_env() == {"PYTEST_DISABLE_PLUGIN_AUTOLOAD": "1"}
+        assert PytestRunner()._command_env() == {}
+
+    def test_build_command_lean_loads_xdist_when_parallel(self, temp_dir: Path):
+        """Test that a parallel lean run loads pytest-xdist even if it isn't allow-listed."""
+        runner = PytestRunner(working_dir=temp_dir, parallel=True, tests_per_worker=1, lean=True)
+
+        with patch("proven.runners.pytest_runner.available_cores", return_value=2):
+            with patch.object(runner, "_xdist_installed", return_value=True):
+                command = runner._build_command(temp_dir / "test_sample.py", temp_dir, ["a::b", "a::c"])
+
+        assert command[command.index("-p") + 1] == "xdist.plugin"
+        assert command[command.index("-n") + 1] == "2"
+
+    def test_seeded_run_shuffles_and_sets_hash_seed(self, temp_cwd: Path):
+        """Test a seeded run loads pytest-randomly when it's installed and always fixes the hash seed."""
+        (temp_cwd / "test_seed.py").write_text(
+            "import os\n\ndef test_seed():\n    assert os.environ['PYTHONHASHSEED'] == '7'\n"
+        )
+        runner = PytestRunner(working_dir=temp_cwd).with_seed(7)
+
+        with patch.object(runner, "_can_import", return_value=True):
+            command = runner._build_command(temp_cwd / "test_seed.py", temp_cwd)
+        result = runner.run(Path("test_seed.py"))
+
+        assert command[command.index("-p") + 1 :][:2] == ["randomly", "--randomly-seed=7"]
+        assert result.is_green
+        assert "--randomly-seed=7" not in PytestRunner(working_dir=temp_cwd)._build_command(Path("t.py"), temp_cwd)
+
+    def test_lean_profile_changes_cache_key(self, temp_dir: Path):
+        """Test that lean and default runs don't share cached results."""
+        assert PytestRunner(temp_dir).cache_settings() != PytestRunner(temp_dir, lean=True).cache_settings()
+
+    def test_run_lean_leaves_no_cache_in_project(self, temp_cwd: Path):
+        """Test a real lean run passes and doesn't write .pytest_cache into the project."""
+        test_file = temp_cwd / "test_sample.py"
+        test_file.write_text("def test_ok():\n    pass\n\ndef test_bad():\n    assert False\n")
+        runner = PytestRunner(working_dir=temp_cwd, lean=True)
+
+        result = runner.run(test_file)
+
+        assert (result.passed, result.failed) == (1, 1)
+        assert not (temp_cwd / ".pytest_cache").exists()
+
+    @pytest.mark.skipif(importlib.util.find_spec("xdist") is None, reason="pytest-xdist is not installed")
+    def test_run_parallel_merges_worker_results(self, temp_cwd: Path):
+        """Test that failures from all xdist workers end up in one result."""
+        test_file = temp_cwd / "test_sample.py"
+        test_file.write_text(
+            "import pytest\n\n@pytest.mark.parametrize('v', [0, 1, 2, 3, 4, 5, 6, 7])\n"
+            "def test_v(v):\n    assert v % 3\n"
+        )
+        runner = PytestRunner(working_dir=temp_cwd, parallel=True, tests_per_worker=2)
+        events = []
+
+        with patch("proven.runners.pytest_runner.available_cores", return_value=2):
+            result = runner.run(test_file, on_event=lambda case: events.append(case) or False)
+
+        assert "2 workers" in result.output
+        assert (result.passed, result.failed) == (5, 3)
+        assert {case.name for case in result.failures} == {"test_v[0]", "test_v[3]", "test_v[6]"}
+        assert len(events) == 8
+
+    def test_run_stops_at_first_failure(self, temp_cwd: Path):
+        """Test that a streaming run can be stopped once a test fails."""
+        test_file = temp_cwd / "test_sample.py"
+        test_file.write_text(
+            "import time\n\ndef test_bad():\n    assert False\n\ndef test_slow():\n    time.sleep(30)\n"
+        )
+        runner = PytestRunner(working_dir=temp_cwd)
+        events = []
+
+        result = runner.run(test_file, on_event=lambda case: events.append(case) or case.is_failure)
+
+        assert [case.outcome for case in events] == ["failed"]
+        assert result.is_red
+        assert result.failed == 1
+        assert "stopped early" in result.output
+
+    @pytest.mark.asyncio
+    async def test_run_async_real_tests(self, temp_cwd: Path):
+        """Test that run_async runs a real pytest file and reads its report."""
+        test_file = temp_cwd / "test_sample.py"
+        test_file.write_text("def test_ok():\n    pass\n\ndef test_bad():\n    assert False\n")
+        runner = PytestRunner(working_dir=temp_cwd)
+        events = []
+
+        result = await runner.run_async(test_file, on_event=lambda case: events.append(case) or False)
+
+        assert result.passed == 1
+        assert result.failed == 1
+        assert sorted(case.outcome for case in events) == ["failed", "passed"]
+
+    def test_rerun_runs_failed_tests_first(self, temp_cwd: Path):
+        """Test that rerun selects failed node IDs, then confirms GREEN with a full run."""
+        (temp_cwd / "sample.py").write_text("def answer():\n    return 0\n")
+        test_file = temp_cwd / "test_sample.py"
+        test_file.write_text(
+            "from sample import answer\n\n"
+            "class TestAnswer:\n    def test_answer(self):\n        assert answer() == 42\n\n"
+            "def test_ok():\n    pass\n"
+        )
+        runner = PytestRunner(working_dir=temp_cwd)
+        previous = runner.run(test_file)
+        (temp_cwd / "sample.py").write_text("def answer():\n    return 42\n")
+
+        with patch.object(runner, "_run_command", wraps=runner._run_command) as mock_run:
+            result = runner.rerun(test_file, previous)
+
+        selected, full = (call[0][0] for call in mock_run.call_args_list)
+        assert f"{test_file}::TestAnswer::test_answer" in selected
+        assert str(test_file) not in selected
+        assert str(test_file) in full
+        assert result.is_green
+        assert result.passed == 2
+
+    def test_rerun_stops_while_failures_remain(self, temp_cwd: Path):
+        """Test that rerun reports the selected failures without a full run."""
+        test_file = temp_cwd / "test_sample.py"
+        test_file.write_text("def test_bad():\n    assert False\n\ndef test_ok():\n    pass\n")
+        runner = PytestRunner(working_dir=temp_cwd)
+        previous = runner.run(test_file)
+
+        with patch.object(runner, "_run_command", wraps=runner._run_command) as mock_run:
+            result = runner.rerun(test_file, previous)
+
+        assert mock_run.call_count == 1
+        assert [(case.name, case.outcome) for case in result.cases] == [("test_bad", "failed")]
+
+    def test_preflight_reports_syntax_errors(self, temp_cwd: Path):
+        """Test that preflight compiles Python files without starting pytest."""
+        good = temp_cwd / "test_sample.py"
+        good.write_text("def test_ok():\n    pass\n")
+        bad = temp_cwd / "sample.py"
+        bad.write_text("def answer(:\n    return 42\n")
+        runner = PytestRunner(working_dir=temp_cwd)
+
+        with patch.object(runner, "_run_command") as mock_run:
+            assert runner.preflight([good, temp_cwd / "missing.py"]) is None
+            result = runner.preflight([good, bad])
+
+        mock_run.assert_not_called()
+        assert result.is_red
+        assert result.errors == 1
+        assert "SyntaxError" in result.output
+        assert "sample.py" in result.output
+
+    def test_collection_errors_are_not_selected(self, temp_cwd: Path):
+        """Test that failures without a node ID fall back to running the whole file."""
+        runner = PytestRunner(working_dir=temp_cwd)
+        collection_error = TestCaseResult(name="test_sample", outcome="error")
+
+        assert runner._test_selectors(temp_cwd / "test_sample.py", [collection_error]) is None
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Worker mode requires fork()")
+    def test_worker_runs_real_tests(self, temp_cwd: Path):
+        """Test that the fork-server worker runs a real pytest file repeatedly."""
+        test_file = temp_cwd / "test_sample.py"
+        test_file.write_text("def test_ok():\n    assert True\n\ndef test_bad():\n    assert False\n")
+        runner = PytestRunner(working_dir=temp_cwd, use_worker=True)
+
+        try:
+            first = runner.run(test_file)
+            second = runner.run(test_file)
+        finally:
+            runner.close()
+
+        assert runner.use_worker is True
+        for result in (first, second):
+            assert result.passed == 1
+            assert result.failed == 1
+            assert result.success is False
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Worker mode requires fork()")
+    def test_worker_keeps_proven_modules_off_the_path(self, temp_cwd: Path):
+        """Test that the fork-server's own folder can't shadow project modules like output.py."""
+        (temp_cwd / "test_path.py").write_text(
+            "import os, sys\n\n\ndef test_path():\n"
+            "    assert not any(os.path.isfile(os.path.join(p, 'pytest_worker_server.py')) for p in sys.path)\n"
+        )
+        runner = PytestRunner(working_dir=temp_cwd, use_worker=True)
+
+        try:
+            result = runner.run(temp_cwd / "test_path.py")
+        finally:
+            runner.close()
+
+        assert runner.use_worker is True
+        assert result.passed == 1
+
+
+UNITTEST_SAMPLE = """
+import unittest
+
+from calc import add
+
+
+class TestCalc(unittest.TestCase):
+    def test_add(self):
+        self.assertEqual(add(1, 2), 3)
+
+    def test_wrong(self):
+        self.assertEqual(add(1, 2), 4)
+
+    def test_range(self):
+        for i in range(3):
+            with self.subTest(i=i):
+                self.assertLess(i, 2)
+
+    @unittest.skip("not yet")
+    def test_later(self):
+        pass
+"""
+
+
+@pytest.fixture
+def unittest_project(temp_cwd: Path) -> Path:
+    """A project with a calc module and a unittest file that partly fails."""
+    (temp_cwd / "calc.py").write_text("def add(a, b):\n    return a + b\n")
+    (temp_cwd / "tests").mkdir()
+    (temp_cwd / "tests" / "test_calc.py").write_text(UNITTEST_SAMPLE)
+    return temp_cwd
+
+
+class TestUnittestRunner:
+    """Tests for the unittest runner."""
+
+    def test_name(self):
+        """Test runner name and file naming."""
+        runner = UnittestRunner()
+
+        assert runner.name == "unittest"
+        assert runner.get_test_file_pattern() == "test_*.py"
+        assert runner.get_test_file_name("calc.py") == "test_calc.py"
+
+    @pytest.mark.parametrize("in_process", [True, False])
+    def test_run_real_tests(self, unittest_project: Path, in_process: bool):
+        """Test a real run, forked or as a subprocess, reads every case from the report."""
+        runner = UnittestRunner(working_dir=unittest_project, in_process=in_process)
+        events = []
+
+        result = runner.run(Path("tests/test_calc.py"), on_event=lambda case: events.append(case) or False)
+
+        assert (result.passed, result.failed, result.errors) == (1, 2, 0)
+        outcomes = {case.name: case.outcome for case in result.cases}
+        assert outcomes == {
+            "test_add": "passed",
+            "test_wrong": "failed",
+            "test_range (i=2)": "failed",
+            "test_later": "skipped",
+        }
+        assert all(case.classname == "test_calc.TestCalc" for case in result.cases)
+        assert "AssertionError: 3 != 4" in next(case.message for case in result.failures if case.name == "test_wrong")
+        assert {case.name for case in events} >= {"test_add", "test_wrong"}
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs fork()")
+    def test_run_in_process_starts_no_interpreter(self, unittest_project: Path):
+        """Test the forked run doesn't execute a new python process."""
+        runner = UnittestRunner(working_dir=unittest_project, in_process=True)
+
+        with patch("proven.runners.base.subprocess.Popen") as popen:
+            result = runner.run(Path("tests/test_calc.py"))
+
+        popen.assert_not_called()
+        assert result.passed == 1
+
+    def test_seed_shuffles_method_order(self, temp_cwd: Path):
+        """Test that a seed runs test methods in a reproducible order other than alphabetical."""
+        methods = "".join(f"    def test_{i}(self):\n        pass\n\n" for i in range(8))
+        (temp_cwd / "test_order.py").write_text(f"import unittest\n\n\nclass TestOrder(unittest.TestCase):\n{methods}")
+        runner = UnittestRunner(working_dir=temp_cwd)
+
+        def order(seed: Optional[int]) -> list[str]:
+            seeded = runner if seed is None else runner.with_seed(seed)
+            return [case.name for case in seeded.run(Path("test_order.py")).cases]
+
+        alphabetical = order(None)
+
+        assert alphabetical == sorted(alphabetical)
+        assert order(1) == order(1) != alphabetical
+        assert sorted(order(2)) == alphabetical
+        assert runner.with_seed(1)._command_env() == {"PYTHONHASHSEED": "1"}
+
+    @pytest.mark.asyncio
+    async def test_rerun_selects_failed_tests(self, unittest_project: Path):
+        """Test that a rerun only runs the failed test methods."""
+        runner = UnittestRunner(working_dir=unittest_project)
+        test_file = Path("tests/test_calc.py")
+        first = await runner.run_async(test_file)
+
+        assert sorted(runner._test_selectors(test_file, first.failures)) == [
+            "TestCalc.test_range",
+            "TestCalc.test_wrong",
+        ]
+        result = await runner.rerun_async(test_file, first)
+
+        assert {case.name for case in result.cases} == {"test_wrong", "test_range (i=2)"}
+
+    def test_run_reports_import_errors(self, unittest_project: Path):
+        """Test that a test module that fails to import is an error, not an empty pass."""
+        (unittest_project / "calc.py").unlink()
+        runner = UnittestRunner(working_dir=unittest_project)
+
+        result = runner.run(Path("tests/test_calc.py"))
+
+        assert result.is_red
+        assert result.errors == 1
+        assert "No module named 'calc'" in result.output
+        assert runner._test_selectors(Path("tests/test_calc.py"), result.failures) is None
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs fork()")
+    def test_run_in_process_times_out(self, unittest_project: Path):
+        """Test that a hanging forked run is killed at the timeout."""
+        (unittest_project / "tests" / "test_calc.py").write_text(
+            "import time, unittest\n\nclass TestSlow(unittest.TestCase):\n"
+            "    def test_slow(self):\n        time.sleep(30)\n"
+        )
+        runner = UnittestRunner(working_dir=unittest_project, in_process=True)
+        runner.timeout = 0.5
+
+        result = runner.run(Path("tests/test_calc.py"))
+
+        assert result.is_red
+        assert "timed out" in result.output
+
+    def test_parse_progress(self):
+        """Test parsing verbose unittest lines from old and new Python versions."""
+        runner = UnittestRunner()
+
+        new = runner.parse_progress("test_add (test_calc.TestCalc.test_add) ... ok")
+        old = runner.parse_progress("test_bad (test_calc.TestCalc) ... FAIL")
+
+        assert (new.name, new.classname, new.outcome) == ("test_add", "test_calc.TestCalc", "passed")
+        assert (old.name, old.classname, old.outcome) == ("test_bad", "test_calc.TestCalc", "failed")
+        assert runner.parse_progress("Ran 2 tests in 0.001s") is None
+
+    @pytest.mark.parametrize("in_process", [True, False])
+    def test_progress_of_tests_with_docstrings(self, temp_cwd: Path, in_process: bool):
+        """Test that tests with docstrings still report one parseable line each."""
+        (temp_cwd / "test_doc.py").write_text(
+            "import unittest\n\n\nclass TestDoc(unittest.TestCase):\n"
+            '    def test_doc(self):\n        """Has a docstring."""\n'
+        )
+        runner = UnittestRunner(working_dir=temp_cwd, in_process=in_process)
+        events = []
+
+        runner.run(Path("test_doc.py"), on_event=lambda case: events.append(case) or False)
+
+        assert [(case.name, case.outcome) for case in events] == [("test_doc", "passed")]
+
+    def test_parse_result_without_report(self, temp_dir: Path):
+        """Test falling back to the summary when no report was written."""
+        runner = UnittestRunner()
+        output = "Ran 5 tests in 0.01s\n\nFAILED (failures=1, errors=2)"
+
+        result = runner._parse_result(temp_dir / "test_x.py", 1, output, temp_dir, None)
+
+        assert (result.passed, result.failed, result.errors) == (2, 1, 2)
+
 
 class TestJestRunner:
     """Tests for the Jest runner."""
@@ -123,7 +730,7 @@ class TestJestRunner:
         runner = JestRunner(working_dir=temp_cwd)
 
         with patch.object(runner, "_run_command") as mock_run:
-            mock_run.return_value = (0, "Tests: 5 passed, 5 total")
+            mock_run.return_value = CommandResult(0, "Tests: 5 passed, 5 total")
 
             result = runner.run(temp_cwd / "example.test.js")
 
@@ -135,7 +742,7 @@ class TestJestRunner:
         runner = JestRunner(working_dir=temp_cwd)
 
         with patch.object(runner, "_run_command") as mock_run:
-            mock_run.return_value = (1, "Tests: 2 failed, 3 passed, 5 total")
+            mock_run.return_value = CommandResult(1, "Tests: 2 failed, 3 passed, 5 total")
 
             result = runner.run(temp_cwd / "example.test.js")
 
@@ -143,6 +750,375 @@ class TestJestRunner:
             assert result.failed == 2
             assert result.passed == 3
 
+    def test_run_uses_worker_when_enabled(self, temp_cwd: Path):
+        """Test that worker mode sends the test file to the Jest sidecar."""
+        runner = JestRunner(working_dir=temp_cwd, use_worker=True)
+
+        with patch.object(
+            runner, "_run_in_worker", return_value=CommandResult(1, "Tests: 1 failed, 2 passed")
+        ) as mock_worker:
+            with patch.object(runner, "_run_command") as mock_run:
+                result = runner.run(temp_cwd / "example.test.js")
+
+        assert mock_worker.call_args[0][0][0] == str(temp_cwd / "example.test.js")
+        mock_run.assert_not_called()
+        assert result.failed == 1
+        assert result.passed == 2
+
+    def test_resource_limits_skip_the_worker(self, temp_cwd: Path):
+        """Test that runs with resource limits use a subprocess, which can enforce them."""
+        runner = JestRunner(working_dir=temp_cwd, use_worker=True)
+        runner.limits = ResourceLimits(memory_mb=512)
+
+        with patch.object(WorkerProcess, "request") as request:
+            with patch.object(runner, "_run_command", return_value=CommandResult(0, "Tests: 1 passed")) as mock_run:
+                result = runner.run(temp_cwd / "example.test.js")
+
+        request.assert_not_called()
+        mock_run.assert_called_once()
+        assert result.passed == 1 and runner.use_worker is True
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="Needs Node.js")
+    def test_sidecar_enforces_request_timeout(self, temp_cwd: Path):
+        """Test that the sidecar answers a run that overruns its timeout as incomplete, then exits."""
+        jest = temp_cwd / "node_modules" / "jest"
+        jest.mkdir(parents=True)
+        (jest / "index.js").write_text("exports.runCLI = () => new Promise(() => setInterval(() => {}, 1000));\n")
+        worker = WorkerProcess(["node", str(JEST_WORKER_SCRIPT), str(temp_cwd)], cwd=temp_cwd)
+        worker.start()
+
+        try:
+            response = worker.request({"args": [], "timeout": 0.2}, timeout=5)
+            assert response["complete"] is False
+            assert "timed out" in response["output"]
+            assert worker._process is not None and worker._process.wait(timeout=5) == 1
+        finally:
+            worker.close()
+
+    def test_parse_progress(self):
+        """Test parsing verbose per-test lines, with or without colors."""
+        runner = JestRunner()
+
+        passed = runner.parse_progress("    \x1b[32m✓\x1b[39m \x1b[2madds numbers (3 ms)\x1b[22m")
+        failed = runner.parse_progress("    ✕ rejects strings (12 ms)")
+
+        assert (passed.name, passed.outcome) == ("adds numbers", "passed")
+        assert (failed.name, failed.outcome) == ("rejects strings", "failed")
+        assert runner.parse_progress("Tests: 1 failed, 1 passed, 2 total") is None
+
+    def test_run_falls_back_to_npx_without_worker(self, temp_cwd: Path):
+        """Test that an unavailable sidecar falls back to npx jest."""
+        runner = JestRunner(working_dir=temp_cwd, use_worker=True)
+
+        with patch.object(WorkerProcess, "start", side_effect=WorkerError("node missing")):
+            with patch.object(runner, "_run_command", return_value=CommandResult(0, "Tests: 1 passed")) as mock_run:
+                result = runner.run(temp_cwd / "example.test.js")
+
+        assert mock_run.call_args[0][0][:2] == ["npx", "jest"]
+        assert result.passed == 1
+        assert runner.use_worker is False
+
+    def test_build_command_fast(self, temp_dir: Path):
+        """Test the fast profile calls the local binary by path, in CI mode, with a shared cache."""
+        binary = temp_dir / "node_modules" / ".bin" / ("jest.cmd" if os.name == "nt" else "jest")
+        binary.parent.mkdir(parents=True)
+        binary.touch()
+        project = temp_dir / "packages" / "app"
+        project.mkdir(parents=True)
+        runner = JestRunner(working_dir=project, fast=True, cache_directory=temp_dir / "jest-cache")
+
+        command = runner._build_command(project / "a.test.js", temp_dir)
+
+        assert command[0] == str(binary.resolve())
+        assert {"--runTestsByPath", "--ci", f"--cacheDirectory={temp_dir / 'jest-cache'}"} <= set(command)
+        assert "--colors" not in command
+        assert runner._worker_args(command)[0] == str(project / "a.test.js")
+
+    def test_fast_profile_resolves_binary_once(self, temp_dir: Path):
+        """Test the binary lookup happens once, falling back to npx when Jest isn't installed locally."""
+        runner = JestRunner(working_dir=temp_dir, fast=True)
+
+        with patch("proven.runners.jest_runner.find_jest_binary", return_value=None) as find:
+            first = runner._build_command(temp_dir / "a.test.js", temp_dir)
+            second = runner._build_command(temp_dir / "b.test.js", temp_dir)
+
+        find.assert_called_once()
+        assert first[:2] == second[:2] == ["npx", "jest"]
+
+    def test_build_command_transpiler(self, temp_dir: Path):
+        """Test that a transpiler replaces the TypeScript transform and keeps its cache in the shared directory."""
+        runner = JestRunner(working_dir=temp_dir, transpiler="swc", cache_directory=temp_dir / "jest-cache")
+
+        command = runner._build_command(temp_dir / "a.test.ts", temp_dir)
+        transform = json.loads(next(arg for arg in command if arg.startswith("--transform=")).split("=", 1)[1])
+
+        assert f"--cacheDirectory={temp_dir / 'jest-cache'}" in command
+        assert transform[r"^.+\.[cm]?tsx?$"] == [str(TRANSFORM_SCRIPT), {"transpiler": "swc"}]
+        assert transform[r"^.+\.[cm]?jsx?$"] == "babel-jest"
+        assert runner.cache_settings()["transpiler"] == "swc"
+
+    def test_build_command_seeded(self, temp_dir: Path):
+        """Test that a seed randomizes test order with Jest's own seed."""
+        runner = JestRunner(working_dir=temp_dir)
+
+        command = runner.with_seed(2**31 + 5)._build_command(temp_dir / "a.test.js", temp_dir)
+
+        assert {"--randomize", "--seed=5"} <= set(command)
+        assert "--randomize" not in runner._build_command(temp_dir / "a.test.js", temp_dir)
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="Requires node")
+    def test_transform_uses_project_transpiler(self, temp_dir: Path):
+        """Test the transform calls the project's esbuild and keys its cache on the source."""
+        esbuild = temp_dir / "node_modules" / "esbuild"
+        esbuild.mkdir(parents=True)
+        (esbuild / "package.json").write_text('{"name": "esbuild", "main": "index.js"}')
+        (esbuild / "index.js").write_text(
+            'exports.version = "0.20.0";\n'
+            "exports.transformSync = (source, options) => "
+            '({ code: `// ${options.loader} ${options.format}\\n` + source.replace(": number", "") });\n'
+        )
+        script = f"""
+const transform = require({json.dumps(str(TRANSFORM_SCRIPT))});
+const options = {{ config: {{ rootDir: {json.dumps(str(temp_dir))} }}, configString: "{{}}" }};
+options.transformerConfig = {{ transpiler: "esbuild" }};
+const key = (source) => transform.getCacheKey(source, "/src/sum.ts", options);
+console.log(JSON.stringify({{
+  code: transform.process("let n: number = 1;", "/src/sum.ts", options).code,
+  sameKey: key("let a = 1;") === key("let a = 1;"),
+  changedKey: key("let a = 1;") !== key("let a = 2;"),
+}}));
+"""
+        result = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True)
+
+        assert json.loads(result.stdout) == {
+            "code": "// ts cjs\nlet n = 1;",
+            "sameKey": True,
+            "changedKey": True,
+        }
+
+    def test_output_has_no_color_codes(self, temp_cwd: Path):
+        """Test that ANSI color codes are stripped before the output reaches a prompt."""
+        runner = JestRunner(working_dir=temp_cwd)
+        colored = "\x1b[1m\x1b[31m  ● math › adds\x1b[39m\x1b[22m\nTests: \x1b[31m1 failed\x1b[39m, 1 total"
+
+        with patch.object(runner, "_run_command", return_value=CommandResult(1, colored)):
+            result = runner.run(temp_cwd / "a.test.js")
+
+        assert "\x1b" not in result.output
+        assert result.failed == 1
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="Requires node")
+    def test_preflight_checks_javascript(self, temp_cwd: Path):
+        """Test that preflight runs node --check, tolerating JSX."""
+        runner = JestRunner(working_dir=temp_cwd)
+        (temp_cwd / "ok.js").write_text("export const add = (a, b) => a + b;\n")
+        (temp_cwd / "view.js").write_text("export const View = () => <div />;\n")
+        (temp_cwd / "broken.js").write_text("const add = (a, b) => ;\n")
+
+        assert runner.preflight([temp_cwd / "ok.js", temp_cwd / "view.js"]) is None
+        result = runner.preflight([temp_cwd / "ok.js", temp_cwd / "broken.js"])
+
+        assert result.is_red
+        assert "SyntaxError" in result.output
+
+    def test_selected_tests_use_name_pattern(self, temp_cwd: Path):
+        """Test that failed tests are selected with an escaped --testNamePattern."""
+        runner = JestRunner(working_dir=temp_cwd)
+        cases = [TestCaseResult(name="math adds (1 + 1)", outcome="failed", file="a.test.js")]
+
+        selectors = runner._test_selectors(temp_cwd / "a.test.js", cases)
+        command = runner._build_command(temp_cwd / "a.test.js", temp_cwd, selectors)
+
+        assert command[-1] == r"--testNamePattern=math\ adds\ \(1\ \+\ 1\)"
+        suite_error = TestCaseResult(name="a.test.js", outcome="error", file="a.test.js")
+        assert runner._test_selectors(temp_cwd / "a.test.js", [suite_error]) is None
+
+
+# Stands in for vitest/node (1.x API): each test file "passes" unless it contains "fail";
+# one containing "hang" never finishes
+FAKE_VITEST_NODE = """
+import fs from "node:fs";
+
+export async function createVitest(mode, options) {
+  const files = new Map();
+  const invalidated = [];
+  const vitest = {
+    config: {},
+    configOverride: {},
+    server: { moduleGraph: { fileToModulesMap: files, invalidateModule: (mod) => invalidated.push(mod) } },
+    results: [],
+    state: {
+      getFiles: () => vitest.results,
+      getUnhandledErrors: () => [],
+    },
+    async start(paths) {
+      await vitest.rerunFiles(paths);
+    },
+    async rerunFiles(paths) {
+      if (paths.some((file) => fs.readFileSync(file, "utf8").includes("hang"))) {
+        await new Promise(() => setInterval(() => {}, 1000));
+      }
+      vitest.results = paths.map((file) => {
+        files.set(file, [file]);
+        const state = fs.readFileSync(file, "utf8").includes("fail") ? "fail" : "pass";
+        return { filepath: file, result: { state } };
+      });
+      console.log(`invalidated ${invalidated.splice(0).length}`);
+      const assertionResults = [{ title: "adds", fullName: "sum adds", status: state(vitest), failureMessages: [] }];
+      fs.writeFileSync(
+        vitest.config.outputFile.json,
+        JSON.stringify({ testResults: [{ name: paths[0], status: state(vitest), assertionResults }] })
+      );
+    },
+    async close() {},
+  };
+  return vitest;
+}
+
+function state(vitest) {
+  return vitest.results[0].result.state === "pass" ? "passed" : "failed";
+}
+"""
+
+
+class TestVitestRunner:
+    """Tests for the Vitest runner."""
+
+    def test_name(self):
+        """Test runner name and file naming."""
+        runner = VitestRunner()
+
+        assert runner.name == "vitest"
+        assert runner.get_test_file_name("utils.ts") == "utils.test.ts"
+
+    def test_build_command(self, temp_dir: Path):
+        """Test that the command uses the project's vitest binary and a JSON report."""
+        binary = temp_dir / "node_modules" / ".bin" / ("vitest.cmd" if os.name == "nt" else "vitest")
+        binary.parent.mkdir(parents=True)
+        binary.touch()
+        runner = VitestRunner(working_dir=temp_dir)
+
+        command = runner._build_command(temp_dir / "sum.test.ts", temp_dir, ["sum adds"])
+
+        assert command[:3] == [str(binary), "run", str(temp_dir / "sum.test.ts")]
+        assert f"--outputFile.json={temp_dir / 'vitest.json'}" in command
+        assert command[-1] == "--testNamePattern=sum\\ adds"
+        assert runner._worker_args(command)[0] == str(temp_dir / "sum.test.ts")
+
+    def test_build_command_seeded(self, temp_dir: Path):
+        """Test that a seeded run shuffles tests without the sidecar."""
+        runner = VitestRunner(working_dir=temp_dir).with_seed(42)
+
+        command = runner._build_command(temp_dir / "sum.test.ts", temp_dir)
+
+        assert command[-2:] == ["--sequence.shuffle", "--sequence.seed=42"]
+        assert runner.use_worker is False
+
+    def test_run_parses_report(self, temp_cwd: Path):
+        """Test that results come from the JSON report, which Vitest writes in Jest's format."""
+        runner = VitestRunner(working_dir=temp_cwd, use_worker=False)
+        report = {
+            "testResults": [
+                {
+                    "name": "sum.test.ts",
+                    "assertionResults": [
+                        {"fullName": "sum adds", "status": "passed"},
+                        {"fullName": "sum divides", "status": "failed", "failureMessages": ["expected 2"]},
+                    ],
+                }
+            ]
+        }
+
+        def write_report(command, on_line=None):
+            report_path = next(arg for arg in command if arg.startswith("--outputFile.json="))
+            Path(report_path.split("=", 1)[1]).write_text(json.dumps(report))
+            return CommandResult(1, "\x1b[31mFAIL\x1b[39m")
+
+        with patch.object(runner, "_run_command", side_effect=write_report):
+            result = runner.run(temp_cwd / "sum.test.ts")
+
+        assert (result.passed, result.failed) == (1, 1)
+        assert result.output == "FAIL"
+        assert runner._test_selectors(temp_cwd / "sum.test.ts", result.failures) == ["sum divides"]
+
+    def test_run_falls_back_to_summary(self, temp_cwd: Path):
+        """Test parsing the summary line when no report was written."""
+        runner = VitestRunner(working_dir=temp_cwd, use_worker=False)
+
+        with patch.object(runner, "_run_command", return_value=CommandResult(1, " Tests  2 failed | 3 passed (5)")):
+            result = runner.run(temp_cwd / "sum.test.ts")
+
+        assert (result.passed, result.failed, result.errors) == (3, 2, 0)
+
+    def test_parse_progress(self):
+        """Test parsing verbose reporter lines, skipping per-file lines."""
+        runner = VitestRunner()
+
+        passed = runner.parse_progress(" ✓ src/sum.test.ts > sum > adds numbers 2ms")
+        failed = runner.parse_progress("   × divides by zero 3ms")
+
+        assert (passed.name, passed.outcome) == ("adds numbers", "passed")
+        assert (failed.name, failed.outcome) == ("divides by zero", "failed")
+        assert runner.parse_progress(" ✓ src/sum.test.ts (3 tests) 5ms") is None
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="Requires node")
+    def test_sidecar_reruns_changed_files(self, temp_cwd: Path):
+        """Test that the sidecar keeps Vitest running and invalidates files that changed."""
+        package = temp_cwd / "node_modules" / "vitest"
+        (package / "dist").mkdir(parents=True)
+        (package / "package.json").write_text(
+            json.dumps({"name": "vitest", "exports": {"./node": {"import": "./dist/node.mjs"}}})
+        )
+        (package / "dist" / "node.mjs").write_text(FAKE_VITEST_NODE)
+        test_file = temp_cwd / "sum.test.js"
+        test_file.write_text("test('adds')")
+        runner = VitestRunner(working_dir=temp_cwd)
+
+        try:
+            first = runner.run(test_file)
+            test_file.write_text("test('adds') // fail")
+            second = runner.run(test_file)
+        finally:
+            runner.close()
+
+        assert runner.use_worker is True
+        assert (first.success, first.passed, "invalidated 0" in first.output) == (True, 1, True)
+        assert (second.success, second.failed, "invalidated 1" in second.output) == (False, 1, True)
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="Requires node")
+    def test_sidecar_enforces_request_timeout(self, temp_cwd: Path):
+        """Test that the sidecar answers a run that overruns its timeout as incomplete, then exits."""
+        package = temp_cwd / "node_modules" / "vitest"
+        (package / "dist").mkdir(parents=True)
+        (package / "package.json").write_text(
+            json.dumps({"name": "vitest", "exports": {"./node": {"import": "./dist/node.mjs"}}})
+        )
+        (package / "dist" / "node.mjs").write_text(FAKE_VITEST_NODE)
+        (temp_cwd / "sum.test.js").write_text("test('adds') // hang")
+        worker = WorkerProcess(["node", str(VITEST_WORKER_SCRIPT), str(temp_cwd)], cwd=temp_cwd)
+        worker.start()
+
+        try:
+            response = worker.request({"args": ["sum.test.js"], "timeout": 0.2}, timeout=5)
+            assert response["complete"] is False
+            assert "timed out" in response["output"]
+            assert worker._process is not None and worker._process.wait(timeout=5) == 1
+        finally:
+            worker.close()
+
+    def test_resource_limits_skip_the_worker(self, temp_cwd: Path):
+        """Test that runs with resource limits use a subprocess, which can enforce them."""
+        runner = VitestRunner(working_dir=temp_cwd, use_worker=True)
+        runner.limits = ResourceLimits(cpu_seconds=10)
+
+        with patch.object(WorkerProcess, "request") as request:
+            with patch.object(runner, "_run_command", return_value=CommandResult(1, "")) as mock_run:
+                runner.run(temp_cwd / "sum.test.js")
+
+        request.assert_not_called()
+        mock_run.assert_called_once()
+        assert runner.use_worker is True
+
 
 class TestMavenRunner:
     """Tests for the Maven runner."""
@@ -164,12 +1140,72 @@ class TestMavenRunner:
         assert runner.get_test_file_name("Calculator.java") == "CalculatorTest.java"
         assert runner.get_test_file_name("Utils.java") == "UtilsTest.java"
 
+    def test_build_command_fast_targets_module(self, temp_dir: Path):
+        """Test the fast profile builds only the test's module, offline and in parallel."""
+        (temp_dir / "pom.xml").touch()
+        module = temp_dir / "services" / "billing"
+        test_file = module / "src" / "test" / "java" / "com" / "acme" / "InvoiceTest.java"
+        test_file.parent.mkdir(parents=True)
+        (module / "pom.xml").touch()
+        runner = MavenRunner(working_dir=temp_dir, fast=True, skip_properties=["jacoco.skip"])
+
+        command = runner._build_command(test_file, temp_dir)
+
+        assert command[command.index("-pl") + 1] == "services/billing"
+        assert command[command.index("-pl") + 2] == "-am"
+        assert command[command.index("-T") + 1] == "1C"
+        assert {"-o", "-DfailIfNoTests=false", "-Djacoco.skip=true"} <= set(command)
+        assert runner._report_files(test_file) == []
+
+    def test_build_command_seeded(self, temp_dir: Path):
+        """Test that a seed shuffles test classes in Surefire and methods in JUnit."""
+        (temp_dir / "pom.xml").touch()
+        runner = MavenRunner(working_dir=temp_dir).with_seed(9)
+
+        command = runner._build_command(temp_dir / "src" / "test" / "java" / "CalcTest.java", temp_dir)
+
+        assert {"-Dsurefire.runOrder=random", "-Dsurefire.runOrder.random.seed=9"} <= set(command)
+        assert "-Djunit.jupiter.testmethod.order.default=org.junit.jupiter.api.MethodOrderer$Random" in command
+        assert "-Djunit.jupiter.execution.order.random.seed=9" in command
+
+    def test_build_command_fast_single_module(self, temp_dir: Path):
+        """Test a single-module project gets no -pl, and the default profile is unchanged."""
+        (temp_dir / "pom.xml").touch()
+        test_file = temp_dir / "src" / "test" / "java" / "CalculatorTest.java"
+        test_file.parent.mkdir(parents=True)
+
+        fast = MavenRunner(working_dir=temp_dir, fast=True, skip_properties=DEFAULT_SKIP_PROPERTIES)._build_command(
+            test_file, temp_dir
+        )
+        default = MavenRunner(working_dir=temp_dir)._build_command(test_file, temp_dir)
+
+        assert "-pl" not in fast
+        assert "-Dcheckstyle.skip=true" in fast
+        assert default == ["mvn", "test", "-Dtest=CalculatorTest", "-q"]
+
+    def test_reads_reports_from_module(self, temp_dir: Path):
+        """Test surefire reports are read from the test's module, not the project root."""
+        module = temp_dir / "core"
+        test_file = module / "src" / "test" / "java" / "CalculatorTest.java"
+        test_file.parent.mkdir(parents=True)
+        (module / "pom.xml").touch()
+        reports = module / "target" / "surefire-reports"
+        reports.mkdir(parents=True)
+        (reports / "TEST-CalculatorTest.xml").write_text(
+            '<testsuite><testcase classname="CalculatorTest" name="adds"/></testsuite>'
+        )
+        runner = MavenRunner(working_dir=temp_dir, fast=True)
+
+        result = runner._parse_result(test_file, 0, "BUILD SUCCESS", temp_dir, None)
+
+        assert result.passed == 1
+
     def test_run_parses_passed_count(self, temp_cwd: Path):
         """Test that run parses passed test count from Surefire output."""
         runner = MavenRunner(working_dir=temp_cwd)
 
         with patch.object(runner, "_run_command") as mock_run:
-            mock_run.return_value = (0, "Tests run: 5, Failures: 0, Errors: 0, Skipped: 0\nBUILD SUCCESS")
+            mock_run.return_value = CommandResult(0, "Tests run: 5, Failures: 0, Errors: 0, Skipped: 0\nBUILD SUCCESS")
 
             result = runner.run(temp_cwd / "CalculatorTest.java")
 
@@ -183,7 +1219,7 @@ class TestMavenRunner:
         runner = MavenRunner(working_dir=temp_cwd)
 
         with patch.object(runner, "_run_command") as mock_run:
-            mock_run.return_value = (1, "Tests run: 5, Failures: 2, Errors: 0, Skipped: 0\nBUILD FAILURE")
+            mock_run.return_value = CommandResult(1, "Tests run: 5, Failures: 2, Errors: 0, Skipped: 0\nBUILD FAILURE")
 
             result = runner.run(temp_cwd / "CalculatorTest.java")
 
@@ -197,7 +1233,7 @@ class TestMavenRunner:
         runner = MavenRunner(working_dir=temp_cwd)
 
         with patch.object(runner, "_run_command") as mock_run:
-            mock_run.return_value = (1, "Tests run: 5, Failures: 1, Errors: 2, Skipped: 0\nBUILD FAILURE")
+            mock_run.return_value = CommandResult(1, "Tests run: 5, Failures: 1, Errors: 2, Skipped: 0\nBUILD FAILURE")
 
             result = runner.run(temp_cwd / "CalculatorTest.java")
 
@@ -212,12 +1248,929 @@ class TestMavenRunner:
 
         with patch.object(runner, "_run_command") as mock_run:
             # Exit code 0 but no BUILD SUCCESS
-            mock_run.return_value = (0, "Tests run: 5, Failures: 0, Errors: 0")
+            mock_run.return_value = CommandResult(0, "Tests run: 5, Failures: 0, Errors: 0")
 
             result = runner.run(temp_cwd / "CalculatorTest.java")
 
             assert result.success is False
 
+    def test_preflight_reports_only_syntax_errors(self, temp_cwd: Path):
+        """Test that javac preflight ignores symbols that need the project classpath."""
+        test_file = temp_cwd / "CalculatorTest.java"
+        test_file.write_text("class CalculatorTest {}\n")
+        runner = MavenRunner(working_dir=temp_cwd)
+        missing_symbol = "CalculatorTest.java:1: error: package org.junit does not exist\n1 error\n"
+        syntax_error = "Calculator.java:3: error: ';' expected\n1 error\n"
+
+        with patch("proven.runners.maven_runner.shutil.which", return_value="/usr/bin/javac"):
+            with patch.object(
+                runner, "_run_command", side_effect=[CommandResult(1, missing_symbol), CommandResult(1, syntax_error)]
+            ):
+                assert runner.preflight([test_file]) is None
+                result = runner.preflight([test_file])
+
+        assert result.is_red
+        assert "';' expected" in result.output
+
+    def test_selected_tests_use_method_filter(self, temp_cwd: Path):
+        """Test that failed methods are selected with -Dtest=Class#a+b."""
+        runner = MavenRunner(working_dir=temp_cwd)
+        cases = [
+            TestCaseResult(name="divides()", outcome="failed"),
+            TestCaseResult(name="adds(int)[2]", outcome="failed"),
+        ]
+
+        selectors = runner._test_selectors(temp_cwd / "CalculatorTest.java", cases)
+        command = runner._build_command(temp_cwd / "CalculatorTest.java", temp_cwd, selectors)
+
+        assert "-Dtest=CalculatorTest#adds+divides" in command
+        class_error = TestCaseResult(name="com.example.CalculatorTest", outcome="error")
+        assert runner._test_selectors(temp_cwd / "CalculatorTest.java", [class_error]) is None
+
+
+class TestJUnitRunner:
+    """Tests for the Maven-free JUnit runner."""
+
+    LAUNCHER_OUTPUT = (
+        "Test run finished after 52 ms\n"
+        "[         5 tests found           ]\n"
+        "[         3 tests successful      ]\n"
+        "[         2 tests failed          ]\n"
+        "[         0 tests aborted         ]\n"
+    )
+
+    def test_name(self):
+        """Test runner name."""
+        runner = JUnitRunner()
+        assert runner.name == "junit"
+
+    def test_get_test_file_name(self):
+        """Test generating test file name from source."""
+        runner = JUnitRunner()
+
+        assert runner.get_test_file_name("Calculator.java") == "CalculatorTest.java"
+
+    def test_run_compiles_and_launches(self, temp_cwd: Path, temp_dir: Path):
+        """Test that run compiles the test and source file, then launches JUnit."""
+        (temp_cwd / "tests").mkdir()
+        (temp_cwd / "src").mkdir()
+        test_file = temp_cwd / "tests" / "CalculatorTest.java"
+        test_file.write_text("package com.example;\nclass CalculatorTest {}\n")
+        (temp_cwd / "src" / "Calculator.java").write_text("package com.example;\nclass Calculator {}\n")
+        runner = JUnitRunner(
+            working_dir=temp_cwd, launcher_jar="/opt/junit/console.jar", compile_cache=temp_dir / "javac"
+        )
+
+        with patch.object(
+            runner,
+            "_run_command",
+            side_effect=[CommandResult(0, ""), CommandResult(0, ""), CommandResult(1, self.LAUNCHER_OUTPUT)],
+        ) as mock_run:
+            result = runner.run(test_file)
+
+        javac_source, javac_test, java = (call[0][0] for call in mock_run.call_args_list)
+        assert javac_source[0] == javac_test[0] == "javac"
+        assert javac_source[-1] == str(temp_cwd / "src" / "Calculator.java")
+        assert javac_test[-1] == str(test_file)
+        # The test compiles against the freshly compiled source, moved into the compile cache
+        staging = Path(javac_source[javac_source.index("-d") + 1])
+        source_classes = Path(javac_test[javac_test.index("-cp") + 1].split(os.pathsep)[0])
+        assert staging.parent == source_classes.parent and not staging.exists()
+        assert (source_classes / ".complete").exists()
+        assert java[:3] == ["java", "-jar", "/opt/junit/console.jar"]
+        assert "com.example.CalculatorTest" in java
+        assert result.success is False
+        assert result.passed == 3
+        assert result.failed == 2
+
+    def test_selected_tests_use_select_method(self, temp_cwd: Path):
+        """Test that failed methods replace --select-class with --select-method."""
+        test_file = temp_cwd / "CalculatorTest.java"
+        test_file.write_text("package com.example;\nclass CalculatorTest {}\n")
+        runner = JUnitRunner(working_dir=temp_cwd, launcher_jar="/opt/junit/console.jar")
+
+        selectors = runner._test_selectors(test_file, [TestCaseResult(name="divides()", outcome="failed")])
+        command = runner._build_command(test_file, temp_cwd, selectors)
+
+        assert "--select-class" not in command
+        assert command[command.index("--select-method") + 1] == "com.example.CalculatorTest#divides"
+
+    def test_seeded_run_orders_methods_randomly(self, temp_cwd: Path):
+        """Test that a seed is passed to the launcher as JUnit configuration parameters."""
+        test_file = temp_cwd / "CalculatorTest.java"
+        test_file.write_text("class CalculatorTest {}\n")
+        runner = JUnitRunner(working_dir=temp_cwd, launcher_jar="/opt/junit/console.jar").with_seed(3)
+
+        command = runner._build_command(test_file, temp_cwd)
+
+        assert "--config=junit.jupiter.execution.order.random.seed=3" in command
+        assert "--config=junit.jupiter.testmethod.order.default=org.junit.jupiter.api.MethodOrderer$Random" in command
+
+    def test_parse_progress(self):
+        """Test parsing console launcher tree lines."""
+        runner = JUnitRunner()
+
+        passed = runner.parse_progress("│  ├─ addsNumbers() ✔")
+        failed = runner.parse_progress("│  └─ dividesByZero() ✘ expected: <1> but was: <2>")
+
+        assert (passed.name, passed.outcome) == ("addsNumbers()", "passed")
+        assert (failed.name, failed.outcome) == ("dividesByZero()", "failed")
+        assert runner.parse_progress("├─ CalculatorTest ✔") is None
+
+    def test_reuses_compiled_classes(self, temp_cwd: Path, temp_dir: Path):
+        """Test that only files changed since they were last compiled are passed to javac."""
+        test_file = temp_cwd / "CalculatorTest.java"
+        source_file = temp_cwd / "Calculator.java"
+        test_file.write_text("class CalculatorTest {}\n")
+        source_file.write_text("class Calculator { int add(int a, int b) { return 0; } }\n")
+        runner = JUnitRunner(
+            working_dir=temp_cwd, launcher_jar="/opt/junit/console.jar", compile_cache=temp_dir / "javac"
+        )
+        for command in runner._prepare(test_file):
+            # Stand in for javac
+            (Path(command[command.index("-d") + 1]) / f"{Path(command[-1]).stem}.class").touch()
+            runner._setup_finished(command, CommandResult(0, ""))
+
+        source_file.write_text("class Calculator { int add(int a, int b) { return a + b; } }\n")
+        commands = runner._prepare(test_file)
+        classpath = runner._build_command(test_file, temp_dir)[4].split(os.pathsep)
+
+        assert [command[-1] for command in commands] == [str(source_file)]
+        assert Path(commands[0][commands[0].index("-d") + 1]).name.startswith(Path(classpath[0]).name + ".")
+        assert (Path(classpath[1]) / "CalculatorTest.class").exists()
+        # Going back to the first implementation needs no compilation at all
+        source_file.write_text("class Calculator { int add(int a, int b) { return 0; } }\n")
+        assert runner._prepare(test_file) == []
+
+    def test_recompiles_test_when_source_declarations_change(self, temp_cwd: Path, temp_dir: Path):
+        """Test that the test is recompiled when a signature or an inlined constant of the source changes."""
+        test_file = temp_cwd / "CalculatorTest.java"
+        source_file = temp_cwd / "Calculator.java"
+        test_file.write_text("class CalculatorTest {}\n")
+        runner = JUnitRunner(
+            working_dir=temp_cwd, launcher_jar="/opt/junit/console.jar", compile_cache=temp_dir / "javac"
+        )
+
+        def test_output(source: str) -> Path:
+            source_file.write_text(source)
+            return runner._compile_outputs(test_file)[1][1]
+
+        original = test_output("class Calculator { static final int MAX = 10; int add(int a) { return a; } }")
+
+        # Comments, formatting and method bodies don't matter to the test
+        assert (
+            test_output("class Calculator {\n  static final int MAX = 10; // cap\n  int add(int a) { return -a; }\n}")
+            == original
+        )
+        assert test_output("class Calculator { static final int MAX = 11; int add(int a) { return a; } }") != original
+        assert test_output("class Calculator { static final int MAX = 10; long add(int a) { return a; } }") != original
+
+    def test_java_interface(self):
+        """Test that Java source is reduced to its declarations."""
+        code = (
+            "/* Calculator { */ public class Calculator {\n"
+            '    static final String NAME = "calc {";\n'
+            "    int add(int a, int b) throws ArithmeticException { if (a > 0) { return '}'; } return a + b; }\n"
+            "    record Pair(int a, int b) { int sum() { return a + b; } }\n"
+            "}\n"
+        )
+
+        assert java_interface(code) == (
+            'public class Calculator { static final String NAME = "calc {"; '
+            "int add(int a, int b) throws ArithmeticException {} "
+            "record Pair(int a, int b) { int sum() {} } }"
+        )
+
+    def test_run_reports_compile_errors(self, temp_cwd: Path, temp_dir: Path):
+        """Test that javac failures are reported without launching JUnit."""
+        runner = JUnitRunner(
+            working_dir=temp_cwd, launcher_jar="/opt/junit/console.jar", compile_cache=temp_dir / "javac"
+        )
+
+        with patch.object(runner, "_run_command", return_value=CommandResult(1, "error: ';' expected")) as mock_run:
+            result = runner.run(temp_cwd / "CalculatorTest.java")
+
+        mock_run.assert_called_once()
+        assert result.is_red
+        assert result.errors == 1
+        assert "expected" in result.output
+        assert list((temp_dir / "javac").iterdir()) == []
+
+    def test_incomplete_compile_folders_are_replaced(self, temp_cwd: Path, temp_dir: Path):
+        """Test that a cache folder without the marker, e.g. from a compile still running, isn't used."""
+        test_file = temp_cwd / "CalculatorTest.java"
+        test_file.write_text("class CalculatorTest {}\n")
+        runner = JUnitRunner(
+            working_dir=temp_cwd, launcher_jar="/opt/junit/console.jar", compile_cache=temp_dir / "javac"
+        )
+        ((_, output_dir),) = runner._compile_outputs(test_file)
+        output_dir.mkdir(parents=True)
+        (output_dir / "Half.class").touch()
+
+        (command,) = runner._prepare(test_file)
+        (Path(command[command.index("-d") + 1]) / "CalculatorTest.class").touch()
+        runner._setup_finished(command, CommandResult(0, ""))
+
+        assert sorted(path.name for path in output_dir.iterdir()) == [".complete", "CalculatorTest.class"]
+        assert runner._prepare(test_file) == []
+
+    def test_run_without_launcher(self, temp_home: Path, temp_cwd: Path):
+        """Test that a missing console launcher produces a helpful error."""
+        runner = JUnitRunner(working_dir=temp_cwd)
+
+        with patch.object(runner, "_run_command") as mock_run:
+            result = runner.run(temp_cwd / "CalculatorTest.java")
+
+        mock_run.assert_not_called()
+        assert result.is_red
+        assert "launcher" in result.output
+
+    def test_classpath_resolved_once(self, temp_home: Path, temp_cwd: Path):
+        """Test that the Maven classpath is resolved once and cached by pom.xml."""
+        (temp_cwd / "pom.xml").write_text("<project/>")
+
+        def fake_maven(command):
+            output_file = next(arg for arg in command if arg.startswith("-Dmdep.outputFile="))
+            Path(output_file.split("=", 1)[1]).write_text("/m2/junit.jar")
+            return CommandResult(0, "")
+
+        with patch.object(JUnitRunner, "_run_command", side_effect=fake_maven) as mock_run:
+            first = JUnitRunner(working_dir=temp_cwd)._resolve_classpath()
+            second = JUnitRunner(working_dir=temp_cwd)._resolve_classpath()
+
+        assert mock_run.call_count == 1
+        assert first == second
+        assert first == "/m2/junit.jar"
+
+
+class TestResultCache:
+    """Tests for the content-addressed result cache."""
+
+    def test_key_depends_on_content_and_settings(self, temp_dir: Path):
+        """Test that keys change with file contents, runner and settings only."""
+        test_file = temp_dir / "test_a.py"
+        source_file = temp_dir / "a.py"
+        test_file.write_text("def test_a(): pass\n")
+
+        missing = ResultCache.key("pytest", [test_file, source_file])
+        source_file.write_text("A = 1\n")
+        written = ResultCache.key("pytest", [test_file, source_file])
+
+        assert missing != written
+        assert written == ResultCache.key("pytest", [test_file, source_file])
+        assert written != ResultCache.key("jest", [test_file, source_file])
+        assert written != ResultCache.key("pytest", [test_file, source_file], {"timeout": 5})
+
+    def test_round_trip_and_counters(self, temp_dir: Path):
+        """Test that stored results come back intact and hits/misses are counted."""
+        cache = ResultCache(directory=temp_dir / "cache")
+        result = TestResult.from_cases(False, "out", [TestCaseResult(name="test_a", outcome="failed", message="boom")])
+
+        assert cache.get("abc") is None
+        cache.put("abc", result)
+
+        assert cache.get("abc") == result
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.stats() == "1 hit, 1 miss"
+
+    def test_evicts_least_recently_used(self, temp_dir: Path):
+        """Test that the oldest entries are evicted once over the size limit."""
+        cache = ResultCache(directory=temp_dir / "cache")
+        for index, key in enumerate(("old", "used", "new")):
+            cache.put(key, TestResult(success=True, output="x" * 100))
+            os.utime(cache.directory / f"{key}.json", (index, index))
+        cache.get("used")
+
+        cache.max_bytes = 2 * (cache.directory / "new.json").stat().st_size
+        cache.put("newest", TestResult(success=True, output="x" * 100))
+
+        assert sorted(path.stem for path in cache.directory.glob("*.json")) == ["newest", "used"]
+
+    def test_runner_skips_process_on_hit(self, temp_dir: Path, temp_cwd: Path):
+        """Test that an unchanged test/source pair is not run twice."""
+        test_file = temp_cwd / "test_sample.py"
+        test_file.write_text("def test_ok():\n    pass\n")
+        runner = PytestRunner(working_dir=temp_cwd)
+        runner.cache = ResultCache(directory=temp_dir / "cache")
+        events = []
+
+        first = runner.run(test_file, source_file=temp_cwd / "sample.py")
+        with patch.object(runner, "_run_command") as mock_run:
+            second = runner.run(
+                test_file, on_event=lambda case: events.append(case) or False, source_file=temp_cwd / "sample.py"
+            )
+
+        mock_run.assert_not_called()
+        assert second == first
+        assert [case.name for case in events] == [case.name for case in first.cases]
+        assert (runner.cache.hits, runner.cache.misses) == (1, 1)
+
+    def test_runner_does_not_cache_stopped_runs(self, temp_dir: Path, temp_cwd: Path):
+        """Test that runs stopped early are not stored, since they are incomplete."""
+        test_file = temp_cwd / "test_sample.py"
+        test_file.write_text("def test_bad():\n    assert False\n\ndef test_ok():\n    pass\n")
+        runner = PytestRunner(working_dir=temp_cwd)
+        runner.cache = ResultCache(directory=temp_dir / "cache")
+
+        runner.run(test_file, on_event=lambda case: case.is_failure)
+
+        assert not list(runner.cache.directory.glob("*.json"))
+
+    def test_runner_does_not_cache_incomplete_runs(self, temp_dir: Path, temp_cwd: Path):
+        """Test that timeouts and missing commands are not replayed to a fresh runner."""
+        test_file = temp_cwd / "test_sample.py"
+        test_file.write_text("import time\n\ndef test_slow():\n    time.sleep(30)\n")
+        runner = PytestRunner(working_dir=temp_cwd)
+        runner.cache = ResultCache(directory=temp_dir / "cache")
+        runner.timeout = 1
+
+        timed_out = runner.run(test_file)
+        with patch.object(runner, "_popen", side_effect=FileNotFoundError("pytest")):
+            missing = runner.run(test_file)
+
+        assert not timed_out.complete and not missing.complete
+        assert not list(runner.cache.directory.glob("*.json"))
+
+    def test_log_paths_are_not_stored(self, temp_dir: Path):
+        """Test that cached results don't point at temporary log files."""
+        cache = ResultCache(directory=temp_dir / "cache")
+        inner = TestResult(success=True, output="", log_path="/tmp/inner.txt")
+        cache.put("key", TestResult(success=True, output="", log_path="/tmp/log.txt", runtimes={"py": inner}))
+
+        stored = json.loads((temp_dir / "cache" / "key.json").read_text())
+        assert stored["log_path"] is None and stored["runtimes"]["py"]["log_path"] is None
+        assert inner.log_path == "/tmp/inner.txt"
+
+    def test_limits_are_part_of_the_key(self, temp_dir: Path):
+        """Test that results under different resource limits aren't shared."""
+        runner = PytestRunner(working_dir=temp_dir)
+        limited = PytestRunner(working_dir=temp_dir)
+        limited.limits = ResourceLimits(cpu_seconds=10, memory_mb=512)
+
+        assert limited.cache_settings() == {**runner.cache_settings(), "cpu_seconds": 10, "memory_mb": 512}
+
+
+def fake_installer(calls: list[list[str]], missing: str = "", builtins: str = "fs path"):
+    """A stand-in for EnvironmentPool.run that records commands and fakes their effects."""
+
+    def run(command: list[str], cwd: Path, timeout: int = 30) -> subprocess.CompletedProcess:
+        calls.append(command)
+        stdout = ""
+        if command[1:3] == ["-m", "venv"]:
+            (Path(command[3]) / "bin").mkdir(parents=True)
+            (Path(command[3]) / "pyvenv.cfg").write_text("home = /usr/bin\n")
+        elif command[:2] == ["npm", "ci"]:
+            (cwd / "node_modules" / "left-pad").mkdir(parents=True)
+        elif command[-1] in ("--version", "import sys; print(sys.version)"):
+            stdout = "1.0"
+        elif "find_spec" in command[2]:
+            stdout = missing
+        elif command[:2] == ["node", "-p"]:
+            stdout = builtins
+        return subprocess.CompletedProcess(command, 0, stdout, "")
+
+    return run
+
+
+class TestEnvironmentPool:
+    """Tests for dependency environment templates and their clones."""
+
+    def test_clone_tree_uses_hardlinks(self, temp_dir: Path):
+        """Test that clones share file contents with the template but not replaced files."""
+        template = temp_dir / "template"
+        (template / "bin").mkdir(parents=True)
+        (template / "lib.py").write_text("A = 1\n")
+        os.symlink("../lib.py", template / "bin" / "link")
+
+        clone_tree(template, temp_dir / "clone" / "env")
+        clone = temp_dir / "clone" / "env"
+        (clone / "new.py").write_text("B = 2\n")
+        (clone / "lib.py").unlink()
+        (clone / "lib.py").write_text("A = 2\n")
+
+        assert os.readlink(clone / "bin" / "link") == "../lib.py"
+        assert (template / "lib.py").read_text() == "A = 1\n"
+        assert not (template / "new.py").exists()
+
+        clone_tree(template, temp_dir / "second")
+        assert (temp_dir / "second" / "lib.py").stat().st_ino == (template / "lib.py").stat().st_ino
+
+    def test_python_template_is_built_once_per_lockfile(self, temp_dir: Path, temp_cwd: Path):
+        """Test that jobs share a template until the lockfile changes, and each gets its own clone."""
+        (temp_cwd / "requirements.txt").write_text("requests==2.31.0\n")
+        pool = EnvironmentPool(root=temp_dir / "envs", wheelhouse=temp_dir / "wheels")
+        calls: list[list[str]] = []
+
+        with patch.object(EnvironmentPool, "run", side_effect=fake_installer(calls)):
+            workspaces = [temp_dir / "job1", temp_dir / "job2"]
+            for workspace in workspaces:
+                workspace.mkdir()
+                os.symlink(temp_cwd / ".venv", workspace / ".venv")
+                environment = pool.provision(temp_cwd, workspace, "python")
+            builds = [command for command in calls if "install" in command]
+            (temp_cwd / "requirements.txt").write_text("requests==2.32.0\n")
+            pool.provision(temp_cwd, workspaces[0], "python")
+
+        assert len(builds) == 1
+        assert builds[0][1:] == [
+            "-m", "pip", "install", "--quiet", "--find-links", str(temp_dir / "wheels"),
+            "-r", str(temp_cwd / "requirements.txt"), "pytest",
+        ]  # fmt: skip
+        assert len([command for command in calls if "install" in command]) == 2
+        assert len(list((temp_dir / "envs").iterdir())) == 2
+        assert not (workspaces[1] / ".venv").is_symlink()
+        assert environment.variables()["PATH"].startswith(str(workspaces[1] / ".venv" / "bin"))
+        assert pool.provision(temp_cwd, workspaces[0], "java") is None
+
+    @pytest.mark.skipif(sys.version_info < (3, 11), reason="Reading pyproject.toml needs tomllib")
+    def test_python_template_from_pyproject(self, temp_dir: Path, temp_cwd: Path):
+        """Test that a project without requirements files gets its pyproject dependencies, or its own venv."""
+        (temp_cwd / "pyproject.toml").write_text(
+            '[project]\nname = "calc"\ndependencies = ["attrs>=23"]\n\n'
+            '[project.optional-dependencies]\ntest = ["hypothesis"]\ndocs = ["sphinx"]\n'
+        )
+        pool = EnvironmentPool(root=temp_dir / "envs")
+        calls: list[list[str]] = []
+
+        with patch.object(EnvironmentPool, "run", side_effect=fake_installer(calls)):
+            assert pool.provision(temp_cwd, temp_dir, "python") is not None
+            (temp_cwd / "pyproject.toml").write_text('[tool.poetry.dependencies]\npython = "^3.9"\n')
+            assert pool.provision(temp_cwd, temp_dir, "python") is None
+            (temp_cwd / "pyproject.toml").unlink()
+            (temp_cwd / "setup.py").write_text("from setuptools import setup\n\nsetup()\n")
+            assert pool.provision(temp_cwd, temp_dir, "python") is None
+
+        (install,) = [command for command in calls if "install" in command]
+        assert install[-3:] == ["attrs>=23", "hypothesis", "pytest"]
+
+    def test_failed_build_leaves_no_template(self, temp_dir: Path, temp_cwd: Path):
+        """Test that a failing install raises and leaves nothing half-built behind."""
+        pool = EnvironmentPool(root=temp_dir / "envs")
+        installer = fake_installer([])
+
+        def run(command: list[str], cwd: Path, timeout: int = 30) -> subprocess.CompletedProcess:
+            if "install" in command:
+                return subprocess.CompletedProcess(command, 1, "", "No matching distribution found for pytest")
+            return installer(command, cwd, timeout)
+
+        with patch.object(EnvironmentPool, "run", side_effect=run):
+            with pytest.raises(EnvironmentBuildError, match="No matching distribution"):
+                pool.provision(temp_cwd, temp_dir, "python")
+
+        assert list((temp_dir / "envs").iterdir()) == []
+
+    def test_installs_missing_python_packages_offline(self, temp_dir: Path, temp_cwd: Path):
+        """Test that only third-party imports the environment lacks are installed, from the wheelhouse."""
+        (temp_cwd / "helpers.py").write_text("")
+        test_file = temp_cwd / "test_calc.py"
+        test_file.write_text("import json\nimport helpers\nimport shiny.sub\nfrom calc import add\nimport attrs\n")
+        pool = EnvironmentPool(root=temp_dir / "envs", wheelhouse=temp_dir / "wheels")
+        environment = JobEnvironment(pool, "python", temp_cwd / ".venv", temp_cwd)
+        calls: list[list[str]] = []
+
+        with patch.object(EnvironmentPool, "run", side_effect=fake_installer(calls, missing="shiny")):
+            installed = environment.install_missing([test_file, temp_cwd / "calc.py"])
+            checked, install = calls
+            calls.clear()
+            environment.install_missing([test_file, temp_cwd / "calc.py"])
+
+        assert installed == ["shiny"]
+        assert checked[3:] == ["attrs", "shiny"]
+        assert install[1:] == [
+            "-m", "pip", "install", "--quiet", "--no-index", "--find-links", str(temp_dir / "wheels"), "shiny",
+        ]  # fmt: skip
+        assert calls == []  # Already checked or installed
+
+    def test_failed_module_check_installs_nothing(self, temp_dir: Path, temp_cwd: Path):
+        """Test that an interpreter that can't be started or hangs doesn't stop the run."""
+        test_file = temp_cwd / "test_calc.py"
+        test_file.write_text("import attrs\n")
+        pool = EnvironmentPool(root=temp_dir / "envs", wheelhouse=temp_dir / "wheels")
+        environment = JobEnvironment(pool, "python", temp_cwd / ".venv", temp_cwd)
+
+        for error in (OSError("No such file"), subprocess.TimeoutExpired("python", 60)):
+            with patch.object(EnvironmentPool, "run", side_effect=error) as run:
+                assert environment.install_missing([test_file]) == []
+            run.assert_called_once()
+            environment._present.clear()
+
+    def test_installs_missing_node_packages_offline(self, temp_dir: Path, temp_cwd: Path):
+        """Test that bare specifiers missing from node_modules are installed from the npm cache."""
+        (temp_cwd / "node_modules" / "left-pad").mkdir(parents=True)
+        (temp_cwd / "node_modules" / "left-pad" / "package.json").write_text("{}")
+        test_file = temp_cwd / "sum.test.js"
+        test_file.write_text(
+            'const fs = require("fs");\nconst pad = require("left-pad");\n'
+            'import { x } from "@scope/pkg/sub";\nimport sum from "./sum";\nimport "node:path";\n'
+        )
+        pool = EnvironmentPool(root=temp_dir / "envs", npm_cache=temp_dir / "npm")
+        environment = JobEnvironment(pool, "node", temp_cwd / "node_modules", temp_cwd)
+        calls: list[list[str]] = []
+
+        with patch.object(EnvironmentPool, "run", side_effect=fake_installer(calls)):
+            installed = environment.install_missing([test_file])
+
+        assert installed == ["@scope/pkg"]
+        assert calls[-1] == [
+            "npm", "install", "--offline", "--no-save", "--no-audit", "--no-fund",
+            "--cache", str(temp_dir / "npm"), "@scope/pkg",
+        ]  # fmt: skip
+
+    def test_runner_uses_environment_interpreter(self, temp_dir: Path, temp_cwd: Path):
+        """Test that test commands find `python` in the environment first."""
+        bin_dir = temp_dir / "venv" / "bin"
+        bin_dir.mkdir(parents=True)
+        os.symlink(sys.executable, bin_dir / "python")
+        runner = PytestRunner(working_dir=temp_cwd)
+        runner.environment = JobEnvironment(EnvironmentPool(root=temp_dir), "python", temp_dir / "venv", temp_cwd)
+
+        result = runner._run_command(
+            ["python", "-c", "import os, sys; print(sys.executable, os.environ['VIRTUAL_ENV'])"]
+        )
+
+        assert result.output.split() == [str(bin_dir / "python"), str(temp_dir / "venv")]
+        assert runner.in_directory(temp_dir).environment is None
+
+
+def fake_runtime(directory: Path, name: str) -> str:
+    """An executable that runs this interpreter with RUNTIME set to its name."""
+    path = directory / name
+    path.write_text(f'#!/bin/sh\nRUNTIME={name} exec "{sys.executable}" "$@"\n')
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="Runtime shims are shell scripts")
+class TestMatrixRunner:
+    """Tests for running tests against several runtimes."""
+
+    def test_runtime_shims(self, temp_home: Path, temp_dir: Path):
+        """Test that shims run the runtime under the generic name and are reused."""
+        runtime = fake_runtime(temp_dir, "py-a")
+
+        shims = runtime_shims(runtime, ("python", "pythonw"))
+        output = subprocess.run(
+            [str(shims / "python"), "-c", "import os; print(os.environ['RUNTIME'])"], capture_output=True, text=True
+        ).stdout
+
+        assert output == "py-a\n"
+        assert not (shims / "pythonw").exists()  # No such file next to the runtime
+        assert runtime_shims(runtime, ("python", "pythonw")) == shims
+        assert shims.parent == temp_home / ".proven" / "runtimes"
+
+    def test_green_needs_every_runtime(self, temp_home: Path, temp_dir: Path, temp_cwd: Path):
+        """Test that each runtime runs the tests and one failure makes the combined result red."""
+        test_file = temp_cwd / "test_runtime.py"
+        test_file.write_text("import os\n\ndef test_runtime():\n    assert os.environ['RUNTIME'] != 'py-b'\n")
+        runtimes = [fake_runtime(temp_dir, "py-a"), fake_runtime(temp_dir, "py-b")]
+        matrix = MatrixRunner(PytestRunner(working_dir=temp_cwd), runtimes)
+        events = []
+
+        result = asyncio.run(matrix.run_async(test_file, on_event=lambda case: events.append(case.name) or False))
+
+        assert result.is_red
+        assert [runtime.is_green for runtime in result.runtimes.values()] == [True, False]
+        assert [case.name for case in result.failures] == [f"[{runtimes[1]}] test_runtime"]
+        assert sorted(name.split(" ")[0] for name in events) == sorted(f"[{runtime}]" for runtime in runtimes)
+        assert (result.passed, result.failed) == (1, 1)
+        assert matrix.run(test_file).runtimes.keys() == result.runtimes.keys()
+
+    def test_missing_runtime_is_an_error(self, temp_home: Path, temp_cwd: Path):
+        """Test that a runtime that can't be found fails instead of falling back to the default."""
+        test_file = temp_cwd / "test_ok.py"
+        test_file.write_text("def test_ok():\n    pass\n")
+        matrix = MatrixRunner(PytestRunner(working_dir=temp_cwd), [sys.executable, "python2.1"])
+
+        result = matrix.run(test_file)
+
+        assert result.is_red
+        assert result.runtimes[sys.executable].is_green
+        assert "Runtime not found: python2.1" in result.output
+
+    def test_rerun_selects_each_runtimes_failures(self, temp_cwd: Path):
+        """Test that a rerun passes every runtime only its own failed cases."""
+        matrix = MatrixRunner(PytestRunner(working_dir=temp_cwd), ["py-a", "py-b"])
+        previous = combine_results(
+            {
+                "py-a": TestResult.from_cases(False, "", [TestCaseResult(name="test_a", outcome="failed")]),
+                "py-b": TestResult.from_cases(True, "", [TestCaseResult(name="test_a", outcome="passed")]),
+            }
+        )
+        calls = {}
+
+        def run(runner, test_file, on_event=None, source_file=None, only=None):
+            calls.setdefault(runner.runtime, []).append(only)
+            return TestResult(success=True, output="", passed=1)
+
+        with patch.object(PytestRunner, "run", run), patch("proven.runners.matrix.shutil.which", return_value="/x"):
+            result = matrix.rerun(temp_cwd / "test_a.py", previous)
+
+        assert result.is_green
+        assert [case.name for case in calls["py-a"][0]] == ["test_a"]
+        assert calls["py-b"][0] == []
+        assert calls["py-a"][1] is None  # Then a full run everywhere
+
+    def test_in_directory_and_environment_reach_every_runtime(self, temp_dir: Path):
+        """Test that workspace copies and environments apply to each runtime's runner."""
+        matrix = MatrixRunner(UnittestRunner(working_dir=temp_dir), ["python3.9", "python3.13"])
+
+        copy = matrix.in_directory(temp_dir / "workspace")
+        copy.environment = "env"
+        copy.timeout = 5
+
+        assert [runner.working_dir for runner in copy.runners.values()] == [temp_dir / "workspace"] * 2
+        assert [runner.environment for runner in copy.runners.values()] == ["env", "env"]
+        assert [runner.environment for runner in matrix.runners.values()] == [None, None]
+        assert [runner.timeout for runner in copy.runners.values()] == [5, 5]
+        assert copy.timeout == 5 and matrix.timeout == 60
+        assert copy.project_dir == temp_dir
+        assert copy.name == "unittest"
+
+
+class TestStaticImports:
+    """Tests for proving RED from imports of the source file."""
+
+    def test_python_missing_module(self, temp_cwd: Path):
+        """Test that importing a source module that doesn't exist is detected."""
+        (temp_cwd / "tests").mkdir()
+        test_file = temp_cwd / "tests" / "test_calc.py"
+        source_file = temp_cwd / "src" / "calc.py"
+
+        for statement in ("from calc import add", "import src.calc", "from src import calc"):
+            test_file.write_text(f"{statement}\n\ndef test_add():\n    pass\n")
+            assert missing_python_import(test_file, source_file, temp_cwd), statement
+
+        test_file.write_text("import json\n")
+        assert missing_python_import(test_file, source_file, temp_cwd) is None
+
+    def test_python_module_found_elsewhere(self, temp_cwd: Path):
+        """Test that nothing is proven if the module name resolves some other way."""
+        (temp_cwd / "lib").mkdir()
+        (temp_cwd / "lib" / "calc.py").write_text("")
+        test_file = temp_cwd / "test_calc.py"
+        test_file.write_text("from calc import add\nimport json\n")
+
+        assert missing_python_import(test_file, temp_cwd / "src" / "calc.py", temp_cwd) is None
+        test_file.write_text("from json import loads\n")
+        assert missing_python_import(test_file, temp_cwd / "src" / "json.py", temp_cwd) is None
+
+    def test_python_module_installed_for_the_project(self, temp_cwd: Path, temp_dir: Path):
+        """Test that a module is looked up with the test command's environment, not Proven's."""
+        (temp_dir / "calc.py").write_text("")
+        test_file = temp_cwd / "test_calc.py"
+        test_file.write_text("from calc import add\n")
+        source_file = temp_cwd / "src" / "calc.py"
+
+        assert missing_python_import(test_file, source_file, temp_cwd)
+        env = {**os.environ, "PYTHONPATH": str(temp_dir)}
+        assert missing_python_import(test_file, source_file, temp_cwd, env) is None
+
+    def test_python_missing_name(self, temp_cwd: Path):
+        """Test that names the existing source module doesn't define are detected."""
+        (temp_cwd / "src").mkdir()
+        source_file = temp_cwd / "src" / "calc.py"
+        test_file = temp_cwd / "test_calc.py"
+        test_file.write_text("from calc import add, sub\n")
+
+        source_file.write_text('def add(a, b):\n    return a + b\n\nif __name__ == "__main__":\n    pass\n')
+        assert missing_python_import(test_file, source_file, temp_cwd) == f"calc.sub (not defined in {source_file})"
+
+        source_file.write_text("from math import *\n\ndef add(a, b):\n    return a + b\n")
+        assert missing_python_import(test_file, source_file, temp_cwd) is None
+
+    def test_js_missing_relative_import(self, temp_cwd: Path):
+        """Test that relative imports of a missing source file are detected."""
+        (temp_cwd / "tests").mkdir()
+        test_file = temp_cwd / "tests" / "calc.test.js"
+        source_file = temp_cwd / "src" / "calc.js"
+
+        for statement in ("const { add } = require('../src/calc');", "import { add } from '../src/calc.js';"):
+            test_file.write_text(f"{statement}\nconst lodash = require('lodash');\n")
+            assert (
+                missing_js_import(test_file, source_file)
+                == f"{statement.split(chr(39))[1]} ({source_file} does not exist)"
+            )
+
+        (temp_cwd / "src").mkdir()
+        source_file.with_suffix(".ts").write_text("")
+        assert missing_js_import(test_file, source_file) is None
+
+    def test_java_missing_class(self, temp_cwd: Path):
+        """Test that referencing a class with no source anywhere is detected."""
+        test_file = temp_cwd / "CalculatorTest.java"
+        test_file.write_text("// Calculator tests\nclass CalculatorTest {\n  Calculator calc = new Calculator();\n}\n")
+        source_file = temp_cwd / "src" / "Calculator.java"
+
+        assert missing_java_class(test_file, source_file, temp_cwd) == f"Calculator ({source_file} does not exist)"
+
+        (temp_cwd / "lib").mkdir()
+        (temp_cwd / "lib" / "Calculator.java").write_text("class Calculator {}\n")
+        assert missing_java_class(test_file, source_file, temp_cwd) is None
+
+    def test_java_class_from_another_package(self, temp_cwd: Path):
+        """Test that a same-named class imported from another package, e.g. a dependency, proves nothing."""
+        source_file = temp_cwd / "src" / "main" / "java" / "com" / "acme" / "Money.java"
+        test_file = temp_cwd / "MoneyTest.java"
+
+        test_file.write_text("package com.acme;\nimport com.acme.Money;\nclass MoneyTest { Money money; }\n")
+        assert missing_java_class(test_file, source_file, temp_cwd) == f"Money ({source_file} does not exist)"
+
+        for statement in ("import org.joda.money.Money;", "import org.joda.money.*;"):
+            test_file.write_text(f"package com.acme;\n{statement}\nclass MoneyTest {{ Money money; }}\n")
+            assert missing_java_class(test_file, source_file, temp_cwd) is None, statement
+
+    def test_runner_prove_red(self, temp_cwd: Path):
+        """Test that runners turn a missing import into a synthetic RED result."""
+        test_file = temp_cwd / "test_calc.py"
+        test_file.write_text("from calc import add\n")
+        runner = PytestRunner(working_dir=temp_cwd)
+
+        result = runner.prove_red(test_file, temp_cwd / "src" / "calc.py")
+
+        assert result.is_red
+        assert result.errors == 1
+        assert "calc" in result.cases[0].message
+
+
+class TestOutputSpool:
+    """Tests for bounded output capture."""
+
+    def test_small_output_kept_whole(self):
+        """Test that output within the limits is kept as-is, with no log file."""
+        spool = OutputSpool(head_size=100, tail_size=100)
+        spool.write("short\n")
+        spool.write("output\n")
+        spool.close()
+
+        assert spool.getvalue() == "short\noutput\n"
+        assert spool.log_path is None
+
+    def test_large_output_keeps_head_and_tail(self):
+        """Test that large output keeps its start and end in memory and the rest on disk."""
+        spool = OutputSpool(head_size=10, tail_size=10)
+        text = "".join(f"line {i}\n" for i in range(1000))
+        for start in range(0, len(text), 7):
+            spool.write(text[start : start + 7])
+        spool.close()
+
+        value = spool.getvalue()
+        assert value.startswith(text[:10])
+        assert value.endswith(text[-10:])
+        assert f"{len(text) - 20} characters omitted" in value
+        assert Path(spool.log_path).read_text() == text
+        os.unlink(spool.log_path)
+
+    def test_log_file_is_capped(self):
+        """Test that output past log_limit is counted but not written to the log file."""
+        spool = OutputSpool(head_size=10, tail_size=10, log_limit=100)
+        spool.write("x" * 1000)
+        spool.write("end")
+        spool.close()
+
+        log = Path(spool.log_path).read_text()
+        assert log.startswith("x" * 100)
+        assert "log truncated at 100 characters" in log and len(log) < 200
+        assert spool.getvalue().endswith("x" * 7 + "end")
+        assert "983 characters omitted, first 100 characters" in spool.getvalue()
+        os.unlink(spool.log_path)
+
+    @pytest.mark.asyncio
+    async def test_collect_logs_deletes_logs_of_its_tasks(self):
+        """Test that logs spooled in tasks and threads of a collect_logs() block are deleted when it ends."""
+
+        def spool_log() -> str:
+            spool = OutputSpool(head_size=1, tail_size=1)
+            spool.write("more than fits")
+            spool.close()
+            return spool.log_path
+
+        with collect_logs():
+            paths = await asyncio.gather(asyncio.to_thread(spool_log), asyncio.to_thread(spool_log))
+            assert all(Path(path).exists() for path in paths)
+        outside = spool_log()
+
+        assert not any(Path(path).exists() for path in paths)
+        assert Path(outside).exists()
+        os.unlink(outside)
+
+    def test_setup_command_logs_are_deleted(self, temp_dir: Path):
+        """Test that a run keeps only the log of its last command."""
+        setup_log, run_log = temp_dir / "setup.log", temp_dir / "run.log"
+        setup_log.touch()
+        run_log.touch()
+        executed = [CommandResult(0, "", str(setup_log)), CommandResult(1, "", str(run_log))]
+
+        result = PytestRunner(working_dir=temp_dir)._record_usage(TestResult(success=False, output=""), executed)
+
+        assert result.log_path == str(run_log) and run_log.exists()
+        assert not setup_log.exists()
+        result.discard_log()
+        assert result.log_path is None and not run_log.exists()
+
+    def test_worker_server_reads_head_and_tail(self):
+        """Test that the pytest fork-server sends only the start and end of long output."""
+        with tempfile.TemporaryFile() as log:
+            log.write(b"a" * 40_000 + b"b" * 100_000 + b"c" * 40_000)
+            output = read_head_and_tail(log)
+
+        assert output.startswith("a" * 32 * 1024)
+        assert output.endswith("c" * 32 * 1024)
+        assert f"{180_000 - 64 * 1024} characters omitted" in output
+
+    def test_runner_spools_runaway_output(self, temp_cwd: Path):
+        """Test that a command printing without end yields bounded output plus a full log."""
+        runner = PytestRunner(working_dir=temp_cwd)
+
+        result = runner._run_command([sys.executable, "-c", "print('y' * 500_000)"])
+
+        assert len(result.output) < 70_000
+        assert "characters omitted" in result.output
+        assert len(Path(result.log_path).read_text()) > 500_000
+        os.unlink(result.log_path)
+
+    def test_result_full_output_and_compact_view(self, temp_dir: Path):
+        """Test the lazy full log accessor and the compact view on TestResult."""
+        log = temp_dir / "full.log"
+        log.write_text("everything")
+        result = TestResult(success=False, output="a" * 3000 + "b" * 3000, log_path=str(log))
+
+        assert result.full_output() == "everything"
+        assert TestResult(success=True, output="ok", log_path=str(temp_dir / "gone.log")).full_output() == "ok"
+        compact = result.compact(limit=1000)
+        assert compact.startswith("a" * 250)
+        assert compact.endswith("b" * 750)
+        assert "5000 characters omitted" in compact
+
+
+class TestWorkerProcess:
+    """Tests for persistent worker processes."""
+
+    def test_request_round_trip(self, temp_cwd: Path):
+        """Test that requests and responses are exchanged as JSON lines."""
+        worker = WorkerProcess([sys.executable, "-c", ECHO_WORKER], cwd=temp_cwd)
+        worker.start()
+
+        try:
+            assert worker.request({"echo": "one"}) == {"exit_code": 0, "output": "one"}
+            assert worker.request({"echo": "two"})["output"] == "two"
+            assert worker.alive
+        finally:
+            worker.close()
+
+        assert not worker.alive
+
+    def test_start_fails_when_worker_exits(self, temp_cwd: Path):
+        """Test that a worker exiting before ready raises WorkerError."""
+        worker = WorkerProcess([sys.executable, "-c", "pass"], cwd=temp_cwd)
+
+        with pytest.raises(WorkerError):
+            worker.start()
+
+    @pytest.mark.skipif(os.name != "posix", reason="Request timeouts need select() on pipes")
+    def test_request_timeout_kills_worker(self, temp_cwd: Path):
+        """Test that a slow worker is killed when a request times out."""
+        worker = WorkerProcess([sys.executable, "-c", ECHO_WORKER], cwd=temp_cwd)
+        worker.start()
+
+        with pytest.raises(WorkerTimeout):
+            worker.request({"echo": "slow", "sleep": 5}, timeout=0.2)
+
+        assert not worker.alive
+
+    @pytest.mark.skipif(os.name != "posix", reason="Start timeouts need select() on pipes")
+    def test_start_times_out(self, temp_cwd: Path):
+        """Test that a worker that never reports ready is killed after the start timeout."""
+        worker = WorkerProcess([sys.executable, "-c", "import time; time.sleep(30)"], cwd=temp_cwd)
+
+        with pytest.raises(WorkerTimeout):
+            worker.start(timeout=0.2)
+
+        assert not worker.alive
+
+    @pytest.mark.skipif(not hasattr(os, "killpg"), reason="Needs process groups")
+    def test_request_timeout_kills_announced_process_group(self, temp_cwd: Path):
+        """Test that a timeout also kills the process group the worker announced for the run."""
+        hung_worker = """
+import json, subprocess, sys, time
+print(json.dumps({"ready": True}), flush=True)
+sys.stdin.readline()
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"], start_new_session=True)
+open("child.pid", "w").write(str(child.pid))
+print(json.dumps({"pgid": child.pid}), flush=True)
+time.sleep(30)
+"""
+        worker = WorkerProcess([sys.executable, "-c", hung_worker], cwd=temp_cwd)
+        worker.start()
+
+        with pytest.raises(WorkerTimeout):
+            worker.request({"args": []}, timeout=1)
+
+        pid = int((temp_cwd / "child.pid").read_text())
+        deadline = time.monotonic() + 5
+        while _is_running(pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not _is_running(pid)
+
 
 class TestRunnerBaseClass:
     """Tests for the TestRunner base class."""
@@ -236,28 +2189,224 @@ class TestRunnerBaseClass:
         runner = PytestRunner(working_dir=custom_dir)
         assert runner.working_dir == custom_dir
 
+    def test_in_directory_keeps_project(self, temp_dir: Path):
+        """Test a runner copy for a workspace keeps the project's cache key and settings but not its worker."""
+        runner = PytestRunner(working_dir=temp_dir, use_worker=True, lean=True)
+        runner._worker = WorkerProcess(["python"])
+
+        copy = runner.in_directory(temp_dir / "workspace")
+
+        assert copy.working_dir == temp_dir / "workspace"
+        assert copy.project_dir == temp_dir
+        assert copy._worker is None and runner._worker is not None
+        assert copy.cache_settings() == runner.cache_settings()
+
+    def test_with_seed_runs_every_time(self, temp_dir: Path):
+        """Test a seeded copy skips the worker and result cache, and leaves the original deterministic."""
+        runner = PytestRunner(working_dir=temp_dir, use_worker=True)
+        runner.cache = ResultCache(directory=temp_dir / "cache")
+
+        seeded = runner.with_seed(1)
+
+        assert (seeded.seed, seeded.use_worker, seeded.cache) == (1, False, None)
+        assert runner.seed is None and runner.use_worker and runner.cache is not None
+
     def test_run_command_handles_timeout(self, temp_cwd: Path):
         """Test _run_command handles subprocess timeout."""
         runner = PytestRunner(working_dir=temp_cwd)
+        runner.timeout = 0.5
+
+        result = runner._run_command([sys.executable, "-c", "import time; time.sleep(30)"])
+
+        assert result.exit_code == 1
+        assert "timed out" in result.output.lower()
+
+    def test_stream_command_feeds_lines(self, temp_cwd: Path):
+        """Test that streamed output reaches on_line and the full output is returned."""
+        runner = PytestRunner(working_dir=temp_cwd)
+        seen = []
+
+        result = runner._run_command(
+            [sys.executable, "-c", "print('one'); print('two')"], on_line=lambda line: seen.append(line) or False
+        )
+
+        assert result.exit_code == 0
+        assert seen == ["one", "two"]
+        assert result.output == "one\ntwo\n"
+
+    def test_stream_command_stops_early(self, temp_cwd: Path):
+        """Test that returning True from on_line kills the process."""
+        runner = PytestRunner(working_dir=temp_cwd)
+
+        result = runner._run_command(
+            [sys.executable, "-c", "import time; print('first'); time.sleep(30)"], on_line=lambda line: True
+        )
+
+        assert result.exit_code == 1
+        assert result.output.startswith("first")
+        assert "stopped early" in result.output
+
+    @pytest.mark.asyncio
+    async def test_run_command_async_streams_lines(self, temp_cwd: Path):
+        """Test that the asyncio path streams lines and returns the full output."""
+        runner = PytestRunner(working_dir=temp_cwd)
+        seen = []
+
+        result = await runner._run_command_async(
+            [sys.executable, "-c", "print('one'); print('two')"], on_line=lambda line: seen.append(line) or False
+        )
+
+        assert result.exit_code == 0
+        assert seen == ["one", "two"]
+        assert result.output == "one\ntwo\n"
+
+    @pytest.mark.asyncio
+    async def test_run_command_async_handles_timeout(self, temp_cwd: Path):
+        """Test that the asyncio path kills the process on timeout."""
+        runner = PytestRunner(working_dir=temp_cwd)
+        runner.timeout = 0.5
+
+        result = await runner._run_command_async([sys.executable, "-c", "import time; time.sleep(30)"])
+
+        assert result.exit_code == 1
+        assert "timed out" in result.output.lower()
+
+    @pytest.mark.asyncio
+    async def test_run_command_async_timeout_covers_closed_output(self, temp_cwd: Path):
+        """Test that a command which closes its output and keeps running still times out."""
+        runner = PytestRunner(working_dir=temp_cwd)
+        runner.timeout = 0.5
+        started = time.monotonic()
 
-        with patch("proven.runners.base.subprocess.run") as mock_run:
-            from subprocess import TimeoutExpired
+        result = await runner._run_command_async(
+            [sys.executable, "-c", "import os, time; os.close(1); os.close(2); time.sleep(30)"]
+        )
 
-            mock_run.side_effect = TimeoutExpired("cmd", 60)
+        assert time.monotonic() - started < 10
+        assert result.exit_code == 1 and result.complete is False
+        assert "timed out" in result.output.lower()
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(os.name != "posix", reason="Process groups are POSIX-only")
+    async def test_run_command_async_cancel_kills_process(self, temp_cwd: Path):
+        """Test that cancelling run_command_async kills the test process."""
+        runner = PytestRunner(working_dir=temp_cwd)
+        pid_file = temp_cwd / "pid"
+        script = f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(30)"
+
+        task = asyncio.create_task(runner._run_command_async([sys.executable, "-c", script]))
+        for _ in range(100):
+            if pid_file.exists() and pid_file.read_text():
+                break
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        with pytest.raises(ProcessLookupError):
+            os.kill(int(pid_file.read_text()), 0)
+
+    @pytest.mark.skipif(os.name != "posix", reason="Process groups are POSIX-only")
+    def test_run_command_timeout_kills_grandchildren(self, temp_cwd: Path):
+        """Test that a timeout kills processes the test command started, not just the command."""
+        runner = PytestRunner(working_dir=temp_cwd)
+        runner.timeout = 1
+        pid_file = temp_cwd / "pid"
+        script = (
+            "import subprocess, sys, time; "
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); "
+            f"open({str(pid_file)!r}, 'w').write(str(child.pid)); time.sleep(30)"
+        )
+
+        result = runner._run_command([sys.executable, "-c", script])
+
+        assert "timed out" in result.output.lower()
+        pid = int(pid_file.read_text())
+        for _ in range(40):
+            if not _is_running(pid):
+                break
+            time.sleep(0.05)
+        assert not _is_running(pid)
+
+    def test_run_command_records_usage(self, temp_cwd: Path):
+        """Test that wall time, CPU time and peak RSS are measured."""
+        runner = PytestRunner(working_dir=temp_cwd)
+
+        result = runner._run_command([sys.executable, "-c", "x = bytearray(64 * 1024 * 1024); sum(range(10**6))"])
+
+        assert result.exit_code == 0
+        assert result.wall_time > 0
+        if hasattr(os, "wait4"):
+            assert result.cpu_time > 0
+            assert result.peak_rss >= 64 * 1024 * 1024
+
+    @pytest.mark.asyncio
+    async def test_run_command_async_records_usage(self, temp_cwd: Path):
+        """Test that the asyncio path measures usage as well."""
+        runner = PytestRunner(working_dir=temp_cwd)
+
+        result = await runner._run_command_async([sys.executable, "-c", "x = bytearray(64 * 1024 * 1024)"])
+
+        assert result.exit_code == 0
+        assert result.wall_time > 0
+        if hasattr(os, "wait4"):
+            assert result.peak_rss >= 64 * 1024 * 1024
+
+    @pytest.mark.skipif(os.name != "posix", reason="rlimits are POSIX-only")
+    def test_run_command_applies_limits(self, temp_cwd: Path):
+        """Test that configured rlimits are set in the test process."""
+        runner = PytestRunner(working_dir=temp_cwd)
+        runner.limits = ResourceLimits(cpu_seconds=30, memory_mb=1024)
+        script = "import resource as r; print(r.getrlimit(r.RLIMIT_CPU)[0], r.getrlimit(r.RLIMIT_DATA)[0])"
+
+        result = runner._run_command([sys.executable, "-c", script])
+
+        assert result.output.split() == ["30", str(1024 * 1024 * 1024)]
+
+    @pytest.mark.skipif(os.name != "posix", reason="rlimits are POSIX-only")
+    def test_run_command_reports_cpu_limit(self, temp_cwd: Path):
+        """Test that a run killed by the CPU time limit says so."""
+        runner = PytestRunner(working_dir=temp_cwd)
+        runner.limits = ResourceLimits(cpu_seconds=1)
+
+        result = runner._run_command([sys.executable, "-c", "while True: pass"])
+
+        assert result.exit_code == 1
+        assert "CPU time limit" in result.output
+
+    def test_run_records_usage_on_result(self, temp_cwd: Path):
+        """Test that a run's usage, including setup commands, ends up on the TestResult."""
+        runner = JUnitRunner(working_dir=temp_cwd)
+        setup = CommandResult(0, "", wall_time=2.0, cpu_time=1.5, peak_rss=300)
+        run = CommandResult(0, "", wall_time=1.0, cpu_time=0.5, peak_rss=200)
+
+        with patch.object(runner, "_prepare", return_value=[["javac"]]):
+            with patch.object(runner, "_build_command", return_value=["java"]):
+                with patch.object(runner, "_run_command", side_effect=[setup, run]):
+                    result = runner.run(temp_cwd / "CalcTest.java")
+
+        assert result.wall_time == 3.0
+        assert result.cpu_time == 2.0
+        assert result.peak_rss == 300
+
+    @pytest.mark.asyncio
+    async def test_run_command_async_handles_missing_command(self, temp_cwd: Path):
+        """Test the asyncio path handles a missing command."""
+        runner = PytestRunner(working_dir=temp_cwd)
 
-            exit_code, output = runner._run_command(["pytest"])
+        result = await runner._run_command_async(["proven-no-such-command"])
 
-            assert exit_code == 1
-            assert "timed out" in output.lower()
+        assert result.exit_code == 1
+        assert "not found" in result.output.lower()
 
     def test_run_command_handles_missing_command(self, temp_cwd: Path):
         """Test _run_command handles missing command."""
         runner = PytestRunner(working_dir=temp_cwd)
 
-        with patch("proven.runners.base.subprocess.run") as mock_run:
+        with patch("proven.runners.base.subprocess.Popen") as mock_run:
             mock_run.side_effect = FileNotFoundError("pytest not found")
 
-            exit_code, output = runner._run_command(["pytest"])
+            result = runner._run_command(["pytest"])
 
-            assert exit_code == 1
-            assert "not found" in output.lower()
+            assert result.exit_code == 1
+            assert "not found" in result.output.lower()